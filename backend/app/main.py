@@ -1,22 +1,29 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import csv
+import functools
 import os
 import threading
+from abc import ABC, abstractmethod
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Annotated, Any, AsyncIterator, TypeVar
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+import numpy as np
+import orjson
+from fastapi import Body, FastAPI, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import PlainTextResponse, StreamingResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 
+from . import scoring
 from .ml import load_artifact_metadata
 from .ml.lstm_autoencoder import AnomalyDetector, telemetry_to_vector, FEATURE_NAMES
 
@@ -27,6 +34,7 @@ API_PORT = int(os.getenv("API_PORT", "8001"))
 
 MODEL_ARTIFACT_PATH = os.getenv("MODEL_ARTIFACT_PATH", "/app/models/mvtec_feature_model.pkl")
 USE_FALLBACK_DRIFT_MODEL = os.getenv("USE_FALLBACK_DRIFT_MODEL", "true").lower() == "true"
+ANALYSIS_DEDUP_ENABLED = os.getenv("ANALYSIS_DEDUP_ENABLED", "true").lower() == "true"
 PROCESS_ANOMALY_THRESHOLD = float(os.getenv("PROCESS_ANOMALY_THRESHOLD", "60"))
 NETWORK_ALERT_THRESHOLD = float(os.getenv("NETWORK_ALERT_THRESHOLD", "55"))
 
@@ -36,11 +44,30 @@ SECURITY_SIGNAL_STALE_SECONDS = float(os.getenv("SECURITY_SIGNAL_STALE_SECONDS",
 
 ENABLE_CSV_LOGGING = os.getenv("ENABLE_CSV_LOGGING", "true").lower() == "true"
 CSV_LOG_PATH = os.getenv("CSV_LOG_PATH", "/app/logs/analysis_events.csv")
+CSV_FLUSH_BATCH_SIZE = int(os.getenv("CSV_FLUSH_BATCH_SIZE", "500"))
+CSV_FLUSH_INTERVAL_SECONDS = float(os.getenv("CSV_FLUSH_INTERVAL_SECONDS", "0.1"))
+CSV_QUEUE_SIZE = int(os.getenv("CSV_QUEUE_SIZE", "10000"))
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "4"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+DB_PREPARE_THRESHOLD = int(os.getenv("DB_PREPARE_THRESHOLD", "1"))
+
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "200"))
+PERSIST_FLUSH_INTERVAL_SECONDS = float(os.getenv("PERSIST_FLUSH_INTERVAL_SECONDS", "0.05"))
+PERSIST_QUEUE_SIZE = int(os.getenv("PERSIST_QUEUE_SIZE", "10000"))
+PERSIST_RETRY_BUFFER_SIZE = int(os.getenv("PERSIST_RETRY_BUFFER_SIZE", "2000"))
+
+METRICS_CACHE_SECONDS = float(os.getenv("METRICS_CACHE_SECONDS", "0.25"))
+EVENTS_NOTIFY_CHANNEL = os.getenv("EVENTS_NOTIFY_CHANNEL", "analysis_events")
+SSE_PING_SECONDS = int(os.getenv("SSE_PING_SECONDS", "15"))
 
 MODEL_ARTIFACT_METADATA = load_artifact_metadata(MODEL_ARTIFACT_PATH)
 
 LSTM_MODEL_PATH = os.getenv("LSTM_MODEL_PATH", "/app/models/lstm_anomaly_detector.pt")
-ANOMALY_DETECTOR = AnomalyDetector()
+LSTM_MICRO_BATCH = max(1, int(os.getenv("LSTM_MICRO_BATCH", "1")))
+LSTM_QUANTIZE_INT8 = os.getenv("LSTM_QUANTIZE_INT8", "false").lower() == "true"
+ANOMALY_DETECTOR = AnomalyDetector(micro_batch=LSTM_MICRO_BATCH)
 MODEL_VERSION = (
     str(MODEL_ARTIFACT_METADATA.get("model_version"))
     if MODEL_ARTIFACT_METADATA
@@ -94,7 +121,7 @@ class SecuritySignalPayload(BaseModel):
     sample_window_seconds: float = Field(default=1, gt=0)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VisionSignalState:
     captured_at: datetime
     anomaly_score: float
@@ -106,7 +133,7 @@ class VisionSignalState:
     image_path: str | None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SecuritySignalState:
     captured_at: datetime
     packet_rate: float
@@ -117,7 +144,7 @@ class SecuritySignalState:
     sample_window_seconds: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProcessLaneResult:
     score: float
     source: str
@@ -129,7 +156,7 @@ class ProcessLaneResult:
     model_version: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
     process_score: float
     network_score: float
@@ -151,53 +178,184 @@ class AnalysisResult:
     network_source: str
 
 
+class RollingWindow:
+    """Fixed-size NumPy ring buffer of ``width`` parallel streams.
+
+    Samples are stored row-wise in one contiguous ``(maxlen, width)`` array and
+    per-column running sums are kept so mean/std stay O(1) per update. Storage
+    may use a narrower ``dtype``; the sums always accumulate in float64.
+    """
+
+    def __init__(self, maxlen: int, width: int = 1, dtype: Any = np.float64) -> None:
+        self.maxlen = maxlen
+        self.width = width
+        self._buffer = np.zeros((maxlen, width), dtype=dtype)
+        self._index = 0
+        self._count = 0
+        self._sum = np.zeros(width, dtype=np.float64)
+        self._sum_sq = np.zeros(width, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, row: np.ndarray) -> None:
+        self.extend(np.asarray(row, dtype=np.float64).reshape(1, self.width))
+
+    def extend(self, rows: np.ndarray) -> None:
+        self._index, self._count = scoring.ring_buffer_extend(
+            self._buffer,
+            np.asarray(rows, dtype=np.float64).reshape(-1, self.width),
+            self._index,
+            self._count,
+            self._sum,
+            self._sum_sq,
+        )
+
+    def clear(self) -> None:
+        self._buffer.fill(0.0)
+        self._index = 0
+        self._count = 0
+        self._sum.fill(0.0)
+        self._sum_sq.fill(0.0)
+
+    def values(self) -> np.ndarray:
+        """Return the filled rows of the buffer (storage order, not arrival order)."""
+        return self._buffer[: self._count]
+
+    def mean_std(self) -> tuple[np.ndarray, np.ndarray]:
+        if not self._count:
+            return np.zeros(self.width), np.zeros(self.width)
+
+        mean = self._sum / self._count
+        # Running sums can drift slightly negative on near-constant windows.
+        variance = np.maximum(self._sum_sq / self._count - mean * mean, 0.0)
+        return mean, np.sqrt(variance)
+
+    def drift_scores(
+        self, values: np.ndarray, weights: np.ndarray, scale: float, min_count: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Clamped weighted z-score per row plus the z-scores themselves; zeros below ``min_count``."""
+        return scoring.drift_score_kernel(
+            values, self._sum, self._sum_sq, self._count, min_count, weights, scale
+        )
+
+
 class OnlineAnomalyModel:
     """Fallback online drift model used when external vision signals are absent."""
 
+    # Column order of the history window: production rate, reject rate, in-flight bottles.
+    WEIGHTS = np.array([0.35, 0.4, 0.25])
+
     def __init__(self, window_size: int = 120) -> None:
-        self.production_rate_history: deque[float] = deque(maxlen=window_size)
-        self.reject_rate_history: deque[float] = deque(maxlen=window_size)
-        self.inflight_history: deque[float] = deque(maxlen=window_size)
+        # float32 is ample precision for z-score gating and halves the window footprint.
+        self.history = RollingWindow(window_size, width=3, dtype=np.float32)
 
     @staticmethod
-    def _zscore(value: float, history: deque[float]) -> float:
-        if len(history) < 20:
-            return 0.0
+    def _stream_values(payload: "TelemetryPayload") -> tuple[float, float, float]:
+        return (payload.production_rate, payload.reject_rate, float(payload.in_flight_bottles))
 
-        mean = sum(history) / len(history)
-        variance = sum((item - mean) ** 2 for item in history) / len(history)
-        std = max(variance**0.5, 1e-6)
-        return abs((value - mean) / std)
+    def _score(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return self.history.drift_scores(values, self.WEIGHTS, 22.0, 20)
 
-    def evaluate(self, payload: "TelemetryPayload") -> tuple[float, list[str]]:
+    @staticmethod
+    def _drift_reasons(rate_z: float, reject_z: float, inflight_z: float) -> list[str]:
         reasons: list[str] = []
-
-        rate_z = self._zscore(payload.production_rate, self.production_rate_history)
-        reject_z = self._zscore(payload.reject_rate, self.reject_rate_history)
-        inflight_z = self._zscore(float(payload.in_flight_bottles), self.inflight_history)
-
         if rate_z > 2.6:
             reasons.append("Fallback drift model detected production-rate baseline shift")
         if reject_z > 2.4:
             reasons.append("Fallback drift model detected reject-rate baseline shift")
         if inflight_z > 2.8:
             reasons.append("Fallback drift model detected in-flight accumulation shift")
+        return reasons
+
+    def reset(self) -> None:
+        self.history.clear()
 
-        ml_score = clamp(((rate_z * 0.35) + (reject_z * 0.4) + (inflight_z * 0.25)) * 22)
+    def evaluate(self, payload: "TelemetryPayload") -> tuple[float, list[str]]:
+        values = np.array([self._stream_values(payload)], dtype=np.float64)
+        scores, zscores = self._score(values)
 
-        self.production_rate_history.append(payload.production_rate)
-        self.reject_rate_history.append(payload.reject_rate)
-        self.inflight_history.append(float(payload.in_flight_bottles))
+        reasons = self._drift_reasons(*zscores[0].tolist())
+        ml_score = float(scores[0])
+
+        self.history.append(values[0])
 
         return ml_score, reasons
 
+    def evaluate_batch(self, payloads: list["TelemetryPayload"]) -> list[tuple[float, list[str]]]:
+        """Score a batch against the current baseline, then fold the batch into it."""
+        if not payloads:
+            return []
+
+        values = np.array([self._stream_values(item) for item in payloads], dtype=np.float64)
+        scores, zscores = self._score(values)
+
+        self.history.extend(values)
+
+        return [
+            (score, self._drift_reasons(*row))
+            for score, row in zip(scores.tolist(), zscores.tolist())
+        ]
+
+
+class ShardedCounters:
+    """Monotonic counters split into one shard per thread.
+
+    Each shard is only ever written by its owning thread, so increments need no
+    lock; readers fold all shards together.
+    """
+
+    def __init__(self, keys: tuple[str, ...]) -> None:
+        self.keys = keys
+        self._local = threading.local()
+        self._shards: list[dict[str, int]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict[str, int]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = dict.fromkeys(self.keys, 0)
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def increment(self, key: str, amount: int = 1) -> None:
+        self._shard()[key] += amount
+
+    def snapshot(self) -> dict[str, int]:
+        totals = dict.fromkeys(self.keys, 0)
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, value in shard.items():
+                totals[key] += value
+        return totals
+
+    def reset(self) -> None:
+        with self._shards_lock:
+            for shard in self._shards:
+                for key in shard:
+                    shard[key] = 0
+
 
 @asynccontextmanager
 async def lifespan(application: FastAPI):
-    init_db()
+    scoring.warm_up()
+    application.state.db_pool = await open_db_pool()
+    await init_db()
+    application.state.event_writer = AnalysisEventWriter()
+    application.state.event_writer.start()
+    application.state.csv_writer = CsvLogWriter(CSV_EVENT_LOG)
+    application.state.csv_writer.start()
+    application.state.event_notifier = None
+    if application.state.db_pool is not None:
+        application.state.event_notifier = AnalysisEventNotifier()
+        application.state.event_notifier.start()
+    metrics_task = asyncio.create_task(_refresh_metrics_body()) if METRICS_CACHE_SECONDS > 0 else None
     # Try to load LSTM anomaly detector
     if Path(LSTM_MODEL_PATH).exists():
-        ok = ANOMALY_DETECTOR.load(LSTM_MODEL_PATH)
+        ok = ANOMALY_DETECTOR.load(LSTM_MODEL_PATH, quantize=LSTM_QUANTIZE_INT8)
         if ok:
             print(f"[ML] LSTM anomaly detector loaded from {LSTM_MODEL_PATH}")
         else:
@@ -205,23 +363,42 @@ async def lifespan(application: FastAPI):
     else:
         print(f"[ML] No LSTM model at {LSTM_MODEL_PATH} — anomaly detection will use buffer-only mode")
     yield
-
-
-app = FastAPI(title="Bottle Factory Analyzer API", version="1.1.0", lifespan=lifespan)
+    if metrics_task is not None:
+        metrics_task.cancel()
+    if application.state.event_notifier is not None:
+        await application.state.event_notifier.stop()
+    await application.state.event_writer.stop()
+    await application.state.csv_writer.stop()
+    await close_db_pool(application.state.db_pool)
+    CSV_EVENT_LOG.close()
+
+
+app = FastAPI(
+    title="Bottle Factory Analyzer API",
+    version="1.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 FALLBACK_MODEL = OnlineAnomalyModel()
 
-SIGNAL_LOCK = threading.Lock()
-LATEST_VISION_SIGNAL: VisionSignalState | None = None
-LATEST_SECURITY_SIGNAL: SecuritySignalState | None = None
-
-METRICS_LOCK = threading.Lock()
-METRICS_COUNTERS: dict[str, int | float] = {
-    "analyses_total": 0,
-    "process_anomalies_total": 0,
-    "network_alerts_total": 0,
-    "vision_signals_ingested": 0,
-    "security_signals_ingested": 0,
-}
+# Single-slot snapshots of the latest external signals. Storing or loading
+# ``slot[0]`` is one atomic operation under the GIL, so neither readers nor
+# writers need a lock; signal states are replaced, never mutated in place.
+_VISION_SLOT: list[VisionSignalState | None] = [None]
+_SECURITY_SLOT: list[SecuritySignalState | None] = [None]
+_LAST_ANALYSIS_SLOT: list[tuple[tuple[Any, ...], AnalysisResult, ProcessLaneResult] | None] = [None]
+# Latest rendered /metrics body, replaced wholesale by the refresher task.
+_METRICS_BODY_SLOT: list[bytes | None] = [None]
+
+METRICS_COUNTERS = ShardedCounters(
+    (
+        "analyses_total",
+        "process_anomalies_total",
+        "network_alerts_total",
+        "vision_signals_ingested",
+        "security_signals_ingested",
+    )
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -236,6 +413,16 @@ def clamp(value: float, minimum: float = 0, maximum: float = 100) -> float:
     return max(minimum, min(maximum, value))
 
 
+def _json_text(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
+def _now_iso_utc() -> tuple[datetime, str]:
+    """Return the current UTC time and its ISO form, read from one clock call."""
+    now = datetime.now(timezone.utc)
+    return now, now.isoformat()
+
+
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -245,12 +432,15 @@ def _parse_iso_timestamp(value: str | None) -> datetime:
         return _utc_now()
 
     try:
-        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        # Python 3.11+ parses a trailing "Z" natively.
+        parsed = datetime.fromisoformat(value)
     except ValueError:
         return _utc_now()
 
+    if parsed.tzinfo is timezone.utc:
+        return parsed
     if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.replace(tzinfo=timezone.utc)
 
     return parsed.astimezone(timezone.utc)
 
@@ -259,26 +449,28 @@ def _signal_age_seconds(captured_at: datetime) -> float:
     return max((_utc_now() - captured_at).total_seconds(), 0.0)
 
 
-def _set_vision_signal(signal: VisionSignalState) -> None:
-    global LATEST_VISION_SIGNAL
-    with SIGNAL_LOCK:
-        LATEST_VISION_SIGNAL = signal
+def _increment_metric(key: str, amount: int = 1) -> None:
+    METRICS_COUNTERS.increment(key, amount)
+
+
+def _snapshot_metrics() -> dict[str, int]:
+    return METRICS_COUNTERS.snapshot()
+
 
+def _set_vision_signal(signal: VisionSignalState | None) -> None:
+    _VISION_SLOT[0] = signal
 
-def _set_security_signal(signal: SecuritySignalState) -> None:
-    global LATEST_SECURITY_SIGNAL
-    with SIGNAL_LOCK:
-        LATEST_SECURITY_SIGNAL = signal
+
+def _set_security_signal(signal: SecuritySignalState | None) -> None:
+    _SECURITY_SLOT[0] = signal
 
 
 def _get_latest_vision_signal() -> VisionSignalState | None:
-    with SIGNAL_LOCK:
-        return LATEST_VISION_SIGNAL
+    return _VISION_SLOT[0]
 
 
 def _get_latest_security_signal() -> SecuritySignalState | None:
-    with SIGNAL_LOCK:
-        return LATEST_SECURITY_SIGNAL
+    return _SECURITY_SLOT[0]
 
 
 def _get_fresh_vision_signal() -> VisionSignalState | None:
@@ -299,16 +491,102 @@ def _get_fresh_security_signal() -> SecuritySignalState | None:
     return signal
 
 
-def get_connection():
-    from psycopg import connect
+def _configure_psycopg() -> None:
+    """Encode and decode JSON/JSONB parameters with orjson instead of the stdlib."""
+    from psycopg.types.json import set_json_dumps, set_json_loads
+
+    set_json_dumps(orjson.dumps)
+    set_json_loads(orjson.loads)
+
+
+def _connection_kwargs() -> dict[str, Any]:
+    # Server-side prepare the hot queries from their second execution on each
+    # connection; a negative threshold turns preparation off (e.g. behind PgBouncer).
+    return {
+        "autocommit": True,
+        "prepare_threshold": DB_PREPARE_THRESHOLD if DB_PREPARE_THRESHOLD >= 0 else None,
+    }
+
+
+async def get_connection():
+    from psycopg import AsyncConnection
+
+    _configure_psycopg()
+    return await AsyncConnection.connect(DATABASE_URL, **_connection_kwargs())
+
+
+async def open_db_pool():
+    """Open the shared async connection pool used by request handlers."""
+    from psycopg_pool import AsyncConnectionPool
+
+    _configure_psycopg()
+
+    pool = AsyncConnectionPool(
+        DATABASE_URL,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=max(DB_POOL_MAX_SIZE, DB_POOL_MIN_SIZE),
+        timeout=DB_POOL_TIMEOUT_SECONDS,
+        kwargs=_connection_kwargs(),
+        open=False,
+    )
+    await pool.open()
+    return pool
+
+
+async def close_db_pool(pool) -> None:
+    if pool is not None:
+        await pool.close()
+
+
+@asynccontextmanager
+async def db_connection():
+    """Borrow a pooled connection, or open a one-off connection if no pool is running."""
+    pool = getattr(app.state, "db_pool", None)
+    if pool is None:
+        async with await get_connection() as conn:
+            yield conn
+        return
+
+    async with pool.connection() as conn:
+        yield conn
 
-    return connect(DATABASE_URL, autocommit=True)
 
+def _db_pool_stats() -> dict[str, int] | None:
+    pool = getattr(app.state, "db_pool", None)
+    if pool is None:
+        return None
+
+    stats = pool.get_stats()
+    return {key: stats.get(key, 0) for key in ("pool_size", "pool_available", "requests_waiting")}
+
+
+# Columns added after the first release; only the ones missing from an older
+# table are altered at startup.
+ANALYSIS_EVENT_MIGRATIONS: dict[str, str] = {
+    "process_components": "JSONB NOT NULL DEFAULT '{}'::jsonb",
+    "network_components": "JSONB NOT NULL DEFAULT '{}'::jsonb",
+    "risk_level": "TEXT NOT NULL DEFAULT 'low'",
+    "recommended_action": "TEXT NOT NULL DEFAULT ''",
+    "model_version": "TEXT NOT NULL DEFAULT ''",
+    "vision_anomaly_score": "DOUBLE PRECISION",
+    "vision_defect_flag": "BOOLEAN",
+    "vision_inference_ms": "DOUBLE PRECISION",
+    "security_flag": "BOOLEAN NOT NULL DEFAULT FALSE",
+    "scan_time_ms": "DOUBLE PRECISION NOT NULL DEFAULT 0",
+    "process_source": "TEXT NOT NULL DEFAULT 'telemetry'",
+    "network_source": "TEXT NOT NULL DEFAULT 'telemetry'",
+}
 
-def init_db() -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
+ANALYSIS_EVENT_INDEXES: dict[str, str] = {
+    "analysis_events_created_at_idx": "(created_at DESC)",
+    "analysis_events_risk_idx": "(risk_level) WHERE process_anomaly OR network_alert",
+}
+
+
+async def init_db() -> None:
+    async with db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS analysis_events (
                     id BIGSERIAL PRIMARY KEY,
@@ -336,23 +614,61 @@ def init_db() -> None:
                 """
             )
 
-            migration_statements = [
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS process_components JSONB NOT NULL DEFAULT '{}'::jsonb",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS network_components JSONB NOT NULL DEFAULT '{}'::jsonb",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS risk_level TEXT NOT NULL DEFAULT 'low'",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS recommended_action TEXT NOT NULL DEFAULT ''",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS model_version TEXT NOT NULL DEFAULT ''",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS vision_anomaly_score DOUBLE PRECISION",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS vision_defect_flag BOOLEAN",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS vision_inference_ms DOUBLE PRECISION",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS security_flag BOOLEAN NOT NULL DEFAULT FALSE",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS scan_time_ms DOUBLE PRECISION NOT NULL DEFAULT 0",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS process_source TEXT NOT NULL DEFAULT 'telemetry'",
-                "ALTER TABLE analysis_events ADD COLUMN IF NOT EXISTS network_source TEXT NOT NULL DEFAULT 'telemetry'",
+            await cur.execute(
+                """
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'analysis_events'
+                """
+            )
+            existing_columns = {row[0] for row in await cur.fetchall()}
+
+            missing_columns = [
+                f"ADD COLUMN IF NOT EXISTS {column} {definition}"
+                for column, definition in ANALYSIS_EVENT_MIGRATIONS.items()
+                if column not in existing_columns
             ]
+            if missing_columns:
+                # One statement rewrites the table and takes the lock once.
+                await cur.execute(f"ALTER TABLE analysis_events {', '.join(missing_columns)}")
 
-            for statement in migration_statements:
-                cur.execute(statement)
+            await cur.execute(
+                """
+                SELECT indexname
+                FROM pg_indexes
+                WHERE schemaname = current_schema() AND tablename = 'analysis_events'
+                """
+            )
+            existing_indexes = {row[0] for row in await cur.fetchall()}
+
+            # One NOTIFY per insert statement (a whole COPY batch) carrying its newest id.
+            await cur.execute(
+                f"""
+                CREATE OR REPLACE FUNCTION notify_analysis_events() RETURNS trigger
+                LANGUAGE plpgsql AS $$
+                BEGIN
+                    PERFORM pg_notify('{EVENTS_NOTIFY_CHANNEL}', (SELECT COALESCE(max(id), 0) FROM inserted_events)::text);
+                    RETURN NULL;
+                END
+                $$
+                """
+            )
+            await cur.execute(
+                """
+                CREATE OR REPLACE TRIGGER analysis_events_notify
+                AFTER INSERT ON analysis_events
+                REFERENCING NEW TABLE AS inserted_events
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_analysis_events()
+                """
+            )
+
+            # CONCURRENTLY keeps ingest writes flowing; it needs the autocommit
+            # connection because it cannot run inside a transaction block.
+            for index_name, definition in ANALYSIS_EVENT_INDEXES.items():
+                if index_name not in existing_indexes:
+                    await cur.execute(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON analysis_events {definition}"
+                    )
 
 
 def _resolve_process_lane(payload: TelemetryPayload) -> ProcessLaneResult:
@@ -392,17 +708,7 @@ def _resolve_process_lane(payload: TelemetryPayload) -> ProcessLaneResult:
         )
 
     if USE_FALLBACK_DRIFT_MODEL:
-        score, reasons = FALLBACK_MODEL.evaluate(payload)
-        return ProcessLaneResult(
-            score=score,
-            source="fallback-telemetry-drift",
-            reasons=reasons,
-            component_label="Telemetry drift fallback model",
-            vision_anomaly_score=score,
-            vision_defect_flag=score >= PROCESS_ANOMALY_THRESHOLD,
-            vision_inference_ms=0.0,
-            model_version="hybrid-rule-zscore-v1.1",
-        )
+        return _fallback_process_lane(payload)
 
     return ProcessLaneResult(
         score=0.0,
@@ -416,6 +722,20 @@ def _resolve_process_lane(payload: TelemetryPayload) -> ProcessLaneResult:
     )
 
 
+def _fallback_process_lane(payload: TelemetryPayload) -> ProcessLaneResult:
+    score, reasons = FALLBACK_MODEL.evaluate(payload)
+    return ProcessLaneResult(
+        score=score,
+        source="fallback-telemetry-drift",
+        reasons=reasons,
+        component_label="Telemetry drift fallback model",
+        vision_anomaly_score=score,
+        vision_defect_flag=score >= PROCESS_ANOMALY_THRESHOLD,
+        vision_inference_ms=0.0,
+        model_version="hybrid-rule-zscore-v1.1",
+    )
+
+
 def _resolve_network_inputs(payload: TelemetryPayload) -> tuple[float, float, int, bool, str]:
     packet_rate = payload.network_packet_rate
     burst_ratio = payload.network_burst_ratio
@@ -437,76 +757,134 @@ def _resolve_network_inputs(payload: TelemetryPayload) -> tuple[float, float, in
     return packet_rate, burst_ratio, unauthorized_attempts, security_flag, source
 
 
+PROCESS_RULE_COMPONENTS: tuple[tuple[int, str, str], ...] = (
+    (scoring.REJECT_RATE_COMPONENT, "Reject rate deviation", "Reject rate above expected baseline"),
+    (
+        scoring.THROUGHPUT_COMPONENT,
+        "Throughput collapse while conveyor running",
+        "Conveyor running with low throughput",
+    ),
+    (
+        scoring.ACCUMULATION_COMPONENT,
+        "In-flight bottle accumulation",
+        "Bottle accumulation indicates possible jam",
+    ),
+    (scoring.ALARM_HORN_COMPONENT, "PLC alarm horn active", "PLC alarm horn is active"),
+    (
+        scoring.REJECT_GATE_COMPONENT,
+        "Reject gate with elevated rejects",
+        "Reject gate active with elevated rejects",
+    ),
+)
+
+NETWORK_RULE_COMPONENTS: tuple[tuple[int, str, str], ...] = (
+    (scoring.PACKET_RATE_COMPONENT, "Packet-rate deviation", ""),
+    (scoring.BURST_COMPONENT, "Burst traffic anomaly", "Burst traffic pattern suggests malformed polling"),
+    (
+        scoring.UNAUTHORIZED_COMPONENT,
+        "Unauthorized write attempts",
+        "Unauthorized network write attempt detected",
+    ),
+    (
+        scoring.SECURITY_FLAG_COMPONENT,
+        "Security flag lane",
+        "Security monitor flagged suspicious control-network activity",
+    ),
+)
+
+
+def _analysis_signature(payload: TelemetryPayload) -> tuple[Any, ...]:
+    """Every payload field that can influence ``analyze_payload`` except scan time."""
+    return (
+        payload.production_rate,
+        payload.reject_rate,
+        payload.in_flight_bottles,
+        payload.conveyor_running,
+        payload.output_alarm_horn,
+        payload.output_reject_gate,
+        payload.network_packet_rate,
+        payload.network_burst_ratio,
+        payload.network_unauthorized_attempts,
+        payload.security_flag,
+        payload.vision_anomaly_score,
+        payload.vision_defect_flag,
+        payload.vision_model_version,
+        payload.vision_inference_ms,
+    )
+
+
 def analyze_payload(payload: TelemetryPayload) -> AnalysisResult:
-    rule_process_score = 0.0
-    network_score = 0.0
+    """Analyze one telemetry sample, reusing the previous result for exact repeats.
+
+    Consecutive identical samples are common while the line is idle. When no
+    fresh external signal could change the outcome, a repeat reuses the last
+    result (with its own scan time) instead of re-running the rules. The
+    fallback drift window is stateful, so repeats still feed it; the cached
+    result is only reused while the drift lane's output stays the same.
+    """
+    signature = _analysis_signature(payload)
+    cacheable = (
+        ANALYSIS_DEDUP_ENABLED
+        and _get_fresh_vision_signal() is None
+        and _get_fresh_security_signal() is None
+    )
+
+    process_lane: ProcessLaneResult | None = None
+    previous = _LAST_ANALYSIS_SLOT[0]
+    if cacheable and previous is not None and previous[0] == signature:
+        _, previous_result, previous_lane = previous
+        if previous_lane.source != "fallback-telemetry-drift":
+            return replace(previous_result, scan_time_ms=payload.scan_time_ms)
+        process_lane = _fallback_process_lane(payload)
+        if process_lane == previous_lane:
+            return replace(previous_result, scan_time_ms=payload.scan_time_ms)
+
+    if process_lane is None:
+        process_lane = _resolve_process_lane(payload)
+    result = _analyze_payload_uncached(payload, process_lane)
+    _LAST_ANALYSIS_SLOT[0] = (signature, result, process_lane) if cacheable else None
+    return result
+
+
+def _analyze_payload_uncached(payload: TelemetryPayload, process_lane: ProcessLaneResult) -> AnalysisResult:
     reasons: list[str] = []
     process_components: dict[str, float] = {}
     network_components: dict[str, float] = {}
 
-    if payload.reject_rate > 12:
-        reject_component = min(40, (payload.reject_rate - 12) * 2)
-        rule_process_score += reject_component
-        process_components["Reject rate deviation"] = round(reject_component, 2)
-        reasons.append("Reject rate above expected baseline")
-
-    if payload.production_rate < 4 and payload.conveyor_running:
-        throughput_component = 22
-        rule_process_score += throughput_component
-        process_components["Throughput collapse while conveyor running"] = throughput_component
-        reasons.append("Conveyor running with low throughput")
-
-    if payload.in_flight_bottles > 6:
-        accumulation_component = 25
-        rule_process_score += accumulation_component
-        process_components["In-flight bottle accumulation"] = accumulation_component
-        reasons.append("Bottle accumulation indicates possible jam")
-
-    if payload.output_alarm_horn:
-        alarm_component = 12
-        rule_process_score += alarm_component
-        process_components["PLC alarm horn active"] = alarm_component
-        reasons.append("PLC alarm horn is active")
-
-    if payload.output_reject_gate and payload.reject_rate > 8:
-        reject_gate_component = 10
-        rule_process_score += reject_gate_component
-        process_components["Reject gate with elevated rejects"] = reject_gate_component
-        reasons.append("Reject gate active with elevated rejects")
-
-    process_lane = _resolve_process_lane(payload)
+    packet_rate, burst_ratio, unauthorized_attempts, security_flag, network_source = _resolve_network_inputs(payload)
+
+    rule_process_score, network_score, components, mask = scoring.rule_score_kernel(
+        float(payload.reject_rate),
+        float(payload.production_rate),
+        bool(payload.conveyor_running),
+        float(payload.in_flight_bottles),
+        bool(payload.output_alarm_horn),
+        bool(payload.output_reject_gate),
+        float(packet_rate),
+        float(burst_ratio),
+        float(unauthorized_attempts),
+        bool(security_flag),
+        EXPECTED_PACKET_RATE,
+    )
+    component_values = components.tolist()
+
+    for index, label, reason in PROCESS_RULE_COMPONENTS:
+        if mask & (1 << index):
+            process_components[label] = round(component_values[index], 2)
+            reasons.append(reason)
+
     process_components[process_lane.component_label] = round(process_lane.score, 2)
     reasons.extend(process_lane.reasons)
 
-    packet_rate, burst_ratio, unauthorized_attempts, security_flag, network_source = _resolve_network_inputs(payload)
-
-    packet_delta = abs(packet_rate - EXPECTED_PACKET_RATE)
-    packet_rate_component = min(35.0, packet_delta * 1.1)
-    network_score += packet_rate_component
-    network_components["Packet-rate deviation"] = round(packet_rate_component, 2)
-    if packet_delta > 18:
-        reasons.append("Network packet rate drift detected")
-
-    if burst_ratio > 0.72:
-        burst_component = (burst_ratio - 0.72) * 90
-        network_score += burst_component
-        network_components["Burst traffic anomaly"] = round(burst_component, 2)
-        reasons.append("Burst traffic pattern suggests malformed polling")
-
-    if unauthorized_attempts > 0:
-        unauthorized_component = 35 + unauthorized_attempts * 10
-        network_score += unauthorized_component
-        network_components["Unauthorized write attempts"] = round(unauthorized_component, 2)
-        reasons.append("Unauthorized network write attempt detected")
-
-    if security_flag:
-        security_component = 42
-        network_score += security_component
-        network_components["Security flag lane"] = security_component
-        reasons.append("Security monitor flagged suspicious control-network activity")
+    for index, label, reason in NETWORK_RULE_COMPONENTS:
+        if mask & (1 << index):
+            network_components[label] = round(component_values[index], 2)
+            if reason:
+                reasons.append(reason)
+        if index == scoring.PACKET_RATE_COMPONENT and mask & (1 << scoring.PACKET_DRIFT_BIT):
+            reasons.append("Network packet rate drift detected")
 
     process_score = clamp(max(rule_process_score, process_lane.score))
-    network_score = clamp(network_score)
 
     process_anomaly = process_score >= PROCESS_ANOMALY_THRESHOLD
     network_alert = network_score >= NETWORK_ALERT_THRESHOLD or security_flag
@@ -557,101 +935,356 @@ def analyze_payload(payload: TelemetryPayload) -> AnalysisResult:
     )
 
 
-def _append_csv_log(payload: TelemetryPayload, result: AnalysisResult) -> None:
+CSV_LOG_FIELDS = (
+    "created_at",
+    "process_score",
+    "network_score",
+    "process_anomaly",
+    "network_alert",
+    "model_confidence",
+    "model_version",
+    "risk_level",
+    "vision_anomaly_score",
+    "vision_defect_flag",
+    "vision_inference_ms",
+    "security_flag",
+    "scan_time_ms",
+    "process_source",
+    "network_source",
+    "reasons_json",
+    "payload_json",
+)
+
+
+class CsvEventLog:
+    """Append-only CSV sink that keeps its file handle open between writes."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._handle: Any = None
+        self._writer: Any = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not self.path.exists() or self.path.stat().st_size == 0
+        self._handle = self.path.open("a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._handle)
+        if write_header:
+            self._writer.writerow(CSV_LOG_FIELDS)
+
+    def write_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        with self._lock:
+            if self._handle is None:
+                self._open()
+            self._writer.writerows(rows)
+            self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = None
+            self._writer = None
+
+
+CSV_EVENT_LOG = CsvEventLog(CSV_LOG_PATH)
+
+
+def _csv_log_row(result: AnalysisResult, payload_json: str, reasons_json: str) -> tuple[Any, ...]:
+    return (
+        _now_iso_utc()[1],
+        result.process_score,
+        result.network_score,
+        result.process_anomaly,
+        result.network_alert,
+        result.model_confidence,
+        result.model_version,
+        result.risk_level,
+        result.vision_anomaly_score,
+        result.vision_defect_flag,
+        result.vision_inference_ms,
+        result.security_flag,
+        result.scan_time_ms,
+        result.process_source,
+        result.network_source,
+        reasons_json,
+        payload_json,
+    )
+
+
+def _append_csv_log(result: AnalysisResult, payload_json: str, reasons_json: str) -> None:
     if not ENABLE_CSV_LOGGING:
         return
 
-    try:
-        import pandas as pd
-    except Exception:
-        return
+    CSV_EVENT_LOG.write_rows([_csv_log_row(result, payload_json, reasons_json)])
+
+
+ANALYSIS_EVENT_COLUMNS = (
+    "payload",
+    "process_score",
+    "network_score",
+    "process_anomaly",
+    "network_alert",
+    "model_confidence",
+    "process_components",
+    "network_components",
+    "risk_level",
+    "recommended_action",
+    "model_version",
+    "reasons",
+    "vision_anomaly_score",
+    "vision_defect_flag",
+    "vision_inference_ms",
+    "security_flag",
+    "scan_time_ms",
+    "process_source",
+    "network_source",
+)
 
-    output_path = Path(CSV_LOG_PATH)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    file_exists = output_path.exists()
-
-    row = {
-        "created_at": _utc_now().isoformat(),
-        "process_score": result.process_score,
-        "network_score": result.network_score,
-        "process_anomaly": result.process_anomaly,
-        "network_alert": result.network_alert,
-        "model_confidence": result.model_confidence,
-        "model_version": result.model_version,
-        "risk_level": result.risk_level,
-        "vision_anomaly_score": result.vision_anomaly_score,
-        "vision_defect_flag": result.vision_defect_flag,
-        "vision_inference_ms": result.vision_inference_ms,
-        "security_flag": result.security_flag,
-        "scan_time_ms": result.scan_time_ms,
-        "process_source": result.process_source,
-        "network_source": result.network_source,
-        "reasons_json": json.dumps(result.reasons),
-        "payload_json": json.dumps(payload.model_dump()),
-    }
+_ANALYSIS_EVENT_COPY_SQL = f"COPY analysis_events ({', '.join(ANALYSIS_EVENT_COLUMNS)}) FROM STDIN"
+
+
+def _analysis_event_row(result: AnalysisResult, payload_json: str, reasons_json: str) -> tuple[Any, ...]:
+    return (
+        payload_json,
+        result.process_score,
+        result.network_score,
+        result.process_anomaly,
+        result.network_alert,
+        result.model_confidence,
+        _json_text(result.process_components),
+        _json_text(result.network_components),
+        result.risk_level,
+        result.recommended_action,
+        result.model_version,
+        reasons_json,
+        result.vision_anomaly_score,
+        result.vision_defect_flag,
+        result.vision_inference_ms,
+        result.security_flag,
+        result.scan_time_ms,
+        result.process_source,
+        result.network_source,
+    )
 
-    pd.DataFrame([row]).to_csv(output_path, mode="a", header=not file_exists, index=False)
 
+async def _copy_analysis_rows(rows: list[tuple[Any, ...]]) -> None:
+    async with db_connection() as conn:
+        async with conn.cursor() as cur:
+            async with cur.copy(_ANALYSIS_EVENT_COPY_SQL) as copy:
+                for row in rows:
+                    await copy.write_row(row)
 
-def persist_analysis(payload: TelemetryPayload, result: AnalysisResult) -> None:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO analysis_events (
-                    payload,
-                    process_score,
-                    network_score,
-                    process_anomaly,
-                    network_alert,
-                    model_confidence,
-                    process_components,
-                    network_components,
-                    risk_level,
-                    recommended_action,
-                    model_version,
-                    reasons,
-                    vision_anomaly_score,
-                    vision_defect_flag,
-                    vision_inference_ms,
-                    security_flag,
-                    scan_time_ms,
-                    process_source,
-                    network_source
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    json.dumps(payload.model_dump()),
-                    result.process_score,
-                    result.network_score,
-                    result.process_anomaly,
-                    result.network_alert,
-                    result.model_confidence,
-                    json.dumps(result.process_components),
-                    json.dumps(result.network_components),
-                    result.risk_level,
-                    result.recommended_action,
-                    result.model_version,
-                    json.dumps(result.reasons),
-                    result.vision_anomaly_score,
-                    result.vision_defect_flag,
-                    result.vision_inference_ms,
-                    result.security_flag,
-                    result.scan_time_ms,
-                    result.process_source,
-                    result.network_source,
-                ),
-            )
 
-    _append_csv_log(payload, result)
+class AnalysisEventNotifier:
+    """One ``LISTEN`` connection that wakes every SSE client when events are inserted.
 
+    The insert trigger sends the newest id of each statement on
+    ``EVENTS_NOTIFY_CHANNEL``; clients wait on it instead of polling.
+    """
 
-def _serialize_jsonb(value: Any) -> Any:
-    if isinstance(value, (dict, list)):
-        return value
-    if value is None:
-        return None
-    return json.loads(value)
+    def __init__(self, channel: str = EVENTS_NOTIFY_CHANNEL, retry_seconds: float = 2.0) -> None:
+        self.channel = channel
+        self.retry_seconds = retry_seconds
+        self.latest_id = 0
+        self.listening = False
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.listening = False
+
+    def publish(self, event_id: int) -> None:
+        self.latest_id = max(self.latest_id, event_id)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self, after_id: int, timeout: float) -> bool:
+        """Wait until an id newer than ``after_id`` is announced; ``False`` on timeout."""
+        if self.latest_id > after_id:
+            return True
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.latest_id > after_id
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with await get_connection() as conn:
+                    await conn.execute(f"LISTEN {self.channel}")
+                    self.listening = True
+                    async for notify in conn.notifies():
+                        self.publish(int(notify.payload or 0))
+            except Exception as error:
+                print(f"[DB] Event listener disconnected: {error}")
+            self.listening = False
+            # Wake waiting clients so they fall back to polling while we reconnect.
+            self.publish(self.latest_id)
+            await asyncio.sleep(self.retry_seconds)
+
+
+class QueuedBatchWriter(ABC):
+    """Drain an ``asyncio.Queue`` from one background task and flush rows in batches.
+
+    The task waits for a first row, lets ``flush_interval`` worth of rows
+    accumulate, then hands up to ``batch_size`` rows to ``_flush``.
+    """
+
+    def __init__(self, *, batch_size: int, flush_interval: float, queue_size: int) -> None:
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = max(flush_interval, 0.0)
+        self.queue: asyncio.Queue[tuple[Any, ...]] = asyncio.Queue(maxsize=max(queue_size, 0))
+        self._task: asyncio.Task[None] | None = None
+        # True while the task holds dequeued rows (settling or flushing).
+        self._busy = False
+        self._stopping = False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            # Only cancel an idle task: one blocked in ``queue.get`` holds no rows.
+            # A busy task finishes its batch and then sees ``_stopping``.
+            if not self._busy:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self._flush(self._drain(self.queue.qsize()))
+
+    def _drain(self, limit: int) -> list[tuple[Any, ...]]:
+        rows: list[tuple[Any, ...]] = []
+        while len(rows) < limit:
+            try:
+                rows.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return rows
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            first_row = await self.queue.get()
+            self._busy = True
+            try:
+                if self.flush_interval:
+                    await asyncio.sleep(self.flush_interval)
+                batch = [first_row, *self._drain(self.batch_size - 1)]
+                await self._flush(batch)
+            finally:
+                self._busy = False
+
+    @abstractmethod
+    async def _flush(self, batch: list[tuple[Any, ...]]) -> None:
+        """Persist one batch; called from the background task and for the final drain."""
+
+
+class AnalysisEventWriter(QueuedBatchWriter):
+    """Background writer that batches analysis events into COPY statements.
+
+    Rows that fail to flush are kept in a bounded retry buffer and prepended to
+    the next batch, so a short database outage does not drop recent events.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = PERSIST_BATCH_SIZE,
+        flush_interval: float = PERSIST_FLUSH_INTERVAL_SECONDS,
+        queue_size: int = PERSIST_QUEUE_SIZE,
+        retry_buffer_size: int = PERSIST_RETRY_BUFFER_SIZE,
+    ) -> None:
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval, queue_size=queue_size)
+        self.retry_buffer: deque[tuple[Any, ...]] = deque(maxlen=max(retry_buffer_size, 1))
+
+    async def submit(self, row: tuple[Any, ...]) -> None:
+        await self.queue.put(row)
+
+    async def _flush(self, batch: list[tuple[Any, ...]]) -> None:
+        rows = [*self.retry_buffer, *batch]
+        if not rows:
+            return
+
+        try:
+            await _copy_analysis_rows(rows)
+        except Exception as error:
+            print(f"[DB] Failed to persist {len(rows)} analysis events: {error}")
+            self.retry_buffer.extend(batch)
+            return
+        self.retry_buffer.clear()
+
+
+class CsvLogWriter(QueuedBatchWriter):
+    """Background CSV logger; drops the oldest queued row rather than blocking requests."""
+
+    def __init__(
+        self,
+        event_log: CsvEventLog,
+        *,
+        batch_size: int = CSV_FLUSH_BATCH_SIZE,
+        flush_interval: float = CSV_FLUSH_INTERVAL_SECONDS,
+        queue_size: int = CSV_QUEUE_SIZE,
+    ) -> None:
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval, queue_size=queue_size)
+        self.event_log = event_log
+        self.dropped_rows = 0
+
+    def submit(self, row: tuple[Any, ...]) -> None:
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.queue.get_nowait()
+            self.dropped_rows += 1
+            self.queue.put_nowait(row)
+
+    async def _flush(self, batch: list[tuple[Any, ...]]) -> None:
+        if not batch:
+            return
+
+        try:
+            await asyncio.to_thread(self.event_log.write_rows, batch)
+        except OSError as error:
+            print(f"[CSV] Failed to write {len(batch)} rows to {self.event_log.path}: {error}")
+
+
+async def persist_analysis(payload: TelemetryPayload, result: AnalysisResult) -> None:
+    # Encode the shared JSON columns once for both the database and CSV rows.
+    payload_json = payload.model_dump_json()
+    reasons_json = _json_text(result.reasons)
+
+    row = _analysis_event_row(result, payload_json, reasons_json)
+    writer: AnalysisEventWriter | None = getattr(app.state, "event_writer", None)
+    if writer is None:
+        await _copy_analysis_rows([row])
+    else:
+        await writer.submit(row)
+
+    csv_writer: CsvLogWriter | None = getattr(app.state, "csv_writer", None)
+    if csv_writer is None:
+        await asyncio.to_thread(_append_csv_log, result, payload_json, reasons_json)
+    elif ENABLE_CSV_LOGGING:
+        csv_writer.submit(_csv_log_row(result, payload_json, reasons_json))
 
 
 EVENT_SELECT_COLUMNS = """
@@ -678,68 +1311,160 @@ EVENT_SELECT_COLUMNS = """
 """
 
 
-def _parse_event_row(row: tuple[Any, ...]) -> dict[str, Any]:
-    return {
-        "id": row[0],
-        "created_at": row[1].isoformat(),
-        "process_score": row[2],
-        "network_score": row[3],
-        "process_anomaly": row[4],
-        "network_alert": row[5],
-        "model_confidence": row[6],
-        "process_components": _serialize_jsonb(row[7]) or {},
-        "network_components": _serialize_jsonb(row[8]) or {},
-        "risk_level": row[9],
-        "recommended_action": row[10],
-        "model_version": row[11],
-        "reasons": _serialize_jsonb(row[12]) or [],
-        "vision_anomaly_score": row[13],
-        "vision_defect_flag": row[14],
-        "vision_inference_ms": row[15],
-        "security_flag": row[16],
-        "scan_time_ms": row[17],
-        "process_source": row[18],
-        "network_source": row[19],
-    }
+class EventRow(BaseModel):
+    """One persisted analysis event as returned by the events endpoints."""
 
+    model_config = ConfigDict(frozen=True)
 
-def _fetch_events(limit: int, *, ascending: bool = False, after_id: int | None = None) -> list[dict[str, Any]]:
-    safe_limit = max(1, min(limit, 200))
-    order_direction = "ASC" if ascending else "DESC"
+    id: int
+    created_at: str
+    process_score: float
+    network_score: float
+    process_anomaly: bool
+    network_alert: bool
+    model_confidence: float
+    process_components: dict[str, float]
+    network_components: dict[str, float]
+    risk_level: str
+    recommended_action: str
+    model_version: str
+    reasons: list[str]
+    vision_anomaly_score: float | None
+    vision_defect_flag: bool | None
+    vision_inference_ms: float | None
+    security_flag: bool
+    scan_time_ms: float
+    process_source: str
+    network_source: str
+
+
+class EventsResponse(BaseModel):
+    count: int
+    events: list[EventRow]
+
+
+def _parse_event_row(row: tuple[Any, ...]) -> EventRow:
+    # Rows come from our own table, so validation is skipped; JSONB columns are
+    # already decoded by psycopg.
+    return EventRow.model_construct(
+        id=row[0],
+        created_at=row[1].isoformat(),
+        process_score=row[2],
+        network_score=row[3],
+        process_anomaly=row[4],
+        network_alert=row[5],
+        model_confidence=row[6],
+        process_components=row[7] or {},
+        network_components=row[8] or {},
+        risk_level=row[9],
+        recommended_action=row[10],
+        model_version=row[11],
+        reasons=row[12] or [],
+        vision_anomaly_score=row[13],
+        vision_defect_flag=row[14],
+        vision_inference_ms=row[15],
+        security_flag=row[16],
+        scan_time_ms=row[17],
+        process_source=row[18],
+        network_source=row[19],
+    )
 
-    where_clause = ""
-    params: list[Any]
+
+@functools.cache
+def _events_sql(ascending: bool, after: bool, before: bool) -> str:
+    # One fixed text per query shape, so each shape maps to a single prepared statement.
+    conditions = [condition for condition, used in (("id > %s", after), ("id < %s", before)) if used]
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    return f"""
+        SELECT
+            {EVENT_SELECT_COLUMNS}
+        FROM analysis_events
+        {where_clause}
+        ORDER BY id {"ASC" if ascending else "DESC"}
+        LIMIT %s
+    """
+
+
+def _events_query(
+    limit: int,
+    *,
+    ascending: bool = False,
+    after_id: int | None = None,
+    before_id: int | None = None,
+) -> tuple[str, tuple[Any, ...]]:
+    """Keyset-paginated event query; ``after_id``/``before_id`` bound the primary-key scan."""
+    params: list[Any] = []
     if after_id is not None:
-        where_clause = "WHERE id > %s"
-        params = [max(after_id, 0), safe_limit]
-    else:
-        params = [safe_limit]
+        params.append(max(after_id, 0))
+    if before_id is not None:
+        params.append(before_id)
+    params.append(max(1, min(limit, 200)))
+
+    query = _events_sql(ascending, after_id is not None, before_id is not None)
+    return query, tuple(params)
 
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
+
+async def _fetch_event_json(
+    limit: int, *, ascending: bool = False, after_id: int | None = None
+) -> list[tuple[int, str]]:
+    """Fetch events as ``(id, json_text)`` pairs, serialized by Postgres."""
+    query, params = _events_query(limit, ascending=ascending, after_id=after_id)
+    order_direction = "ASC" if ascending else "DESC"
+    async with db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                f"SELECT event.id, row_to_json(event)::text FROM ({query}) AS event ORDER BY event.id {order_direction}",
+                params,
+            )
+            return await cur.fetchall()
+
+
+async def _fetch_events_document(limit: int, *, before_id: int | None = None) -> str:
+    """Build the whole ``/events`` body with ``json_agg`` so no row passes through Python."""
+    query, params = _events_query(limit, ascending=False, before_id=before_id)
+    async with db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
                 f"""
-                SELECT
-                    {EVENT_SELECT_COLUMNS}
-                FROM analysis_events
-                {where_clause}
-                ORDER BY id {order_direction}
-                LIMIT %s
+                SELECT json_build_object(
+                    'count', count(*),
+                    'events', COALESCE(json_agg(event ORDER BY event.id DESC), '[]'::json)
+                )::text
+                FROM ({query}) AS event
                 """,
-                tuple(params),
+                params,
             )
-            rows = cur.fetchall()
+            row = await cur.fetchone()
+
+    return row[0]
+
 
-    return [_parse_event_row(row) for row in rows]
+async def _iter_events(
+    limit: int,
+    *,
+    ascending: bool = False,
+    after_id: int | None = None,
+    before_id: int | None = None,
+) -> AsyncIterator[EventRow]:
+    """Yield events one by one from a server-side cursor instead of materializing them."""
+    query, params = _events_query(limit, ascending=ascending, after_id=after_id, before_id=before_id)
+    async with db_connection() as conn:
+        # Named cursors only live inside a transaction on autocommit connections.
+        async with conn.transaction():
+            async with conn.cursor(name="analysis_events_stream") as cur:
+                await cur.execute(query, params)
+                async for row in cur:
+                    yield _parse_event_row(row)
 
 
 @app.get("/health")
-def health() -> dict[str, Any]:
+async def health() -> dict[str, Any]:
     try:
-        with get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1")
-                cur.fetchone()
+        async with db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT 1")
+                await cur.fetchone()
     except Exception as error:  # pragma: no cover - runtime path
         return {"ok": False, "db": False, "error": str(error)}
 
@@ -750,13 +1475,14 @@ def health() -> dict[str, Any]:
         "port": API_PORT,
         "model_version": MODEL_VERSION,
         "artifact_loaded": MODEL_ARTIFACT_METADATA is not None,
+        "db_pool": _db_pool_stats(),
         "vision_signal_fresh": _get_fresh_vision_signal() is not None,
         "security_signal_fresh": _get_fresh_security_signal() is not None,
     }
 
 
 @app.post("/signals/vision")
-def ingest_vision_signal(payload: VisionSignalPayload) -> dict[str, Any]:
+async def ingest_vision_signal(payload: VisionSignalPayload) -> dict[str, Any]:
     signal = VisionSignalState(
         captured_at=_parse_iso_timestamp(payload.timestamp),
         anomaly_score=payload.anomaly_score,
@@ -769,8 +1495,7 @@ def ingest_vision_signal(payload: VisionSignalPayload) -> dict[str, Any]:
     )
     _set_vision_signal(signal)
 
-    with METRICS_LOCK:
-        METRICS_COUNTERS["vision_signals_ingested"] += 1
+    _increment_metric("vision_signals_ingested")
 
     return {
         "ok": True,
@@ -785,9 +1510,8 @@ def ingest_vision_signal(payload: VisionSignalPayload) -> dict[str, Any]:
     }
 
 
-@app.post("/signals/security")
-def ingest_security_signal(payload: SecuritySignalPayload) -> dict[str, Any]:
-    signal = SecuritySignalState(
+def _security_signal_from_payload(payload: SecuritySignalPayload) -> SecuritySignalState:
+    return SecuritySignalState(
         captured_at=_parse_iso_timestamp(payload.timestamp),
         packet_rate=payload.packet_rate,
         burst_ratio=payload.burst_ratio,
@@ -796,29 +1520,56 @@ def ingest_security_signal(payload: SecuritySignalPayload) -> dict[str, Any]:
         source=payload.source,
         sample_window_seconds=payload.sample_window_seconds,
     )
+
+
+def _security_signal_summary(signal: SecuritySignalState) -> dict[str, Any]:
+    return {
+        "timestamp": signal.captured_at.isoformat(),
+        "packet_rate": signal.packet_rate,
+        "burst_ratio": signal.burst_ratio,
+        "unauthorized_attempts": signal.unauthorized_attempts,
+        "security_flag": signal.security_flag,
+        "source": signal.source,
+        "age_seconds": _signal_age_seconds(signal.captured_at),
+    }
+
+
+@app.post("/signals/security")
+async def ingest_security_signal(payload: SecuritySignalPayload) -> dict[str, Any]:
+    signal = _security_signal_from_payload(payload)
     _set_security_signal(signal)
 
-    with METRICS_LOCK:
-        METRICS_COUNTERS["security_signals_ingested"] += 1
+    _increment_metric("security_signals_ingested")
 
     return {
         "ok": True,
-        "security_signal": {
-            "timestamp": signal.captured_at.isoformat(),
-            "packet_rate": signal.packet_rate,
-            "burst_ratio": signal.burst_ratio,
-            "unauthorized_attempts": signal.unauthorized_attempts,
-            "security_flag": signal.security_flag,
-            "source": signal.source,
-            "age_seconds": _signal_age_seconds(signal.captured_at),
-        },
+        "security_signal": _security_signal_summary(signal),
+    }
+
+
+@app.post("/signals/security/batch")
+async def ingest_security_signal_batch(
+    payloads: Annotated[list[SecuritySignalPayload], Body(min_length=1, max_length=256)],
+) -> dict[str, Any]:
+    """Ingest several monitor windows in one request; the last one becomes the current signal."""
+    signal = _security_signal_from_payload(payloads[-1])
+    _set_security_signal(signal)
+
+    _increment_metric("security_signals_ingested", len(payloads))
+
+    return {
+        "ok": True,
+        "ingested": len(payloads),
+        "security_signal": _security_signal_summary(signal),
     }
 
 
 @app.get("/signals")
-def signals() -> dict[str, Any]:
+async def signals() -> dict[str, Any]:
     vision = _get_latest_vision_signal()
     security = _get_latest_security_signal()
+    vision_age = _signal_age_seconds(vision.captured_at) if vision else 0.0
+    security_age = _signal_age_seconds(security.captured_at) if security else 0.0
 
     return {
         "vision": (
@@ -831,8 +1582,8 @@ def signals() -> dict[str, Any]:
                 "inference_ms": vision.inference_ms,
                 "source": vision.source,
                 "image_path": vision.image_path,
-                "age_seconds": _signal_age_seconds(vision.captured_at),
-                "fresh": _signal_age_seconds(vision.captured_at) <= VISION_SIGNAL_STALE_SECONDS,
+                "age_seconds": vision_age,
+                "fresh": vision_age <= VISION_SIGNAL_STALE_SECONDS,
             }
             if vision
             else None
@@ -846,8 +1597,8 @@ def signals() -> dict[str, Any]:
                 "security_flag": security.security_flag,
                 "source": security.source,
                 "sample_window_seconds": security.sample_window_seconds,
-                "age_seconds": _signal_age_seconds(security.captured_at),
-                "fresh": _signal_age_seconds(security.captured_at) <= SECURITY_SIGNAL_STALE_SECONDS,
+                "age_seconds": security_age,
+                "fresh": security_age <= SECURITY_SIGNAL_STALE_SECONDS,
             }
             if security
             else None
@@ -855,146 +1606,197 @@ def signals() -> dict[str, Any]:
     }
 
 
-@app.post("/analyze")
-def analyze(payload: TelemetryPayload) -> dict[str, Any]:
-    result = analyze_payload(payload)
-    persist_analysis(payload, result)
+ModelT = TypeVar("ModelT", bound=BaseModel)
 
-    with METRICS_LOCK:
-        METRICS_COUNTERS["analyses_total"] += 1
-        if result.process_anomaly:
-            METRICS_COUNTERS["process_anomalies_total"] += 1
-        if result.network_alert:
-            METRICS_COUNTERS["network_alerts_total"] += 1
 
+def _json_body_openapi(model: type[BaseModel]) -> dict[str, Any]:
     return {
-        "process_anomaly": result.process_anomaly,
-        "network_alert": result.network_alert,
-        "process_score": round(result.process_score, 2),
-        "network_score": round(result.network_score, 2),
-        "model_confidence": round(result.model_confidence, 2),
-        "process_components": result.process_components,
-        "network_components": result.network_components,
-        "risk_level": result.risk_level,
-        "recommended_action": result.recommended_action,
-        "model_version": result.model_version,
-        "vision_anomaly_score": round(result.vision_anomaly_score, 2),
-        "vision_defect_flag": result.vision_defect_flag,
-        "vision_inference_ms": round(result.vision_inference_ms, 2),
-        "security_flag": result.security_flag,
-        "scan_time_ms": round(result.scan_time_ms, 2),
-        "process_source": result.process_source,
-        "network_source": result.network_source,
-        "reasons": result.reasons,
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
     }
 
 
+async def _validate_json_body(request: Request, model: type[ModelT]) -> ModelT:
+    """Validate the raw request body straight from bytes with pydantic-core."""
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as error:
+        raise RequestValidationError(
+            [{**item, "loc": ("body", *item["loc"])} for item in error.errors(include_url=False)]
+        ) from error
+
+
+def _analysis_response(result: AnalysisResult) -> AnalysisResult:
+    """Round the reported scores; orjson serializes the slotted dataclass as-is."""
+    return replace(
+        result,
+        process_score=round(result.process_score, 2),
+        network_score=round(result.network_score, 2),
+        model_confidence=round(result.model_confidence, 2),
+        vision_anomaly_score=round(result.vision_anomaly_score, 2),
+        vision_inference_ms=round(result.vision_inference_ms, 2),
+        scan_time_ms=round(result.scan_time_ms, 2),
+    )
+
+
+@app.post("/analyze", openapi_extra=_json_body_openapi(TelemetryPayload))
+async def analyze(request: Request) -> ORJSONResponse:
+    payload = await _validate_json_body(request, TelemetryPayload)
+    result = analyze_payload(payload)
+    await persist_analysis(payload, result)
+
+    _increment_metric("analyses_total")
+    if result.process_anomaly:
+        _increment_metric("process_anomalies_total")
+    if result.network_alert:
+        _increment_metric("network_alerts_total")
+
+    # Returning the response directly skips FastAPI's jsonable_encoder pass.
+    return ORJSONResponse(_analysis_response(result))
+
+
 @app.get("/events/stream")
 async def events_stream(
-    request: Request,
     since_id: int = 0,
     limit: int = 100,
     poll_interval_seconds: float = 1.0,
-) -> StreamingResponse:
+) -> EventSourceResponse:
     cursor_id = max(since_id, 0)
     safe_limit = max(1, min(limit, 200))
     poll_interval = max(0.2, min(poll_interval_seconds, 10.0))
 
     async def event_generator():
         nonlocal cursor_id
-        yield "retry: 1500\n\n"
+        yield ServerSentEvent(retry=1500)
 
-        while True:
-            if await request.is_disconnected():
-                break
+        notifier: AnalysisEventNotifier | None = getattr(app.state, "event_notifier", None)
+        announced_id = cursor_id
+        fetch_now = True
 
+        # EventSourceResponse sends keepalive pings and stops this generator on disconnect.
+        while True:
+            if not fetch_now:
+                if notifier is not None and notifier.listening:
+                    # Idle clients cost no queries until the insert trigger announces a newer id.
+                    if not await notifier.wait(max(cursor_id, announced_id), poll_interval):
+                        continue
+                else:
+                    await asyncio.sleep(poll_interval)
+            fetch_now = False
+
+            if notifier is not None:
+                announced_id = notifier.latest_id
             try:
-                events_payload = _fetch_events(
+                events_payload = await _fetch_event_json(
                     safe_limit,
                     ascending=True,
                     after_id=cursor_id,
                 )
             except Exception as error:
-                error_payload = json.dumps({"error": str(error)})
-                yield f"event: error\\ndata: {error_payload}\\n\\n"
+                yield ServerSentEvent(data=_json_text({"error": str(error)}), event="error")
                 await asyncio.sleep(poll_interval)
                 continue
 
-            if events_payload:
-                for event in events_payload:
-                    event_id = int(event.get("id", cursor_id))
-                    cursor_id = max(cursor_id, event_id)
-                    yield f"data: {json.dumps(event)}\\n\\n"
-            else:
-                yield ": keepalive\\n\\n"
-
-            await asyncio.sleep(poll_interval)
-
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+            for event_id, event_json in events_payload:
+                cursor_id = max(cursor_id, event_id)
+                yield ServerSentEvent(data=event_json, id=event_id)
+            # A full page may have more rows queued behind it.
+            fetch_now = len(events_payload) == safe_limit
 
+    return EventSourceResponse(event_generator(), ping=SSE_PING_SECONDS)
 
-@app.get("/events")
-def events(limit: int = 20) -> dict[str, Any]:
-    parsed_rows = _fetch_events(limit, ascending=False)
 
-    return {"count": len(parsed_rows), "events": parsed_rows}
+@app.get("/events", response_model=EventsResponse)
+async def events(limit: int = 20, before_id: int | None = None) -> Response:
+    """Latest events, newest first; pass the last id seen as ``before_id`` for the next page."""
+    return Response(await _fetch_events_document(limit, before_id=before_id), media_type="application/json")
 
 
-@app.get("/metrics")
-def metrics() -> str:
+@app.get("/events/ndjson")
+async def events_ndjson(limit: int = 20, before_id: int | None = None) -> StreamingResponse:
+    """Stream the latest events as newline-delimited JSON while rows are read."""
+
+    async def ndjson_lines():
+        async for event in _iter_events(limit, ascending=False, before_id=before_id):
+            # Serialize straight to bytes instead of building a str and encoding it.
+            yield EventRow.__pydantic_serializer__.to_json(event) + b"\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+def _metric_prefix(name: str, metric_type: str, help_text: str) -> bytes:
+    return f"# HELP {name} {help_text}\n# TYPE {name} {metric_type}\n{name} ".encode()
+
+
+# HELP/TYPE header plus sample name for each exported metric, encoded once at import.
+METRIC_PREFIXES: dict[str, bytes] = {
+    name: _metric_prefix(name, metric_type, help_text)
+    for name, metric_type, help_text in (
+        ("analyzer_analyses_total", "counter", "Total analysis requests processed."),
+        ("analyzer_process_anomalies_total", "counter", "Total process anomaly detections."),
+        ("analyzer_network_alerts_total", "counter", "Total network alert detections."),
+        ("analyzer_vision_signals_ingested", "counter", "Total vision signals received."),
+        ("analyzer_security_signals_ingested", "counter", "Total security signals received."),
+        ("analyzer_vision_signal_fresh", "gauge", "Whether a fresh vision signal is available."),
+        ("analyzer_security_signal_fresh", "gauge", "Whether a fresh security signal is available."),
+        ("analyzer_persist_queue_depth", "gauge", "Analysis events waiting for the next COPY batch."),
+        ("analyzer_persist_retry_rows", "gauge", "Analysis events held back after a failed flush."),
+        ("analyzer_vision_anomaly_score", "gauge", "Latest vision anomaly score."),
+        ("analyzer_security_packet_rate", "gauge", "Latest security packet rate."),
+    )
+}
+
+
+def _render_metrics() -> bytes:
     vision = _get_latest_vision_signal()
     security = _get_latest_security_signal()
 
-    with METRICS_LOCK:
-        counters = dict(METRICS_COUNTERS)
-
-    lines = [
-        "# HELP analyzer_analyses_total Total analysis requests processed.",
-        "# TYPE analyzer_analyses_total counter",
-        f'analyzer_analyses_total {counters["analyses_total"]}',
-        "# HELP analyzer_process_anomalies_total Total process anomaly detections.",
-        "# TYPE analyzer_process_anomalies_total counter",
-        f'analyzer_process_anomalies_total {counters["process_anomalies_total"]}',
-        "# HELP analyzer_network_alerts_total Total network alert detections.",
-        "# TYPE analyzer_network_alerts_total counter",
-        f'analyzer_network_alerts_total {counters["network_alerts_total"]}',
-        "# HELP analyzer_vision_signals_ingested Total vision signals received.",
-        "# TYPE analyzer_vision_signals_ingested counter",
-        f'analyzer_vision_signals_ingested {counters["vision_signals_ingested"]}',
-        "# HELP analyzer_security_signals_ingested Total security signals received.",
-        "# TYPE analyzer_security_signals_ingested counter",
-        f'analyzer_security_signals_ingested {counters["security_signals_ingested"]}',
-        "# HELP analyzer_vision_signal_fresh Whether a fresh vision signal is available.",
-        "# TYPE analyzer_vision_signal_fresh gauge",
-        f"analyzer_vision_signal_fresh {1 if vision and _signal_age_seconds(vision.captured_at) <= VISION_SIGNAL_STALE_SECONDS else 0}",
-        "# HELP analyzer_security_signal_fresh Whether a fresh security signal is available.",
-        "# TYPE analyzer_security_signal_fresh gauge",
-        f"analyzer_security_signal_fresh {1 if security and _signal_age_seconds(security.captured_at) <= SECURITY_SIGNAL_STALE_SECONDS else 0}",
+    counters = _snapshot_metrics()
+    vision_fresh = bool(vision and _signal_age_seconds(vision.captured_at) <= VISION_SIGNAL_STALE_SECONDS)
+    security_fresh = bool(
+        security and _signal_age_seconds(security.captured_at) <= SECURITY_SIGNAL_STALE_SECONDS
+    )
+
+    samples: list[tuple[str, bytes]] = [
+        ("analyzer_analyses_total", b"%d" % counters["analyses_total"]),
+        ("analyzer_process_anomalies_total", b"%d" % counters["process_anomalies_total"]),
+        ("analyzer_network_alerts_total", b"%d" % counters["network_alerts_total"]),
+        ("analyzer_vision_signals_ingested", b"%d" % counters["vision_signals_ingested"]),
+        ("analyzer_security_signals_ingested", b"%d" % counters["security_signals_ingested"]),
+        ("analyzer_vision_signal_fresh", b"%d" % vision_fresh),
+        ("analyzer_security_signal_fresh", b"%d" % security_fresh),
     ]
 
+    event_writer: AnalysisEventWriter | None = getattr(app.state, "event_writer", None)
+    if event_writer:
+        samples.append(("analyzer_persist_queue_depth", b"%d" % event_writer.queue.qsize()))
+        samples.append(("analyzer_persist_retry_rows", b"%d" % len(event_writer.retry_buffer)))
+
     if vision:
-        lines.extend([
-            "# HELP analyzer_vision_anomaly_score Latest vision anomaly score.",
-            "# TYPE analyzer_vision_anomaly_score gauge",
-            f"analyzer_vision_anomaly_score {vision.anomaly_score:.2f}",
-        ])
+        samples.append(("analyzer_vision_anomaly_score", b"%.2f" % vision.anomaly_score))
 
     if security:
-        lines.extend([
-            "# HELP analyzer_security_packet_rate Latest security packet rate.",
-            "# TYPE analyzer_security_packet_rate gauge",
-            f"analyzer_security_packet_rate {security.packet_rate:.2f}",
-        ])
+        samples.append(("analyzer_security_packet_rate", b"%.2f" % security.packet_rate))
+
+    return b"".join(METRIC_PREFIXES[name] + value + b"\n" for name, value in samples)
+
 
-    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8")
+async def _refresh_metrics_body() -> None:
+    """Re-render the /metrics body every ``METRICS_CACHE_SECONDS`` so scrapes only read it."""
+    while True:
+        _METRICS_BODY_SLOT[0] = _render_metrics()
+        await asyncio.sleep(METRICS_CACHE_SECONDS)
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    body = _METRICS_BODY_SLOT[0] if METRICS_CACHE_SECONDS > 0 else None
+    if body is None:
+        body = _render_metrics()
+
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 # ── Anomaly Detection Endpoints ───────────────────────────────────────
@@ -1030,10 +1832,13 @@ def anomaly_ingest(payload: AnomalyTelemetryPayload) -> dict[str, Any]:
 
 @app.post("/anomaly/score")
 def anomaly_score(payload: AnomalyTelemetryPayload) -> dict[str, Any]:
-    """Ingest a sample AND return the current anomaly score."""
+    """Ingest a sample AND return the current anomaly score.
+
+    With ``LSTM_MICRO_BATCH`` above 1 the model runs every N samples and the
+    score in between is the latest batch result.
+    """
     ANOMALY_DETECTOR.ingest(payload.model_dump())
-    result = ANOMALY_DETECTOR.score()
-    return result
+    return ANOMALY_DETECTOR.score_batch()
 
 
 @app.get("/anomaly/status")
@@ -1064,17 +1869,12 @@ def anomaly_history() -> dict[str, Any]:
 
 
 def reset_runtime_state_for_tests() -> None:
-    global LATEST_VISION_SIGNAL
-    global LATEST_SECURITY_SIGNAL
-
-    with SIGNAL_LOCK:
-        LATEST_VISION_SIGNAL = None
-        LATEST_SECURITY_SIGNAL = None
+    _set_vision_signal(None)
+    _set_security_signal(None)
+    _LAST_ANALYSIS_SLOT[0] = None
+    _METRICS_BODY_SLOT[0] = None
 
-    with METRICS_LOCK:
-        for key in METRICS_COUNTERS:
-            METRICS_COUNTERS[key] = 0
+    METRICS_COUNTERS.reset()
 
-    FALLBACK_MODEL.production_rate_history.clear()
-    FALLBACK_MODEL.reject_rate_history.clear()
-    FALLBACK_MODEL.inflight_history.clear()
+    FALLBACK_MODEL.reset()
+    ANOMALY_DETECTOR.reset()
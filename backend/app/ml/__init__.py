@@ -1,4 +1,5 @@
 from .model import (
+    cached_image_features,
     extract_image_features,
     load_artifact,
     load_artifact_metadata,
@@ -12,11 +13,13 @@ from .torch_autoencoder import (
     load_torch_artifact_metadata,
     save_torch_artifact,
     score_torch_image,
+    score_torch_images,
     train_torch_autoencoder,
 )
 from .lstm_autoencoder import (
     AnomalyDetector,
     LSTMAutoencoder,
+    export_lstm_onnx,
     generate_attack_data,
     generate_normal_data,
     load_lstm_artifact,
@@ -28,6 +31,7 @@ from .lstm_autoencoder import (
 )
 
 __all__ = [
+    "cached_image_features",
     "extract_image_features",
     "load_artifact",
     "load_artifact_metadata",
@@ -38,10 +42,12 @@ __all__ = [
     "load_torch_artifact_metadata",
     "save_torch_artifact",
     "score_torch_image",
+    "score_torch_images",
     "train_torch_autoencoder",
     "train_mvtec_feature_model",
     "AnomalyDetector",
     "LSTMAutoencoder",
+    "export_lstm_onnx",
     "generate_attack_data",
     "generate_normal_data",
     "load_lstm_artifact",
@@ -28,6 +28,8 @@ Feature vector (14 dimensions per timestep):
 
 from __future__ import annotations
 
+import copy
+import threading
 import time
 from collections import deque
 from dataclasses import dataclass, field
@@ -36,6 +38,7 @@ from typing import Any
 
 import numpy as np
 import torch
+from numpy.lib.stride_tricks import sliding_window_view
 from torch import nn
 
 
@@ -61,24 +64,91 @@ FEATURE_NAMES: list[str] = [
 N_FEATURES = len(FEATURE_NAMES)
 
 
-def telemetry_to_vector(payload: dict[str, Any]) -> list[float]:
-    """Convert a raw telemetry dict into a fixed-size numeric vector."""
-    return [
-        float(payload.get("conveyor_running", False)),
-        float(payload.get("production_rate", 0)),
-        float(payload.get("reject_rate", 0)),
-        float(payload.get("in_flight_bottles", 0)),
-        float(payload.get("bottle_at_filler", False)),
-        float(payload.get("bottle_at_capper", False)),
-        float(payload.get("bottle_at_quality", False)),
-        float(payload.get("output_alarm_horn", False)),
-        float(payload.get("output_reject_gate", False)),
-        float(payload.get("network_packet_rate", 0)),
-        float(payload.get("network_burst_ratio", 0)),
-        float(payload.get("scan_time_ms", 0)),
-        float(payload.get("io_input_sum", 0)),
-        float(payload.get("io_output_sum", 0)),
-    ]
+# Reconstruction-error feature groups behind the attack-type heuristic.
+ATTACK_FEATURE_GROUPS: dict[str, tuple[str, ...]] = {
+    "network": ("network_packet_rate", "network_burst_ratio"),
+    "scan": ("scan_time_ms",),
+    "production": ("production_rate",),
+    "reject": ("reject_rate",),
+    "sensors": ("bottle_at_filler", "bottle_at_capper", "bottle_at_quality"),
+    "outputs": ("io_output_sum", "output_alarm_horn"),
+    "inputs": ("io_input_sum",),
+}
+
+# How much each group's error points at an attack type, columns in
+# ``ATTACK_FEATURE_GROUPS`` order.
+ATTACK_GROUP_COEFFICIENTS: dict[str, tuple[float, ...]] = {
+    #                      net  scan prod rej  sens out  in
+    "dos_flood":            (2.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    "mitm":                 (0.3, 0.0, 0.0, 1.0, 0.5, 0.0, 0.0),
+    "false_data_injection": (0.0, 0.0, 1.0, 0.0, 1.0, 0.0, 1.0),
+    "modbus_injection":     (0.5, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0),
+    "stuxnet_like":         (0.0, 1.0, 0.5, 0.0, 0.0, 0.5, 0.0),
+    "sensor_jamming":       (0.0, 0.0, 0.0, 0.5, 2.0, 0.0, 0.0),
+}
+
+ATTACK_TYPES = tuple(ATTACK_GROUP_COEFFICIENTS)
+
+_GROUP_MEMBERSHIP = np.array(
+    [[name in members for name in FEATURE_NAMES] for members in ATTACK_FEATURE_GROUPS.values()],
+    dtype=np.float64,
+)
+# (attack types x features) weights, and the per-feature weights of the normalising total.
+ATTACK_WEIGHTS = np.array(list(ATTACK_GROUP_COEFFICIENTS.values())) @ _GROUP_MEMBERSHIP
+ATTACK_TOTAL_WEIGHTS = _GROUP_MEMBERSHIP.sum(axis=0)
+
+
+def telemetry_to_vector(payload: dict[str, Any]) -> np.ndarray:
+    """Convert a raw telemetry dict into a fixed-size float32 feature vector.
+
+    Missing fields default to 0 (``False`` for flags), in ``FEATURE_NAMES`` order.
+    """
+    return np.fromiter(
+        (float(payload.get(name, 0)) for name in FEATURE_NAMES),
+        dtype=np.float32,
+        count=N_FEATURES,
+    )
+
+
+class TelemetryRing:
+    """Fixed-capacity ring buffer of float32 feature vectors."""
+
+    def __init__(self, capacity: int, width: int = N_FEATURES) -> None:
+        self._data = np.zeros((capacity, width), dtype=np.float32)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[0]
+
+    def append(self, vector: np.ndarray) -> None:
+        self._data[self._head] = vector
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def latest(self, n: int) -> np.ndarray:
+        """The ``n`` most recent rows, oldest first.
+
+        Returns a read-only view when the rows are contiguous, a copy otherwise.
+        The view aliases the ring, so it is only valid until the next ``append``;
+        ``AnomalyDetector`` reads it under the same lock that guards ingest.
+        """
+        n = min(n, self._count)
+        if self._head >= n:
+            window = self._data[self._head - n : self._head]
+            window = window.view()
+            window.flags.writeable = False
+            return window
+        indices = (self._head - n + np.arange(n)) % self.capacity
+        return np.take(self._data, indices, axis=0)
+
+    def clear(self) -> None:
+        self._head = 0
+        self._count = 0
 
 
 # ── Synthetic data generation ─────────────────────────────────────────
@@ -88,28 +158,27 @@ def generate_normal_data(n_samples: int = 5000, seed: int = 42) -> np.ndarray:
 
     Returns array of shape (n_samples, N_FEATURES).
     """
-    rng = np.random.RandomState(seed)
-    data = np.zeros((n_samples, N_FEATURES), dtype=np.float32)
-
-    for i in range(n_samples):
-        t = i / n_samples
-        # Simulate shift patterns (day/night cycle)
-        shift_factor = 0.8 + 0.2 * np.sin(2 * np.pi * t * 3)
-
-        data[i, 0] = 1.0  # conveyor_running
-        data[i, 1] = np.clip(8.0 * shift_factor + rng.normal(0, 0.5), 2, 15)  # production_rate
-        data[i, 2] = np.clip(rng.exponential(1.5), 0, 10)  # reject_rate
-        data[i, 3] = np.clip(rng.poisson(2), 0, 6)  # in_flight_bottles
-        data[i, 4] = float(rng.random() < 0.3)  # bottle_at_filler
-        data[i, 5] = float(rng.random() < 0.25)  # bottle_at_capper
-        data[i, 6] = float(rng.random() < 0.2)  # bottle_at_quality
-        data[i, 7] = 0.0  # alarm_horn (off in normal)
-        data[i, 8] = float(rng.random() < 0.05)  # reject_gate (rare)
-        data[i, 9] = np.clip(130 + rng.normal(0, 8), 90, 170)  # packet_rate
-        data[i, 10] = np.clip(rng.beta(2, 8), 0, 0.6)  # burst_ratio
-        data[i, 11] = np.clip(100 + rng.normal(0, 10), 60, 160)  # scan_time_ms
-        data[i, 12] = np.clip(rng.poisson(3), 0, 8)  # io_input_sum
-        data[i, 13] = np.clip(rng.poisson(4), 0, 10)  # io_output_sum
+    rng = np.random.default_rng(seed)
+    data = np.empty((n_samples, N_FEATURES), dtype=np.float32)
+
+    t = np.arange(n_samples) / n_samples
+    # Simulate shift patterns (day/night cycle)
+    shift_factor = 0.8 + 0.2 * np.sin(2 * np.pi * t * 3)
+
+    data[:, 0] = 1.0  # conveyor_running
+    data[:, 1] = np.clip(8.0 * shift_factor + rng.normal(0, 0.5, n_samples), 2, 15)  # production_rate
+    data[:, 2] = np.clip(rng.exponential(1.5, n_samples), 0, 10)  # reject_rate
+    data[:, 3] = np.clip(rng.poisson(2, n_samples), 0, 6)  # in_flight_bottles
+    data[:, 4] = rng.random(n_samples) < 0.3  # bottle_at_filler
+    data[:, 5] = rng.random(n_samples) < 0.25  # bottle_at_capper
+    data[:, 6] = rng.random(n_samples) < 0.2  # bottle_at_quality
+    data[:, 7] = 0.0  # alarm_horn (off in normal)
+    data[:, 8] = rng.random(n_samples) < 0.05  # reject_gate (rare)
+    data[:, 9] = np.clip(130 + rng.normal(0, 8, n_samples), 90, 170)  # packet_rate
+    data[:, 10] = np.clip(rng.beta(2, 8, n_samples), 0, 0.6)  # burst_ratio
+    data[:, 11] = np.clip(100 + rng.normal(0, 10, n_samples), 60, 160)  # scan_time_ms
+    data[:, 12] = np.clip(rng.poisson(3, n_samples), 0, 8)  # io_input_sum
+    data[:, 13] = np.clip(rng.poisson(4, n_samples), 0, 10)  # io_output_sum
 
     return data
 
@@ -124,7 +193,7 @@ def generate_attack_data(
     Supported types: dos_flood, mitm, false_data_injection, modbus_injection,
                      stuxnet_like, sensor_jamming, replay, combined
     """
-    rng = np.random.RandomState(seed)
+    rng = np.random.default_rng(seed)
     # Start from normal baseline
     base = generate_normal_data(n_samples, seed=seed + 1)
 
@@ -169,9 +238,7 @@ def generate_attack_data(
     elif attack_type == "replay":
         # Repeated patterns (low entropy)
         pattern = base[:10].copy()
-        for j in range(0, n_samples, 10):
-            end = min(j + 10, n_samples)
-            base[j:end] = pattern[: end - j]
+        base[:] = pattern[np.arange(n_samples) % len(pattern)]
         base[:, 9] *= 1.5
 
     elif attack_type == "combined":
@@ -188,9 +255,9 @@ def generate_attack_data(
 # ── LSTM Autoencoder Model ────────────────────────────────────────────
 
 class LSTMEncoder(nn.Module):
-    def __init__(self, input_dim: int, hidden_dim: int, latent_dim: int, n_layers: int = 2):
+    def __init__(self, input_dim: int, hidden_dim: int, latent_dim: int, n_layers: int = 2, dropout: float = 0.1):
         super().__init__()
-        self.lstm = nn.LSTM(input_dim, hidden_dim, n_layers, batch_first=True, dropout=0.1)
+        self.lstm = nn.LSTM(input_dim, hidden_dim, n_layers, batch_first=True, dropout=dropout)
         self.fc = nn.Linear(hidden_dim, latent_dim)
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
@@ -201,17 +268,26 @@ class LSTMEncoder(nn.Module):
 
 
 class LSTMDecoder(nn.Module):
-    def __init__(self, latent_dim: int, hidden_dim: int, output_dim: int, seq_len: int, n_layers: int = 2):
+    def __init__(
+        self,
+        latent_dim: int,
+        hidden_dim: int,
+        output_dim: int,
+        seq_len: int,
+        n_layers: int = 2,
+        dropout: float = 0.1,
+    ):
         super().__init__()
         self.seq_len = seq_len
         self.fc = nn.Linear(latent_dim, hidden_dim)
-        self.lstm = nn.LSTM(hidden_dim, hidden_dim, n_layers, batch_first=True, dropout=0.1)
+        self.lstm = nn.LSTM(hidden_dim, hidden_dim, n_layers, batch_first=True, dropout=dropout)
         self.output_fc = nn.Linear(hidden_dim, output_dim)
 
     def forward(self, z: torch.Tensor) -> torch.Tensor:
         h = self.fc(z)
-        # Repeat latent vector for each timestep
-        h = h.unsqueeze(1).repeat(1, self.seq_len, 1)
+        # Broadcast the latent vector over every timestep as a stride-0 view;
+        # the LSTM packs its input itself, so no explicit copy is needed.
+        h = h.unsqueeze(1).expand(-1, self.seq_len, -1)
         out, _ = self.lstm(h)
         return self.output_fc(out)
 
@@ -226,10 +302,11 @@ class LSTMAutoencoder(nn.Module):
         latent_dim: int = 16,
         seq_len: int = 30,
         n_layers: int = 2,
+        dropout: float = 0.1,
     ):
         super().__init__()
-        self.encoder = LSTMEncoder(input_dim, hidden_dim, latent_dim, n_layers)
-        self.decoder = LSTMDecoder(latent_dim, hidden_dim, input_dim, seq_len, n_layers)
+        self.encoder = LSTMEncoder(input_dim, hidden_dim, latent_dim, n_layers, dropout)
+        self.decoder = LSTMDecoder(latent_dim, hidden_dim, input_dim, seq_len, n_layers, dropout)
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         z = self.encoder(x)
@@ -243,6 +320,16 @@ class FeatureScaler:
     """Min-max scaler learned from training data."""
     min_vals: np.ndarray = field(default_factory=lambda: np.zeros(N_FEATURES))
     max_vals: np.ndarray = field(default_factory=lambda: np.ones(N_FEATURES))
+    # float32 offset and reciprocal range, so transform is one subtract and one multiply.
+    _min32: np.ndarray = field(init=False, repr=False)
+    _inv_range32: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._prepare()
+
+    def _prepare(self) -> None:
+        self._min32 = np.asarray(self.min_vals, dtype=np.float32)
+        self._inv_range32 = (1.0 / (np.asarray(self.max_vals) - np.asarray(self.min_vals))).astype(np.float32)
 
     def fit(self, data: np.ndarray) -> "FeatureScaler":
         self.min_vals = data.min(axis=0)
@@ -251,34 +338,72 @@ class FeatureScaler:
         diff = self.max_vals - self.min_vals
         diff[diff < 1e-8] = 1.0
         self.max_vals = self.min_vals + diff
+        self._prepare()
         return self
 
-    def transform(self, data: np.ndarray) -> np.ndarray:
-        return (data - self.min_vals) / (self.max_vals - self.min_vals)
+    def transform(self, data: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Scale ``data`` to float32, writing into ``out`` when a buffer is supplied."""
+        scaled = np.subtract(data, self._min32, out=out, dtype=np.float32)
+        np.multiply(scaled, self._inv_range32, out=scaled)
+        return scaled
 
     def to_dict(self) -> dict:
         return {"min_vals": self.min_vals.tolist(), "max_vals": self.max_vals.tolist()}
 
     @classmethod
     def from_dict(cls, d: dict) -> "FeatureScaler":
-        scaler = cls()
-        scaler.min_vals = np.array(d["min_vals"], dtype=np.float32)
-        scaler.max_vals = np.array(d["max_vals"], dtype=np.float32)
-        return scaler
+        return cls(
+            min_vals=np.array(d["min_vals"], dtype=np.float32),
+            max_vals=np.array(d["max_vals"], dtype=np.float32),
+        )
 
 
 # ── Windowing ─────────────────────────────────────────────────────────
 
 def create_sequences(data: np.ndarray, seq_len: int = 30) -> np.ndarray:
-    """Slide a window of seq_len over the data to create overlapping sequences."""
-    sequences = []
-    for i in range(len(data) - seq_len + 1):
-        sequences.append(data[i : i + seq_len])
-    return np.array(sequences, dtype=np.float32)
+    """Slide a window of seq_len over the data to create overlapping sequences.
+
+    Windows are taken as a strided view and copied once into a contiguous
+    float32 array of shape ``(len(data) - seq_len + 1, seq_len, n_features)``.
+    """
+    if len(data) < seq_len:
+        return np.empty((0, seq_len, data.shape[1]), dtype=np.float32)
+
+    windows = sliding_window_view(data, seq_len, axis=0).transpose(0, 2, 1)
+    return np.ascontiguousarray(windows, dtype=np.float32)
 
 
 # ── Training ──────────────────────────────────────────────────────────
 
+def _configure_cuda_backends(dev: torch.device) -> None:
+    """Let cuDNN autotune the fixed LSTM shapes and use TF32 tensor cores on CUDA."""
+    if dev.type != "cuda":
+        return
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+
+
+def quantize_for_cpu(model: nn.Module) -> nn.Module:
+    """Dynamic int8 copy of ``model`` (LSTM and Linear weights) for CPU inference."""
+    cpu_model = copy.deepcopy(model).cpu().eval()
+    return torch.ao.quantization.quantize_dynamic(cpu_model, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+
+
+def _reconstruction_errors(model: nn.Module, loader: torch.utils.data.DataLoader, dev: torch.device) -> np.ndarray:
+    """Mean squared reconstruction error of every window in ``loader``."""
+    all_errors = np.empty(len(loader.dataset), dtype=np.float32)
+    offset = 0
+    with torch.inference_mode():
+        for (batch,) in loader:
+            batch = batch.to(dev, non_blocking=True)
+            recon = model(batch)
+            errors = torch.mean((recon - batch) ** 2, dim=(1, 2))
+            all_errors[offset : offset + len(errors)] = errors.cpu().numpy()
+            offset += len(errors)
+    return all_errors[:offset]
+
+
 def train_lstm_autoencoder(
     normal_data: np.ndarray,
     *,
@@ -292,13 +417,16 @@ def train_lstm_autoencoder(
     threshold_quantile: float = 0.98,
     device: str = "auto",
     verbose: bool = True,
+    calibrate_int8: bool = False,
 ) -> dict[str, Any]:
     """Train an LSTM autoencoder on normal-operation telemetry.
 
     Returns a serializable artifact dict containing model weights, scaler,
-    metadata, and the anomaly threshold.
+    metadata, and the anomaly threshold. ``calibrate_int8`` also records a
+    ``threshold_int8`` for int8-quantized CPU serving (an extra CPU pass).
     """
     dev = torch.device("cuda" if device == "auto" and torch.cuda.is_available() else "cpu")
+    _configure_cuda_backends(dev)
 
     # Fit scaler
     scaler = FeatureScaler().fit(normal_data)
@@ -310,7 +438,15 @@ def train_lstm_autoencoder(
         print(f"Training data: {normal_data.shape[0]} samples → {sequences.shape[0]} windows of {seq_len}")
 
     dataset = torch.utils.data.TensorDataset(torch.from_numpy(sequences))
-    loader = torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=True, drop_last=False)
+    # The windows already live in RAM, so worker processes would only add IPC;
+    # pinning lets the CUDA copy of each batch overlap the previous step.
+    loader = torch.utils.data.DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=True,
+        drop_last=False,
+        pin_memory=dev.type == "cuda",
+    )
 
     # Model
     model = LSTMAutoencoder(
@@ -325,6 +461,10 @@ def train_lstm_autoencoder(
     scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(optimizer, patience=5, factor=0.5)
     criterion = nn.MSELoss()
 
+    # bf16 autocast on GPUs that support it; bf16 keeps fp32's exponent range,
+    # so no GradScaler is needed and the master weights stay fp32.
+    use_bf16 = dev.type == "cuda" and torch.cuda.is_bf16_supported()
+
     epoch_losses = []
     t0 = time.time()
 
@@ -333,10 +473,11 @@ def train_lstm_autoencoder(
         total_loss = 0.0
         n_batches = 0
         for (batch,) in loader:
-            batch = batch.to(dev)
+            batch = batch.to(dev, non_blocking=True)
             optimizer.zero_grad(set_to_none=True)
-            recon = model(batch)
-            loss = criterion(recon, batch)
+            with torch.autocast(device_type=dev.type, dtype=torch.bfloat16, enabled=use_bf16):
+                recon = model(batch)
+            loss = criterion(recon.float(), batch)
             loss.backward()
             torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
             optimizer.step()
@@ -356,19 +497,20 @@ def train_lstm_autoencoder(
 
     # Compute threshold from training reconstruction errors
     model.eval()
-    all_errors = []
-    with torch.no_grad():
-        for (batch,) in loader:
-            batch = batch.to(dev)
-            recon = model(batch)
-            errors = torch.mean((recon - batch) ** 2, dim=(1, 2))
-            all_errors.extend(errors.cpu().numpy().tolist())
+    all_errors = _reconstruction_errors(model, loader, dev)
 
     threshold = float(np.quantile(all_errors, threshold_quantile))
     score_scale = max(threshold * 2.5, 1e-8)
+    # int8 weights shift reconstruction errors slightly; calibrate separately.
+    threshold_int8 = None
+    if calibrate_int8:
+        threshold_int8 = float(
+            np.quantile(_reconstruction_errors(quantize_for_cpu(model), loader, torch.device("cpu")), threshold_quantile)
+        )
 
     if verbose:
-        print(f"Threshold (p{threshold_quantile*100:.0f}): {threshold:.6f}  scale: {score_scale:.6f}")
+        int8_note = f"  int8: {threshold_int8:.6f}" if threshold_int8 is not None else ""
+        print(f"Threshold (p{threshold_quantile*100:.0f}): {threshold:.6f}  scale: {score_scale:.6f}{int8_note}")
         print(f"Training error stats — mean: {np.mean(all_errors):.6f}  std: {np.std(all_errors):.6f}  max: {np.max(all_errors):.6f}")
 
     metadata = {
@@ -390,9 +532,12 @@ def train_lstm_autoencoder(
         "final_train_loss": float(epoch_losses[-1]),
         "train_time_seconds": round(train_time, 2),
         "device": str(dev),
+        "mixed_precision": "bf16" if use_bf16 else None,
         "train_error_mean": float(np.mean(all_errors)),
         "train_error_std": float(np.std(all_errors)),
     }
+    if threshold_int8 is not None:
+        metadata["threshold_int8"] = threshold_int8
 
     return {
         "type": "lstm_autoencoder",
@@ -411,27 +556,121 @@ def save_lstm_artifact(artifact: dict[str, Any], path: str) -> None:
     torch.save(artifact, p)
 
 
-def load_lstm_artifact(path: str, *, device: str = "auto") -> dict[str, Any]:
-    p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"LSTM artifact not found: {path}")
+def _script_for_inference(model: nn.Module) -> nn.Module:
+    """TorchScript and freeze an eval-mode model; fall back to eager if scripting fails."""
+    try:
+        return torch.jit.optimize_for_inference(torch.jit.script(model))
+    except Exception as error:  # pragma: no cover - depends on the torch build
+        print(f"[LSTM] TorchScript unavailable, using eager model: {error}")
+        return model
 
-    artifact = torch.load(p, map_location="cpu", weights_only=False)
-    if not isinstance(artifact, dict) or artifact.get("type") != "lstm_autoencoder":
-        raise ValueError("Invalid LSTM autoencoder artifact")
 
-    metadata = artifact["metadata"]
-    dev = torch.device("cuda" if device == "auto" and torch.cuda.is_available() else "cpu")
+def _model_from_artifact(artifact: dict[str, Any], dev: torch.device) -> LSTMAutoencoder:
+    """Rebuild the trained model for inference.
 
+    Dropout has no weights, so it is built at 0 here: the LSTM then takes the
+    plain kernel path and the scripted/exported graph carries no dropout op.
+    """
+    metadata = artifact["metadata"]
     model = LSTMAutoencoder(
         input_dim=metadata["n_features"],
         hidden_dim=metadata["hidden_dim"],
         latent_dim=metadata["latent_dim"],
         seq_len=metadata["seq_len"],
         n_layers=metadata["n_layers"],
+        dropout=0.0,
     ).to(dev)
     model.load_state_dict(artifact["state_dict"])
     model.eval()
+    return model
+
+
+def export_lstm_onnx(artifact: dict[str, Any], path: str) -> None:
+    """Export the artifact's model to ONNX with a dynamic batch axis.
+
+    ``load_lstm_artifact`` picks the file up when it sits next to the ``.pt``
+    artifact with the same stem and ``onnxruntime`` is installed.
+    """
+    metadata = artifact["metadata"]
+    model = _model_from_artifact(artifact, torch.device("cpu"))
+    dummy = torch.zeros(1, metadata["seq_len"], metadata["n_features"])
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    torch.onnx.export(
+        model,
+        dummy,
+        str(p),
+        opset_version=17,
+        input_names=["x"],
+        output_names=["recon"],
+        dynamic_axes={"x": {0: "batch"}, "recon": {0: "batch"}},
+        dynamo=False,
+    )
+
+
+class OnnxLSTMRunner:
+    """Callable stand-in for the torch model backed by an ONNX Runtime session."""
+
+    def __init__(self, session: Any) -> None:
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+
+    def __call__(self, tensor: torch.Tensor) -> torch.Tensor:
+        (recon,) = self.session.run(None, {self.input_name: tensor.detach().cpu().numpy()})
+        return torch.from_numpy(recon).to(tensor.device)
+
+
+def _load_onnx_runner(path: Path) -> OnnxLSTMRunner | None:
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        return None
+
+    try:
+        session = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+    except Exception as error:
+        print(f"[LSTM] Failed to load ONNX model {path}: {error}")
+        return None
+    return OnnxLSTMRunner(session)
+
+
+def load_lstm_artifact(
+    path: str,
+    *,
+    device: str = "auto",
+    optimize: bool = True,
+    quantize: bool = False,
+) -> dict[str, Any]:
+    """Load an LSTM artifact for inference.
+
+    With ``optimize`` the model runs through ONNX Runtime on CPU when a
+    matching ``.onnx`` export exists, otherwise as frozen TorchScript.
+    ``quantize`` swaps in dynamic int8 weights on CPU (TorchScript path only)
+    and the matching ``threshold_int8`` when the artifact recorded one.
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"LSTM artifact not found: {path}")
+
+    artifact = torch.load(p, map_location="cpu", weights_only=False)
+    if not isinstance(artifact, dict) or artifact.get("type") != "lstm_autoencoder":
+        raise ValueError("Invalid LSTM autoencoder artifact")
+
+    metadata = artifact["metadata"]
+    dev = torch.device("cuda" if device == "auto" and torch.cuda.is_available() else "cpu")
+    _configure_cuda_backends(dev)
+
+    model = None
+    onnx_path = p.with_suffix(".onnx")
+    if optimize and dev.type == "cpu" and onnx_path.exists():
+        model = _load_onnx_runner(onnx_path)
+    if model is None:
+        model = _model_from_artifact(artifact, dev)
+        if quantize and dev.type == "cpu":
+            model = quantize_for_cpu(model)
+            metadata = {**metadata, "threshold": metadata.get("threshold_int8", metadata["threshold"])}
+        if optimize:
+            model = _script_for_inference(model)
 
     scaler = FeatureScaler.from_dict(artifact["scaler"])
 
@@ -447,85 +686,172 @@ def load_lstm_artifact(path: str, *, device: str = "auto") -> dict[str, Any]:
 
 @dataclass
 class AnomalyDetector:
-    """Stateful real-time anomaly detector that buffers telemetry and scores windows."""
+    """Stateful real-time anomaly detector that buffers telemetry and scores windows.
+
+    FastAPI runs the sync ``/anomaly/*`` handlers on a threadpool, so ingest
+    and scoring serialize on ``_lock``.
+    """
 
     loaded: dict[str, Any] | None = None
-    buffer: deque = field(default_factory=lambda: deque(maxlen=60))
+    buffer: TelemetryRing = field(default_factory=lambda: TelemetryRing(60))
     seq_len: int = 30
     score_history: deque = field(default_factory=lambda: deque(maxlen=300))
     last_score: float = 0.0
     last_anomaly: bool = False
     last_attack_probs: dict[str, float] = field(default_factory=dict)
     inference_ms: float = 0.0
-
-    def load(self, artifact_path: str, device: str = "auto") -> bool:
+    micro_batch: int = 1
+    pending: int = field(default=0, init=False)
+    _scaled: np.ndarray | None = field(default=None, init=False, repr=False)
+    _pinned: torch.Tensor | None = field(default=None, init=False, repr=False)
+    _device_input: torch.Tensor | None = field(default=None, init=False, repr=False)
+    _last_result: dict[str, Any] | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def load(self, artifact_path: str, device: str = "auto", quantize: bool = False) -> bool:
         try:
-            self.loaded = load_lstm_artifact(artifact_path, device=device)
-            self.seq_len = self.loaded["metadata"]["seq_len"]
-            self.buffer = deque(maxlen=self.seq_len * 2)
-            return True
+            loaded = load_lstm_artifact(artifact_path, device=device, quantize=quantize)
         except Exception as e:
             print(f"[AnomalyDetector] Failed to load model: {e}")
             return False
 
+        with self._lock:
+            self.loaded = loaded
+            self.seq_len = loaded["metadata"]["seq_len"]
+            self.buffer = TelemetryRing(self.seq_len * 2)
+            # Scratch buffers and the cached result belong to the previous model.
+            self.pending = 0
+            self._last_result = None
+            self._scaled = None
+            self._pinned = None
+            self._device_input = None
+        return True
+
+    def reset(self) -> None:
+        """Forget buffered telemetry and scores, keeping the loaded model and buffers."""
+        with self._lock:
+            self.buffer.clear()
+            self.score_history.clear()
+            self.last_score = 0.0
+            self.last_anomaly = False
+            self.last_attack_probs = {}
+            self.inference_ms = 0.0
+            self.pending = 0
+            self._last_result = None
+
     def is_ready(self) -> bool:
         return self.loaded is not None and len(self.buffer) >= self.seq_len
 
     def ingest(self, telemetry: dict[str, Any]) -> None:
-        vec = telemetry_to_vector(telemetry)
-        self.buffer.append(vec)
+        vector = telemetry_to_vector(telemetry)
+        with self._lock:
+            self.buffer.append(vector)
+            self.pending += 1
 
     def score(self) -> dict[str, Any]:
+        """Score the most recent window."""
+        with self._lock:
+            return self._score_latest(1)
+
+    def score_batch(self, k: int | None = None) -> dict[str, Any]:
+        """Score in micro-batches of ``k`` ticks (default ``micro_batch``).
+
+        Until ``k`` samples have arrived since the last forward pass the
+        previous result is returned unchanged; then the ``k`` most recent
+        overlapping windows go through the model as one batch and the newest
+        window's result becomes current. Scores lag by up to ``k - 1`` ticks.
+        """
+        k = k or self.micro_batch
+        with self._lock:
+            if k > 1 and self.pending < k and self._last_result is not None:
+                return self._last_result
+            return self._score_latest(k)
+
+    def _not_ready(self) -> dict[str, Any]:
+        return {
+            "anomaly_score": 0.0,
+            "is_anomaly": False,
+            "reconstruction_error": 0.0,
+            "threshold": 0.0,
+            "feature_errors": {},
+            "attack_probabilities": {},
+            "inference_ms": 0.0,
+            "buffer_fill": len(self.buffer) / self.seq_len if self.loaded else 0.0,
+            "model_version": "not_loaded",
+        }
+
+    def _windows(self, k: int) -> np.ndarray:
+        """Scaled ``(k, seq_len, features)`` batch of the ``k`` most recent windows.
+
+        Writes into the shared ``_scaled`` scratch buffer; callers hold ``_lock``.
+        """
+        rows = self.seq_len + k - 1
+        if self._scaled is None or self._scaled.shape[0] < rows:
+            self._scaled = np.empty((self.buffer.capacity, N_FEATURES), dtype=np.float32)
+        scaled = self.loaded["scaler"].transform(self.buffer.latest(rows), out=self._scaled[:rows])
+        if k == 1:
+            return scaled[np.newaxis]
+        return np.ascontiguousarray(sliding_window_view(scaled, self.seq_len, axis=0).transpose(0, 2, 1))
+
+    def _to_device(self, windows: np.ndarray, dev: torch.device) -> torch.Tensor:
+        host = torch.from_numpy(windows)
+        if dev.type != "cuda":
+            # Already a zero-copy view of the persistent scaled buffer.
+            return host
+        # Persistent pinned and device buffers sized for the largest batch the
+        # ring can hold, so a tick only issues an async copy.
+        if self._device_input is None or self._device_input.device != dev or self._device_input.shape[1:] != host.shape[1:]:
+            max_batch = self.buffer.capacity - self.seq_len + 1
+            self._pinned = torch.empty((max_batch, *host.shape[1:]), dtype=host.dtype).pin_memory()
+            self._device_input = torch.empty(self._pinned.shape, dtype=host.dtype, device=dev)
+        k = host.shape[0]
+        self._pinned[:k].copy_(host)
+        device_input = self._device_input[:k]
+        device_input.copy_(self._pinned[:k], non_blocking=True)
+        return device_input
+
+    def _score_latest(self, k: int) -> dict[str, Any]:
         if not self.loaded or len(self.buffer) < self.seq_len:
-            return {
-                "anomaly_score": 0.0,
-                "is_anomaly": False,
-                "reconstruction_error": 0.0,
-                "threshold": 0.0,
-                "feature_errors": {},
-                "attack_probabilities": {},
-                "inference_ms": 0.0,
-                "buffer_fill": len(self.buffer) / self.seq_len if self.loaded else 0.0,
-                "model_version": "not_loaded",
-            }
+            return self._not_ready()
 
         t0 = time.time()
         model = self.loaded["model"]
-        scaler = self.loaded["scaler"]
         metadata = self.loaded["metadata"]
         dev = self.loaded["device"]
 
-        # Get latest window
-        window = np.array(list(self.buffer)[-self.seq_len:], dtype=np.float32)
-        scaled = scaler.transform(window)
-        tensor = torch.from_numpy(scaled).unsqueeze(0).to(dev)
+        k = max(1, min(k, self.pending or 1, len(self.buffer) - self.seq_len + 1))
+        tensor = self._to_device(self._windows(k), dev)
 
-        with torch.no_grad():
+        with torch.inference_mode():
             recon = model(tensor)
-            error_per_feature = torch.mean((recon - tensor) ** 2, dim=1).squeeze(0).cpu().numpy()
-            total_error = float(torch.mean((recon - tensor) ** 2).item())
+            squared = (recon - tensor) ** 2
+            errors_per_feature = torch.mean(squared, dim=1).cpu().numpy()
+            total_errors = torch.mean(squared, dim=(1, 2)).cpu().numpy()
 
         threshold = metadata["threshold"]
         score_scale = metadata["score_scale"]
-        anomaly_score = max(0.0, min(100.0, (total_error / score_scale) * 100.0))
+        scores = np.clip(total_errors / score_scale * 100.0, 0.0, 100.0)
+        # Every window in the batch feeds the history, oldest first.
+        self.score_history.extend(float(value) for value in scores)
+        self.pending = 0
+
+        total_error = float(total_errors[-1])
+        anomaly_score = float(scores[-1])
         is_anomaly = total_error >= threshold
 
         # Per-feature error breakdown
-        feature_errors = {
-            FEATURE_NAMES[i]: round(float(error_per_feature[i]), 6)
-            for i in range(N_FEATURES)
-        }
+        error_per_feature = errors_per_feature[-1].astype(np.float64)
+        feature_errors = dict(zip(FEATURE_NAMES, error_per_feature.round(6).tolist()))
 
         # Attack type probability estimation based on feature error patterns
-        attack_probs = self._estimate_attack_type(feature_errors, anomaly_score)
+        attack_probs = self._estimate_attack_type(error_per_feature, anomaly_score)
 
         self.inference_ms = (time.time() - t0) * 1000
         self.last_score = anomaly_score
         self.last_anomaly = is_anomaly
         self.last_attack_probs = attack_probs
-        self.score_history.append(anomaly_score)
 
-        return {
+        self._last_result = {
             "anomaly_score": round(anomaly_score, 2),
             "is_anomaly": is_anomaly,
             "reconstruction_error": round(total_error, 6),
@@ -537,36 +863,22 @@ class AnomalyDetector:
             "model_version": metadata.get("model_version", "lstm-autoencoder-v1"),
             "score_history": list(self.score_history)[-60:],
         }
+        return self._last_result
 
-    def _estimate_attack_type(self, feature_errors: dict[str, float], anomaly_score: float) -> dict[str, float]:
-        """Heuristic attack-type classifier based on which features have highest error."""
+    def _estimate_attack_type(self, error_per_feature: np.ndarray, anomaly_score: float) -> dict[str, float]:
+        """Heuristic attack-type classifier based on which features have highest error.
+
+        ``error_per_feature`` is indexed in ``FEATURE_NAMES`` order.
+        """
         if anomaly_score < 15:
             return {}
 
-        net_err = feature_errors.get("network_packet_rate", 0) + feature_errors.get("network_burst_ratio", 0)
-        scan_err = feature_errors.get("scan_time_ms", 0)
-        prod_err = feature_errors.get("production_rate", 0)
-        reject_err = feature_errors.get("reject_rate", 0)
-        sensor_err = sum(feature_errors.get(k, 0) for k in [
-            "bottle_at_filler", "bottle_at_capper", "bottle_at_quality"
-        ])
-        output_err = feature_errors.get("io_output_sum", 0) + feature_errors.get("output_alarm_horn", 0)
-        input_err = feature_errors.get("io_input_sum", 0)
-
-        total = max(net_err + scan_err + prod_err + reject_err + sensor_err + output_err + input_err, 1e-8)
-
-        probs = {
-            "dos_flood": min(1.0, (net_err * 2 + scan_err) / total),
-            "mitm": min(1.0, (reject_err + sensor_err * 0.5 + net_err * 0.3) / total),
-            "false_data_injection": min(1.0, (prod_err + input_err + sensor_err) / total),
-            "modbus_injection": min(1.0, (output_err * 2 + net_err * 0.5) / total),
-            "stuxnet_like": min(1.0, (scan_err + prod_err * 0.5 + output_err * 0.5) / total),
-            "sensor_jamming": min(1.0, (sensor_err * 2 + reject_err * 0.5) / total),
-        }
+        total = max(float(ATTACK_TOTAL_WEIGHTS @ error_per_feature), 1e-8)
+        probs = np.minimum(1.0, (ATTACK_WEIGHTS @ error_per_feature) / total)
 
         # Normalize to sum to ~1
-        total_prob = sum(probs.values())
+        total_prob = float(probs.sum())
         if total_prob > 0:
-            probs = {k: round(v / total_prob, 3) for k, v in probs.items()}
+            probs = (probs / total_prob).round(3)
 
-        return dict(sorted(probs.items(), key=lambda x: -x[1]))
+        return dict(sorted(zip(ATTACK_TYPES, probs.tolist()), key=lambda x: -x[1]))
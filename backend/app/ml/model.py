@@ -1,10 +1,27 @@
 from __future__ import annotations
 
+import functools
 import pickle
 from pathlib import Path
 from typing import Any
 
 
+def _read_artifact(path: Path) -> Any:
+    """Unpickle an artifact, memory-mapping its NumPy arrays when joblib is available.
+
+    joblib ships with scikit-learn and also reads artifacts written with plain
+    ``pickle``; the bare ``pickle`` fallback keeps metadata reads working
+    without it.
+    """
+    try:
+        import joblib
+    except ImportError:
+        with path.open("rb") as handle:
+            return pickle.load(handle)
+
+    return joblib.load(path, mmap_mode="r")
+
+
 def load_artifact_metadata(artifact_path: str | None) -> dict[str, Any] | None:
     """Load lightweight metadata from a serialized MVTec artifact.
 
@@ -28,8 +45,7 @@ def load_artifact_metadata(artifact_path: str | None) -> dict[str, Any] | None:
         return load_torch_artifact_metadata(str(path))
 
     try:
-        with path.open("rb") as handle:
-            artifact = pickle.load(handle)
+        artifact = _read_artifact(path)
     except Exception:
         # Fallback: attempt torch metadata for unknown artifact extension.
         try:
@@ -65,24 +81,36 @@ def extract_image_features(image_path: str) -> list[float]:
     hsv_image = cv2.cvtColor(resized, cv2.COLOR_BGR2HSV)
     gray_image = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
 
-    features: list[float] = []
-
-    for channel in cv2.split(hsv_image):
-        histogram = cv2.calcHist([channel], [0], None, [16], [0, 256]).flatten()
-        histogram = histogram / (histogram.sum() + 1e-6)
-        features.extend(float(value) for value in histogram)
+    # 16-bin histogram per HSV channel, normalised together in NumPy.
+    histograms = np.stack(
+        [cv2.calcHist([hsv_image], [channel], None, [16], [0, 256]).ravel() for channel in range(3)]
+    )
+    histograms /= histograms.sum(axis=1, keepdims=True) + np.float32(1e-6)
 
-    mean_intensity = float(np.mean(gray_image)) / 255.0
-    std_intensity = float(np.std(gray_image)) / 255.0
+    mean, std = cv2.meanStdDev(gray_image)
+    mean_intensity = float(mean[0, 0]) / 255.0
+    std_intensity = float(std[0, 0]) / 255.0
     sobel_x = cv2.Sobel(gray_image, cv2.CV_32F, 1, 0)
     sobel_y = cv2.Sobel(gray_image, cv2.CV_32F, 0, 1)
-    gradient_magnitude = np.sqrt((sobel_x**2) + (sobel_y**2))
-    edge_strength = float(np.mean(gradient_magnitude)) / 255.0
+    edge_strength = cv2.mean(cv2.magnitude(sobel_x, sobel_y))[0] / 255.0
 
+    features = histograms.ravel().tolist()
     features.extend([mean_intensity, std_intensity, edge_strength])
     return features
 
 
+def cached_image_features(image_path: str) -> list[float]:
+    """``extract_image_features`` memoised on the file's path, size and mtime."""
+
+    stat = Path(image_path).stat()
+    return list(_cached_image_features(image_path, stat.st_size, stat.st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_image_features(image_path: str, size: int, mtime_ns: int) -> tuple[float, ...]:
+    return tuple(extract_image_features(image_path))
+
+
 def train_mvtec_feature_model(
     good_image_paths: list[str],
     *,
@@ -101,7 +129,7 @@ def train_mvtec_feature_model(
         raise ValueError("No training images were provided.")
 
     feature_matrix = np.asarray(
-        [extract_image_features(path) for path in good_image_paths],
+        [cached_image_features(path) for path in good_image_paths],
         dtype=np.float32,
     )
 
@@ -132,19 +160,30 @@ def train_mvtec_feature_model(
 
 
 def save_artifact(artifact: dict[str, Any], artifact_path: str) -> None:
+    # Uncompressed so load_artifact can memory-map the SVM's support vectors.
+    import joblib
+
     path = Path(artifact_path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("wb") as handle:
-        pickle.dump(artifact, handle)
+    joblib.dump(artifact, path)
 
 
 def load_artifact(artifact_path: str) -> dict[str, Any]:
+    """Load a feature-model artifact, reusing the parsed copy until the file changes.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
     path = Path(artifact_path)
     if not path.exists() or not path.is_file():
         raise FileNotFoundError(f"Artifact not found: {artifact_path}")
 
-    with path.open("rb") as handle:
-        artifact = pickle.load(handle)
+    stat = path.stat()
+    return _load_artifact_cached(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_artifact_cached(artifact_path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    artifact = _read_artifact(Path(artifact_path))
 
     if not isinstance(artifact, dict):
         raise ValueError("Artifact payload is invalid.")
@@ -183,7 +222,7 @@ def score_features(artifact: dict[str, Any], features: list[float]) -> dict[str,
 
 
 def score_image(artifact: dict[str, Any], image_path: str) -> dict[str, float | bool]:
-    features = extract_image_features(image_path)
+    features = cached_image_features(image_path)
     scored = score_features(artifact, features)
 
     metadata = artifact.get("metadata", {})
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import io
+import os
+import pickle
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -10,16 +16,20 @@ from torch import nn
 from torch.utils.data import DataLoader, Dataset
 
 
-class _ImagePathDataset(Dataset):
-    def __init__(self, image_paths: list[str], image_size: int) -> None:
-        self.image_paths = image_paths
-        self.image_size = image_size
+WEIGHT_PRECISIONS = ("fp32", "fp16")
+
+
+class _InMemoryImageDataset(Dataset):
+    """Training images decoded once into a single uint8 ``(N, 3, H, W)`` tensor."""
+
+    def __init__(self, images: torch.Tensor) -> None:
+        self.images = images
 
     def __len__(self) -> int:
-        return len(self.image_paths)
+        return int(self.images.size(0))
 
     def __getitem__(self, index: int) -> torch.Tensor:
-        return _load_image_tensor(self.image_paths[index], self.image_size)
+        return self.images[index]
 
 
 class ConvAutoencoder(nn.Module):
@@ -34,12 +44,17 @@ class ConvAutoencoder(nn.Module):
             nn.ReLU(inplace=True),
         )
 
+        # Nearest upsample + 3x3 conv instead of ConvTranspose2d: no checkerboard
+        # artifacts, and plain convolutions get the fast cuDNN kernels.
         self.decoder = nn.Sequential(
-            nn.ConvTranspose2d(64, 32, kernel_size=4, stride=2, padding=1),
+            nn.Upsample(scale_factor=2, mode="nearest"),
+            nn.Conv2d(64, 32, kernel_size=3, padding=1),
             nn.ReLU(inplace=True),
-            nn.ConvTranspose2d(32, 16, kernel_size=4, stride=2, padding=1),
+            nn.Upsample(scale_factor=2, mode="nearest"),
+            nn.Conv2d(32, 16, kernel_size=3, padding=1),
             nn.ReLU(inplace=True),
-            nn.ConvTranspose2d(16, 3, kernel_size=4, stride=2, padding=1),
+            nn.Upsample(scale_factor=2, mode="nearest"),
+            nn.Conv2d(16, 3, kernel_size=3, padding=1),
             nn.Sigmoid(),
         )
 
@@ -47,87 +62,234 @@ class ConvAutoencoder(nn.Module):
         return self.decoder(self.encoder(inputs))
 
 
+def _default_num_workers() -> int:
+    """Parallel image decoders; ``TORCH_DATALOADER_WORKERS=0`` decodes on the calling thread."""
+    configured = os.getenv("TORCH_DATALOADER_WORKERS")
+    if configured is not None:
+        return max(int(configured), 0)
+    return min(os.cpu_count() or 1, 8)
+
+
 def _resolve_device(device: str | None = "auto") -> torch.device:
     if device and device not in {"auto", ""}:
         return torch.device(device)
     return torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 
-def _load_image_tensor(image_path: str, image_size: int) -> torch.Tensor:
+def _configure_cuda_backends(device: torch.device) -> None:
+    """Let cuDNN autotune the fixed image shapes and use TF32 tensor cores on CUDA."""
+    if device.type != "cuda":
+        return
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+
+
+def _read_rgb(image_path: str, image_size: int, dst: np.ndarray | None = None) -> np.ndarray:
+    """Read an image as a resized RGB ``(H, W, 3)`` uint8 array, into ``dst`` when given."""
     image = cv2.imread(image_path, cv2.IMREAD_COLOR)
     if image is None:
         raise ValueError(f"Unable to read image at path: {image_path}")
 
-    rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    resized = cv2.resize(rgb_image, (image_size, image_size), interpolation=cv2.INTER_AREA)
+    # Resizing before the channel swap gives the same pixels and converts fewer of them.
+    resized = cv2.resize(image, (image_size, image_size), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=dst)
+
+
+def _load_image_u8(image_path: str, image_size: int) -> torch.Tensor:
+    """Read, convert to RGB and resize an image into a contiguous uint8 ``(3, H, W)`` tensor."""
+    return torch.from_numpy(_read_rgb(image_path, image_size)).permute(2, 0, 1).contiguous()
+
+
+def _load_image_tensor(image_path: str, image_size: int) -> torch.Tensor:
+    return _load_image_u8(image_path, image_size).float().div_(255.0)
+
+
+def _prepare_batch(images: torch.Tensor, device: torch.device) -> torch.Tensor:
+    """Move a batch to ``device`` and only there widen uint8 pixels to floats in [0, 1]."""
+    batch = images.to(device, non_blocking=True)
+    if batch.dtype == torch.uint8:
+        batch = batch.float().div_(255.0)
+    return batch.contiguous(memory_format=_memory_format(device))
+
+
+def _memory_format(device: torch.device) -> torch.memory_format:
+    """NHWC on CUDA, where cuDNN has tensor-core kernels for it; NCHW elsewhere."""
+    return torch.channels_last if device.type == "cuda" else torch.contiguous_format
+
 
-    tensor = torch.from_numpy(resized).float() / 255.0
-    return tensor.permute(2, 0, 1)
+def _autocast(device: torch.device) -> torch.autocast:
+    """fp16 autocast on CUDA; a no-op context elsewhere."""
+    return torch.autocast(device_type=device.type, dtype=torch.float16, enabled=device.type == "cuda")
+
+
+def _compile_for_cuda(model: nn.Module, device: torch.device, image_size: int) -> nn.Module:
+    """``torch.compile`` the model on CUDA (CUDA graphs for the fixed image size); eager elsewhere.
+
+    ``torch.compile`` only compiles on the first call, so a warm-up forward in
+    the model's current train/eval mode runs here to surface compiler errors
+    while the eager model can still be returned instead.
+    """
+    if device.type != "cuda":
+        return model
+    try:
+        compiled = torch.compile(model, mode="reduce-overhead", fullgraph=True)
+        example = torch.zeros((1, 3, image_size, image_size), device=device)
+        example = example.contiguous(memory_format=_memory_format(device))
+        with torch.inference_mode(not model.training), _autocast(device):
+            compiled(example)
+        return compiled
+    except Exception as error:  # pragma: no cover - depends on the torch build
+        print(f"[TorchAE] torch.compile failed, using eager model: {error}")
+        return model
+
+
+def _decode_images(image_paths: list[str], image_size: int, num_workers: int) -> torch.Tensor:
+    """Decode and resize every image once into one uint8 ``(N, 3, H, W)`` tensor.
+
+    OpenCV releases the GIL, so a thread pool decodes in parallel without
+    worker processes; each thread writes straight into its slot of a single
+    preallocated buffer.
+    """
+    pixels = np.empty((len(image_paths), image_size, image_size, 3), dtype=np.uint8)
+
+    def decode(index: int) -> None:
+        _read_rgb(image_paths[index], image_size, dst=pixels[index])
+
+    if num_workers > 0:
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            list(pool.map(decode, range(len(image_paths))))
+    else:
+        for index in range(len(image_paths)):
+            decode(index)
+
+    return torch.from_numpy(pixels).permute(0, 3, 1, 2).contiguous()
+
+
+def _iter_decoded_batches(
+    image_paths: list[str], image_size: int, batch_size: int, num_workers: int, *, pin_memory: bool = False
+) -> Iterator[torch.Tensor]:
+    """Yield uint8 batches in order while up to ``num_workers`` later batches decode in the background."""
+    chunks = [image_paths[start : start + batch_size] for start in range(0, len(image_paths), batch_size)]
+
+    def decode(chunk: list[str]) -> torch.Tensor:
+        batch = _decode_images(chunk, image_size, 0)
+        return batch.pin_memory() if pin_memory else batch
+
+    if num_workers <= 0:
+        for chunk in chunks:
+            yield decode(chunk)
+        return
+
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(decode, chunk))
+            if len(pending) > num_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 
 def _reconstruction_error(model: nn.Module, tensor: torch.Tensor, device: torch.device) -> float:
-    with torch.no_grad():
-        batch = tensor.unsqueeze(0).to(device)
-        reconstructed = model(batch)
+    with torch.inference_mode():
+        batch = _prepare_batch(tensor.unsqueeze(0), device)
+        with _autocast(device):
+            reconstructed = model(batch).float()
         return float(torch.mean((reconstructed - batch) ** 2).item())
 
 
+def _reconstruction_errors_batched(
+    model: nn.Module, images: torch.Tensor, device: torch.device, batch_size: int = 64
+) -> np.ndarray:
+    """Per-image mean squared reconstruction error, scored ``batch_size`` images at a time."""
+    errors = []
+    with torch.inference_mode():
+        for chunk in images.split(batch_size):
+            batch = _prepare_batch(chunk, device)
+            with _autocast(device):
+                reconstructed = model(batch).float()
+            errors.append(reconstructed.sub_(batch).pow_(2).mean(dim=(1, 2, 3)).cpu())
+    return torch.cat(errors).numpy()
+
+
 def train_torch_autoencoder(
     good_image_paths: list[str],
     *,
-    model_version: str = "mvtec-torch-autoencoder-v1",
+    model_version: str = "mvtec-torch-autoencoder-v2",
     image_size: int = 128,
     epochs: int = 8,
     batch_size: int = 16,
     learning_rate: float = 1e-3,
     threshold_quantile: float = 0.98,
     device: str | None = "auto",
+    num_workers: int | None = None,
+    precision: str = "fp32",
 ) -> dict[str, Any]:
     if not good_image_paths:
         raise ValueError("No training images were provided.")
+    if precision not in WEIGHT_PRECISIONS:
+        raise ValueError(f"Unsupported weight precision: {precision}")
 
     resolved_device = _resolve_device(device)
+    _configure_cuda_backends(resolved_device)
+    if num_workers is None:
+        num_workers = _default_num_workers()
 
-    model = ConvAutoencoder().to(resolved_device)
+    model = ConvAutoencoder().to(resolved_device, memory_format=_memory_format(resolved_device))
+    # Train through the compiled wrapper; ``model`` keeps the plain state_dict keys.
+    train_model = _compile_for_cuda(model, resolved_device, image_size)
     optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate)
     criterion = nn.MSELoss()
+    # Loss scaling keeps small fp16 gradients from flushing to zero.
+    grad_scaler = torch.amp.GradScaler(resolved_device.type, enabled=resolved_device.type == "cuda")
 
-    dataset = _ImagePathDataset(good_image_paths, image_size)
+    # Images never change between epochs, so decode them once up front and
+    # train (and calibrate) from memory.
+    images = _decode_images(good_image_paths, image_size, num_workers)
     loader = DataLoader(
-        dataset,
+        _InMemoryImageDataset(images),
         batch_size=max(batch_size, 1),
         shuffle=True,
         drop_last=False,
-        num_workers=0,
+        pin_memory=resolved_device.type == "cuda",
     )
 
     epoch_losses: list[float] = []
+    # Per-sample errors seen during the final epoch double as the calibration
+    # scores, so no extra inference pass over the training set is needed.
+    last_epoch_errors: list[torch.Tensor] = []
+    total_epochs = max(epochs, 1)
 
     model.train()
-    for _ in range(max(epochs, 1)):
-        epoch_loss_sum = 0.0
+    for epoch in range(total_epochs):
+        # Accumulate on the device so the loop only syncs with the host once per epoch.
+        epoch_loss_sum = torch.zeros((), device=resolved_device)
         sample_count = 0
+        is_last_epoch = epoch == total_epochs - 1
 
         for batch in loader:
-            batch = batch.to(resolved_device)
+            batch = _prepare_batch(batch, resolved_device)
 
             optimizer.zero_grad(set_to_none=True)
-            reconstructed = model(batch)
-            loss = criterion(reconstructed, batch)
-            loss.backward()
-            optimizer.step()
+            with _autocast(resolved_device):
+                reconstructed = train_model(batch)
+                loss = criterion(reconstructed, batch)
+            if is_last_epoch:
+                per_sample = (reconstructed.detach().float() - batch).pow_(2).mean(dim=(1, 2, 3))
+                last_epoch_errors.append(per_sample)
+            grad_scaler.scale(loss).backward()
+            grad_scaler.step(optimizer)
+            grad_scaler.update()
 
             batch_size_actual = int(batch.size(0))
-            epoch_loss_sum += float(loss.item()) * batch_size_actual
+            epoch_loss_sum += loss.detach().float() * batch_size_actual
             sample_count += batch_size_actual
 
-        epoch_losses.append(epoch_loss_sum / max(sample_count, 1))
+        epoch_losses.append(float(epoch_loss_sum.item()) / max(sample_count, 1))
 
     model.eval()
-    raw_scores = [
-        _reconstruction_error(model, _load_image_tensor(path, image_size), resolved_device)
-        for path in good_image_paths
-    ]
+    raw_scores = torch.cat(last_epoch_errors).cpu().numpy()
 
     threshold = float(np.quantile(raw_scores, threshold_quantile))
     score_scale = max(threshold * 2.0, 1e-8)
@@ -139,26 +301,70 @@ def train_torch_autoencoder(
         "threshold_quantile": threshold_quantile,
         "image_size": int(image_size),
         "trained_samples": int(len(good_image_paths)),
-        "epochs": int(max(epochs, 1)),
+        "epochs": int(total_epochs),
         "batch_size": int(max(batch_size, 1)),
         "learning_rate": float(learning_rate),
         "device": str(resolved_device),
+        "mixed_precision": "fp16" if resolved_device.type == "cuda" else None,
         "final_train_loss": float(epoch_losses[-1] if epoch_losses else 0.0),
+        "precision": precision,
     }
 
+    state_dict = model.state_dict()
+    if precision == "fp16":
+        state_dict = {
+            key: value.half() if value.is_floating_point() else value for key, value in state_dict.items()
+        }
+
     return {
         "type": "torch_autoencoder",
-        "state_dict": model.state_dict(),
+        "state_dict": state_dict,
         "metadata": metadata,
     }
 
 
+def _trace_for_inference(state_dict: dict[str, Any], image_size: int) -> bytes:
+    """Serialized ``torch.jit.trace`` of the fp32 CPU model, shape-generic over batch size."""
+    model = ConvAutoencoder()
+    model.load_state_dict(state_dict)
+    model.eval()
+    example = torch.zeros(1, 3, image_size, image_size)
+    with torch.inference_mode():
+        traced = torch.jit.trace(model, example)
+    buffer = io.BytesIO()
+    torch.jit.save(traced, buffer)
+    return buffer.getvalue()
+
+
 def save_torch_artifact(artifact: dict[str, Any], artifact_path: str) -> None:
     path = Path(artifact_path)
     path.parent.mkdir(parents=True, exist_ok=True)
+    metadata = artifact.get("metadata", {})
+    # fp16 artifacts are meant to stay small; an fp32 trace would more than undo that.
+    wants_trace = metadata.get("precision", "fp32") == "fp32"
+    if wants_trace and "scripted" not in artifact and isinstance(artifact.get("state_dict"), dict):
+        image_size = int(metadata.get("image_size", 128))
+        try:
+            artifact = {**artifact, "scripted": _trace_for_inference(artifact["state_dict"], image_size)}
+        except Exception as error:  # pragma: no cover - depends on the torch build
+            print(f"[TorchAE] TorchScript trace skipped: {error}")
     torch.save(artifact, path)
 
 
+def _load_artifact_file(path: Path) -> Any:
+    """``torch.load`` with tensors memory-mapped from the file instead of read up front.
+
+    Artifacts are trusted local files, so metadata the restricted unpickler
+    rejects (e.g. numpy scalars) falls back to a full unpickle.
+    """
+    try:
+        return torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    except pickle.UnpicklingError:
+        return torch.load(path, map_location="cpu", mmap=True, weights_only=False)
+    except TypeError:  # pragma: no cover - torch < 2.1 has no mmap
+        return torch.load(path, map_location="cpu")
+
+
 def load_torch_artifact_metadata(artifact_path: str | None) -> dict[str, Any] | None:
     if not artifact_path:
         return None
@@ -168,7 +374,7 @@ def load_torch_artifact_metadata(artifact_path: str | None) -> dict[str, Any] |
         return None
 
     try:
-        artifact = torch.load(path, map_location="cpu")
+        artifact = _load_artifact_file(path)
     except Exception:
         return None
 
@@ -187,12 +393,19 @@ def load_torch_artifact_metadata(artifact_path: str | None) -> dict[str, Any] |
     }
 
 
-def load_torch_artifact(artifact_path: str, *, device: str | None = "auto") -> dict[str, Any]:
+def load_torch_artifact(
+    artifact_path: str, *, device: str | None = "auto", optimize: bool = True
+) -> dict[str, Any]:
+    """Load a conv autoencoder artifact for inference.
+
+    With ``optimize`` the TorchScript trace stored at save time is used on CPU;
+    on CUDA the eager model is rebuilt and handed to ``torch.compile``.
+    """
     path = Path(artifact_path)
     if not path.exists() or not path.is_file():
         raise FileNotFoundError(f"Artifact not found: {artifact_path}")
 
-    artifact = torch.load(path, map_location="cpu")
+    artifact = _load_artifact_file(path)
     if not isinstance(artifact, dict):
         raise ValueError("Torch artifact payload is invalid.")
 
@@ -205,27 +418,39 @@ def load_torch_artifact(artifact_path: str, *, device: str | None = "auto") -> d
         metadata = {}
 
     resolved_device = _resolve_device(device)
-    model = ConvAutoencoder().to(resolved_device)
-    model.load_state_dict(state_dict)
+    _configure_cuda_backends(resolved_device)
+    scripted = artifact.get("scripted")
+    if optimize and resolved_device.type == "cpu" and isinstance(scripted, bytes):
+        model = torch.jit.load(io.BytesIO(scripted), map_location=resolved_device)
+        return {"model": model.eval(), "metadata": metadata, "device": resolved_device}
+
+    # fp16-stored weights are widened back: CPU has no fast fp16 convs and CUDA
+    # already runs the forward pass under fp16 autocast.
+    state_dict = {
+        key: value.float() if value.dtype == torch.float16 else value for key, value in state_dict.items()
+    }
+
+    # assign=True adopts the memory-mapped tensors instead of copying them into
+    # fresh parameters; .to() then makes the single copy onto the target device.
+    model = ConvAutoencoder()
+    try:
+        model.load_state_dict(state_dict, assign=True)
+    except RuntimeError as error:
+        raise ValueError(
+            "Torch artifact does not match the current ConvAutoencoder layout; retrain it "
+            "with scripts/train_mvtec_model.py."
+        ) from error
+    model.to(resolved_device, memory_format=_memory_format(resolved_device))
     model.eval()
 
     return {
-        "model": model,
+        "model": _compile_for_cuda(model, resolved_device, int(metadata.get("image_size", 128))),
         "metadata": metadata,
         "device": resolved_device,
     }
 
 
-def score_torch_image(loaded_artifact: dict[str, Any], image_path: str) -> dict[str, float | bool | str]:
-    model = loaded_artifact["model"]
-    metadata = loaded_artifact.get("metadata", {})
-    device = loaded_artifact["device"]
-
-    image_size = int(metadata.get("image_size", 128))
-    tensor = _load_image_tensor(image_path, image_size)
-
-    raw_score = _reconstruction_error(model, tensor, device)
-
+def _score_result(raw_score: float, metadata: dict[str, Any]) -> dict[str, float | bool | str]:
     threshold = float(metadata.get("threshold", 0.0))
     score_scale = float(metadata.get("score_scale", max(threshold * 2.0, 1e-8)))
 
@@ -239,3 +464,43 @@ def score_torch_image(loaded_artifact: dict[str, Any], image_path: str) -> dict[
         "threshold": threshold,
         "model_version": str(metadata.get("model_version", "mvtec-torch-autoencoder-v1")),
     }
+
+
+def score_torch_image(loaded_artifact: dict[str, Any], image_path: str) -> dict[str, float | bool | str]:
+    model = loaded_artifact["model"]
+    metadata = loaded_artifact.get("metadata", {})
+    device = loaded_artifact["device"]
+
+    image_size = int(metadata.get("image_size", 128))
+    tensor = _load_image_tensor(image_path, image_size)
+
+    raw_score = _reconstruction_error(model, tensor, device)
+    return _score_result(raw_score, metadata)
+
+
+def score_torch_images(
+    loaded_artifact: dict[str, Any],
+    image_paths: list[str],
+    *,
+    batch_size: int = 32,
+    num_workers: int | None = None,
+) -> list[dict[str, float | bool | str]]:
+    """Score many images ``batch_size`` per forward pass, decoding the next batches while the model runs."""
+    if not image_paths:
+        return []
+
+    model = loaded_artifact["model"]
+    device = loaded_artifact["device"]
+    metadata = loaded_artifact.get("metadata", {})
+    image_size = int(metadata.get("image_size", 128))
+    batch_size = max(batch_size, 1)
+    if num_workers is None:
+        num_workers = _default_num_workers()
+
+    batches = _iter_decoded_batches(
+        image_paths, image_size, batch_size, num_workers, pin_memory=device.type == "cuda"
+    )
+    raw_scores = np.concatenate(
+        [_reconstruction_errors_batched(model, batch, device, batch_size) for batch in batches]
+    )
+    return [_score_result(float(raw_score), metadata) for raw_score in raw_scores]
@@ -0,0 +1,210 @@
+"""Numeric kernels for the analyzer hot path.
+
+The kernels only take and return plain scalars/arrays so they can be compiled
+with Numba when it is installed. Without Numba they run as regular Python and
+produce identical results, which keeps the API bootable on minimal installs.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - exercised only without numba installed
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(function):
+            return function
+
+        return decorator
+
+
+# Slots in the component array returned by ``rule_score_kernel``.
+REJECT_RATE_COMPONENT = 0
+THROUGHPUT_COMPONENT = 1
+ACCUMULATION_COMPONENT = 2
+ALARM_HORN_COMPONENT = 3
+REJECT_GATE_COMPONENT = 4
+PACKET_RATE_COMPONENT = 5
+BURST_COMPONENT = 6
+UNAUTHORIZED_COMPONENT = 7
+SECURITY_FLAG_COMPONENT = 8
+N_RULE_COMPONENTS = 9
+
+# Extra bit in the returned mask: packet-rate drift is reported as a reason
+# even though its component is always present.
+PACKET_DRIFT_BIT = N_RULE_COMPONENTS
+
+
+@njit(inline="always", cache=True)
+def clamp(value: float, minimum: float, maximum: float) -> float:
+    if value < minimum:
+        return minimum
+    if value > maximum:
+        return maximum
+    return value
+
+
+@njit(cache=True)
+def rule_score_kernel(
+    reject_rate: float,
+    production_rate: float,
+    conveyor_running: bool,
+    in_flight_bottles: float,
+    alarm_horn: bool,
+    reject_gate: bool,
+    packet_rate: float,
+    burst_ratio: float,
+    unauthorized_attempts: float,
+    security_flag: bool,
+    expected_packet_rate: float,
+) -> tuple[float, float, np.ndarray, int]:
+    """Score the rule-based process and network lanes.
+
+    Returns ``(rule_process_score, network_score, components, mask)`` where bit
+    ``i`` of ``mask`` is set when ``components[i]`` fired. The network score is
+    already clamped to 0-100; the process score is not, since the caller still
+    combines it with the vision lane.
+    """
+    components = np.zeros(N_RULE_COMPONENTS, dtype=np.float64)
+    mask = 0
+    process_score = 0.0
+    network_score = 0.0
+
+    if reject_rate > 12.0:
+        components[REJECT_RATE_COMPONENT] = min(40.0, (reject_rate - 12.0) * 2.0)
+        mask |= 1 << REJECT_RATE_COMPONENT
+
+    if production_rate < 4.0 and conveyor_running:
+        components[THROUGHPUT_COMPONENT] = 22.0
+        mask |= 1 << THROUGHPUT_COMPONENT
+
+    if in_flight_bottles > 6.0:
+        components[ACCUMULATION_COMPONENT] = 25.0
+        mask |= 1 << ACCUMULATION_COMPONENT
+
+    if alarm_horn:
+        components[ALARM_HORN_COMPONENT] = 12.0
+        mask |= 1 << ALARM_HORN_COMPONENT
+
+    if reject_gate and reject_rate > 8.0:
+        components[REJECT_GATE_COMPONENT] = 10.0
+        mask |= 1 << REJECT_GATE_COMPONENT
+
+    for index in range(PACKET_RATE_COMPONENT):
+        process_score += components[index]
+
+    packet_delta = abs(packet_rate - expected_packet_rate)
+    components[PACKET_RATE_COMPONENT] = min(35.0, packet_delta * 1.1)
+    mask |= 1 << PACKET_RATE_COMPONENT
+    if packet_delta > 18.0:
+        mask |= 1 << PACKET_DRIFT_BIT
+
+    if burst_ratio > 0.72:
+        components[BURST_COMPONENT] = (burst_ratio - 0.72) * 90.0
+        mask |= 1 << BURST_COMPONENT
+
+    if unauthorized_attempts > 0.0:
+        components[UNAUTHORIZED_COMPONENT] = 35.0 + unauthorized_attempts * 10.0
+        mask |= 1 << UNAUTHORIZED_COMPONENT
+
+    if security_flag:
+        components[SECURITY_FLAG_COMPONENT] = 42.0
+        mask |= 1 << SECURITY_FLAG_COMPONENT
+
+    for index in range(PACKET_RATE_COMPONENT, N_RULE_COMPONENTS):
+        network_score += components[index]
+
+    return process_score, clamp(network_score, 0.0, 100.0), components, mask
+
+
+@njit(cache=True, fastmath=True)
+def zscore_kernel(
+    values: np.ndarray, window_sum: np.ndarray, window_sum_sq: np.ndarray, count: int
+) -> np.ndarray:
+    """Absolute z-scores of ``values`` (rows x streams) against a window's running sums."""
+    rows, width = values.shape
+    zscores = np.empty((rows, width), dtype=np.float64)
+    for column in range(width):
+        mean = window_sum[column] / count
+        # Running sums can drift slightly negative on near-constant windows.
+        variance = max(window_sum_sq[column] / count - mean * mean, 0.0)
+        std = max(math.sqrt(variance), 1e-6)
+        for row in range(rows):
+            zscores[row, column] = abs((values[row, column] - mean) / std)
+    return zscores
+
+
+@njit(cache=True, fastmath=True)
+def drift_score_kernel(
+    values: np.ndarray,
+    window_sum: np.ndarray,
+    window_sum_sq: np.ndarray,
+    count: int,
+    min_count: int,
+    weights: np.ndarray,
+    scale: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score each row of ``values`` against the window in one pass.
+
+    Returns ``(scores, zscores)``: the weighted z-score sum times ``scale``,
+    clamped to 0-100, plus the per-stream z-scores. Until the window holds
+    ``min_count`` samples every score is zero.
+    """
+    rows, width = values.shape
+    scores = np.zeros(rows, dtype=np.float64)
+    if count < min_count:
+        return scores, np.zeros((rows, width), dtype=np.float64)
+
+    zscores = zscore_kernel(values, window_sum, window_sum_sq, count)
+    for row in range(rows):
+        weighted = 0.0
+        for column in range(width):
+            weighted += zscores[row, column] * weights[column]
+        scores[row] = clamp(weighted * scale, 0.0, 100.0)
+    return scores, zscores
+
+
+@njit(cache=True)
+def ring_buffer_extend(
+    buffer: np.ndarray,
+    rows: np.ndarray,
+    index: int,
+    count: int,
+    window_sum: np.ndarray,
+    window_sum_sq: np.ndarray,
+) -> tuple[int, int]:
+    """Append ``rows`` to a ``(maxlen, width)`` ring buffer in place, updating its running sums.
+
+    Sums accumulate the stored (possibly narrower) value so evictions cancel
+    exactly. Returns the new ``(index, count)``.
+    """
+    maxlen, width = buffer.shape
+    for row in range(rows.shape[0]):
+        for column in range(width):
+            if count == maxlen:
+                evicted = np.float64(buffer[index, column])
+                window_sum[column] -= evicted
+                window_sum_sq[column] -= evicted * evicted
+            buffer[index, column] = rows[row, column]
+            stored = np.float64(buffer[index, column])
+            window_sum[column] += stored
+            window_sum_sq[column] += stored * stored
+        if count < maxlen:
+            count += 1
+        index = (index + 1) % maxlen
+    return index, count
+
+
+def warm_up() -> None:
+    """Compile (or load from cache) every kernel so the first request pays no JIT cost."""
+    rule_score_kernel(0.0, 0.0, False, 0.0, False, False, 0.0, 0.0, 0.0, False, 0.0)
+    zscore_kernel(np.zeros((1, 1)), np.zeros(1), np.zeros(1), 1)
+    drift_score_kernel(np.zeros((1, 1)), np.zeros(1), np.zeros(1), 1, 1, np.ones(1), 1.0)
+    for dtype in (np.float64, np.float32):
+        ring_buffer_extend(np.zeros((1, 1), dtype=dtype), np.zeros((1, 1)), 0, 0, np.zeros(1), np.zeros(1))
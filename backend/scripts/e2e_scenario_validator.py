@@ -3,12 +3,16 @@ from __future__ import annotations
 import argparse
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 @dataclass
@@ -77,9 +81,9 @@ def _read_lockout_coil(*, host: str, port: int, unit_id: int, address: int, time
         client.close()
 
 
-def _base_telemetry_payload() -> dict[str, Any]:
+def _base_telemetry_payload(timestamp: str | None = None) -> dict[str, Any]:
     return {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
         "production_count": 100,
         "production_rate": 12,
         "reject_rate": 1,
@@ -178,6 +182,35 @@ def _scenario_definitions() -> list[ScenarioDefinition]:
     ]
 
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _retrying_adapter(methods: frozenset[str]) -> HTTPAdapter:
+    retry = Retry(
+        total=2,
+        backoff_factor=0.1,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=methods,
+    )
+    return HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+
+
+def _build_session(base_url: str | None = None) -> requests.Session:
+    """Keep-alive session that reuses pooled connections and retries gateway errors.
+
+    Only GETs retry by default: a replayed ``POST /analyze`` would record a
+    second analysis event. The signal posts just overwrite the latest signal,
+    so under ``base_url`` the ``/signals/`` prefix retries POSTs as well.
+    """
+    session = requests.Session()
+    adapter = _retrying_adapter(frozenset({"GET"}))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if base_url:
+        session.mount(f"{base_url.rstrip('/')}/signals/", _retrying_adapter(frozenset({"GET", "POST"})))
+    return session
+
+
 def _post_signal(
     session: requests.Session,
     *,
@@ -185,18 +218,49 @@ def _post_signal(
     endpoint: str,
     payload: dict[str, Any],
     timeout_seconds: float,
+    timestamp: str | None = None,
 ) -> None:
     body = dict(payload)
-    body["timestamp"] = datetime.now(timezone.utc).isoformat()
+    body["timestamp"] = timestamp or datetime.now(timezone.utc).isoformat()
 
     response = session.post(
         f"{base_url.rstrip('/')}{endpoint}",
-        json=body,
+        data=orjson.dumps(body),
+        headers=JSON_HEADERS,
         timeout=timeout_seconds,
     )
     response.raise_for_status()
 
 
+def _post_scenario_signals(
+    session: requests.Session,
+    executor: ThreadPoolExecutor,
+    scenario: ScenarioDefinition,
+    *,
+    base_url: str,
+    timeout_seconds: float,
+    timestamp: str,
+) -> None:
+    """Post the vision and security signals concurrently; both must land before /analyze."""
+    pending = [
+        executor.submit(
+            _post_signal,
+            session,
+            base_url=base_url,
+            endpoint=endpoint,
+            payload=payload,
+            timeout_seconds=timeout_seconds,
+            timestamp=timestamp,
+        )
+        for endpoint, payload in (
+            ("/signals/vision", scenario.vision_payload),
+            ("/signals/security", scenario.security_payload),
+        )
+    ]
+    for future in pending:
+        future.result()
+
+
 def _run_analyze(
     session: requests.Session,
     *,
@@ -206,7 +270,8 @@ def _run_analyze(
 ) -> dict[str, Any]:
     response = session.post(
         f"{base_url.rstrip('/')}/analyze",
-        json=payload,
+        data=orjson.dumps(payload),
+        headers=JSON_HEADERS,
         timeout=timeout_seconds,
     )
     response.raise_for_status()
@@ -290,28 +355,24 @@ def main() -> None:
 
     results: list[ScenarioResult] = []
 
-    with requests.Session() as session:
+    # Scenarios stay sequential: the analyzer keeps only the latest signal of
+    # each kind, so overlapping scenarios would read each other's signals.
+    with _build_session(args.api_base_url) as session, ThreadPoolExecutor(max_workers=2) as executor:
         for scenario in _scenario_definitions():
-            _post_signal(
-                session,
-                base_url=args.api_base_url,
-                endpoint="/signals/vision",
-                payload=scenario.vision_payload,
-                timeout_seconds=args.request_timeout_seconds,
-            )
-            _post_signal(
+            timestamp = datetime.now(timezone.utc).isoformat()
+            _post_scenario_signals(
                 session,
+                executor,
+                scenario,
                 base_url=args.api_base_url,
-                endpoint="/signals/security",
-                payload=scenario.security_payload,
                 timeout_seconds=args.request_timeout_seconds,
+                timestamp=timestamp,
             )
 
             time.sleep(max(args.scenario_settle_seconds, 0.0))
 
-            payload = _base_telemetry_payload()
+            payload = _base_telemetry_payload(timestamp)
             payload.update(scenario.telemetry_overrides)
-            payload["timestamp"] = datetime.now(timezone.utc).isoformat()
 
             analyze_response = _run_analyze(
                 session,
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 from pathlib import Path
 import sys
 
@@ -11,17 +12,20 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
 
-from app.ml import load_artifact, load_torch_artifact, score_image, score_torch_image
+from app.ml import load_artifact, load_torch_artifact, score_image, score_torch_images
 
 
-SUPPORTED_EXTENSIONS = ("*.png", "*.jpg", "*.jpeg", "*.bmp", "*.webp")
+SUPPORTED_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".webp"})
 
 
 def _collect_images(directory: Path) -> list[Path]:
+    # One os.walk (scandir) pass; filtering names in Python needs no per-file stat().
     files: list[Path] = []
-    for extension in SUPPORTED_EXTENSIONS:
-        files.extend(directory.rglob(extension))
-    return sorted(set(files))
+    for root, _dirs, names in os.walk(directory):
+        files.extend(
+            Path(root, name) for name in names if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+        )
+    return sorted(files)
 
 
 def parse_args() -> argparse.Namespace:
@@ -41,6 +45,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-good", type=int, default=0, help="Limit good test samples (0 = all)")
     parser.add_argument("--max-defect", type=int, default=0, help="Limit defect test samples (0 = all)")
     parser.add_argument("--device", default="auto", help="Torch device (auto/cpu/cuda) for autoencoder artifacts")
+    parser.add_argument("--batch-size", type=int, default=32, help="Images per forward pass for autoencoder artifacts")
     return parser.parse_args()
 
 
@@ -57,13 +62,12 @@ def main() -> None:
 
     if is_torch:
         loaded = load_torch_artifact(args.artifact_path, device=args.device)
-        artifact = loaded
         metadata = loaded.get("metadata", {})
-        _score_fn = lambda path: score_torch_image(loaded, str(path))
+        _score_all = lambda paths: score_torch_images(loaded, [str(path) for path in paths], batch_size=args.batch_size)
     else:
         artifact = load_artifact(args.artifact_path)
         metadata = artifact.get("metadata", {})
-        _score_fn = lambda path: score_image(artifact, str(path))
+        _score_all = lambda paths: [score_image(artifact, str(path)) for path in paths]
 
     good_paths = _collect_images(test_root / "good")
     defect_paths: list[Path] = []
@@ -83,18 +87,11 @@ def main() -> None:
     if not defect_paths:
         raise ValueError("No defect test images found.")
 
-    y_true: list[int] = []
-    y_pred: list[int] = []
-
-    for path in good_paths:
-        score = _score_fn(path)
-        y_true.append(0)
-        y_pred.append(1 if bool(score["defect_flag"]) else 0)
-
-    for path in defect_paths:
-        score = _score_fn(path)
-        y_true.append(1)
-        y_pred.append(1 if bool(score["defect_flag"]) else 0)
+    y_true = [0] * len(good_paths) + [1] * len(defect_paths)
+    y_pred = [
+        1 if bool(score["defect_flag"]) else 0
+        for score in (*_score_all(good_paths), *_score_all(defect_paths))
+    ]
 
     metrics = {
         "model_version": metadata.get("model_version", "unknown"),
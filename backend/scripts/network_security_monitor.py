@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import argparse
 import random
+import socket
+import struct
+import threading
 import time
 from collections import deque
 from dataclasses import dataclass
@@ -9,10 +12,26 @@ from datetime import datetime, timezone
 from typing import Iterable
 
 import requests
-from scapy.all import IP, TCP, sniff
+from scapy.all import IP, TCP, AsyncSniffer, IPv6, conf
+from scapy.arch.common import compile_filter
 
 
 DEFAULT_PROTOCOL_PORTS = (502, 4840, 1883)
+PROTOCOL_PORTS = frozenset(DEFAULT_PROTOCOL_PORTS)
+# Modbus/TCP and MQTT requests are what an attacker floods.
+BURST_PORTS = frozenset((502, 1883))
+CAPTURE_FILTER = "tcp and (" + " or ".join(f"port {port}" for port in DEFAULT_PROTOCOL_PORTS) + ")"
+
+ETH_P_ALL = 0x0003
+ETH_P_IP = 0x0800
+ETH_P_IPV6 = 0x86DD
+# 802.1Q and 802.1ad (QinQ) tags; each adds 4 bytes before the real ethertype.
+VLAN_ETHERTYPES = frozenset((0x8100, 0x88A8))
+ETH_HEADER_LEN = 14
+IPPROTO_TCP = 6
+PACKET_OUTGOING = 4
+ARPHRD_LOOPBACK = 772
+_TCP_PORTS = struct.Struct("!HH")
 
 
 @dataclass
@@ -35,6 +54,18 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-samples", type=int, default=0, help="Limit windows processed (0 = infinite)")
     parser.add_argument("--loop", action="store_true", help="Continue running indefinitely")
     parser.add_argument("--timeout-seconds", type=float, default=3.0)
+    parser.add_argument(
+        "--signal-batch-size",
+        type=int,
+        default=4,
+        help="Windows posted per request (flagged windows are always sent immediately)",
+    )
+    parser.add_argument(
+        "--signal-flush-seconds",
+        type=float,
+        default=2.0,
+        help="Longest a quiet window waits before being posted",
+    )
     parser.add_argument(
         "--allowed-source-ips",
         default="127.0.0.1,::1",
@@ -46,21 +77,24 @@ def parse_args() -> argparse.Namespace:
         default="sniff",
         help="Use real packet sniffing or synthetic simulation mode",
     )
+    parser.add_argument(
+        "--capture-backend",
+        choices=["auto", "raw", "scapy"],
+        default="auto",
+        help="Sniff via a raw AF_PACKET socket (Linux) or scapy; auto picks raw when available",
+    )
     return parser.parse_args()
 
 
-def _post_security_signal(
-    session: requests.Session,
+def _build_security_payload(
     *,
-    api_base_url: str,
-    timeout_seconds: float,
     packet_rate: float,
     burst_ratio: float,
     unauthorized_attempts: int,
     security_flag: bool,
     sample_window_seconds: float,
-) -> None:
-    payload = {
+) -> dict:
+    return {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "packet_rate": round(packet_rate, 3),
         "burst_ratio": round(burst_ratio, 3),
@@ -70,6 +104,14 @@ def _post_security_signal(
         "sample_window_seconds": sample_window_seconds,
     }
 
+
+def _post_security_signal(
+    session: requests.Session,
+    *,
+    api_base_url: str,
+    timeout_seconds: float,
+    payload: dict,
+) -> None:
     response = session.post(
         f"{api_base_url.rstrip('/')}/signals/security",
         json=payload,
@@ -78,53 +120,303 @@ def _post_security_signal(
     response.raise_for_status()
 
 
-def _iter_packets(interface: str, window_seconds: float) -> list:
+class SecuritySignalBatcher:
+    """Buffers window payloads and posts them to ``/signals/security/batch``.
+
+    A flush happens when ``batch_size`` windows are pending, when
+    ``flush_seconds`` have passed since the last one, or right away for a
+    flagged window so alerts are never held back. Analyzers without the batch
+    endpoint (404) get one ``/signals/security`` POST per window instead.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        *,
+        api_base_url: str,
+        timeout_seconds: float,
+        batch_size: int,
+        flush_seconds: float,
+    ) -> None:
+        self.session = session
+        self.api_base_url = api_base_url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self.batch_size = max(batch_size, 1)
+        self.flush_seconds = max(flush_seconds, 0.0)
+        self.pending: deque[dict] = deque(maxlen=64)
+        self.batch_supported = True
+        self.last_flush = time.monotonic()
+
+    def add(self, payload: dict) -> None:
+        self.pending.append(payload)
+        if (
+            payload["security_flag"]
+            or len(self.pending) >= self.batch_size
+            or time.monotonic() - self.last_flush >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+
+        batch = list(self.pending)
+        if self.batch_supported and len(batch) > 1:
+            response = self.session.post(
+                f"{self.api_base_url}/signals/security/batch",
+                json=batch,
+                timeout=self.timeout_seconds,
+            )
+            if response.status_code == 404:
+                self.batch_supported = False
+            else:
+                response.raise_for_status()
+                batch = []
+
+        for payload in batch:
+            _post_security_signal(
+                self.session,
+                api_base_url=self.api_base_url,
+                timeout_seconds=self.timeout_seconds,
+                payload=payload,
+            )
+
+        self.pending.clear()
+        self.last_flush = time.monotonic()
+
+
+def _start_sniffer(interface: str, counters: "LaneCounters") -> AsyncSniffer:
+    """Capture continuously in a background thread; BPF drops other traffic in the kernel."""
     sniff_kwargs = {
-        "timeout": max(window_seconds, 0.2),
-        "store": True,
+        "prn": counters.observe,
+        "store": False,
     }
     if interface:
         sniff_kwargs["iface"] = interface
 
     try:
-        return sniff(**sniff_kwargs)
-    except PermissionError as error:
+        compile_filter(CAPTURE_FILTER, iface=interface or None)
+        sniff_kwargs["filter"] = CAPTURE_FILTER
+    except Exception as error:
+        # Without libpcap/tcpdump the BPF cannot be compiled; _analyze_packets
+        # still filters by port, just in Python.
+        print(f"BPF capture filter unavailable, filtering in Python: {error}")
+
+    sniffer = AsyncSniffer(**sniff_kwargs)
+    sniffer.start()
+    return sniffer
+
+
+class RawSocketSniffer:
+    """Linux capture loop on an AF_PACKET socket, decoding IP/TCP headers with struct.
+
+    Mirrors the parts of scapy's AsyncSniffer that ``main`` uses (``start``,
+    ``stop``, ``running``, ``exception``) without building a scapy packet per
+    frame. Without ``interface`` it binds to scapy's default ``conf.iface``,
+    the same interface AsyncSniffer would capture on. ``CAPTURE_FILTER`` is
+    attached as a kernel BPF program when libpcap can compile it; otherwise
+    every frame reaches ``_analyze_frame``, which filters by port itself.
+    """
+
+    def __init__(self, interface: str, counters: "LaneCounters") -> None:
+        self.interface = interface or str(conf.iface)
+        self.counters = counters
+        self.allowed_sources = frozenset(
+            packed for packed in map(_pack_address, counters.allowed_sources) if packed is not None
+        )
+        self.exception: Exception | None = None
+        self.kernel_filtered = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._sock: socket.socket | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        # Open in the caller so a missing CAP_NET_RAW fails fast. ETH_P_ALL (as
+        # scapy uses) also delivers this host's outgoing frames, e.g. PLC replies.
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        sock.bind((self.interface, 0))
+        try:
+            # Same libpcap compile_filter path scapy's own sniffing uses.
+            from scapy.arch.linux import attach_filter
+
+            attach_filter(sock, CAPTURE_FILTER, self.interface)
+            self.kernel_filtered = True
+        except Exception as error:
+            print(f"BPF capture filter unavailable, filtering in Python: {error}")
+        sock.settimeout(0.2)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._run, name="raw-sniffer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        assert self._sock is not None
+        buffer = bytearray(65535)
+        frame = memoryview(buffer)
+        try:
+            with self._sock as sock:
+                while not self._stop.is_set():
+                    try:
+                        length, address = sock.recvfrom_into(buffer)
+                    except socket.timeout:
+                        continue
+                    # Loopback delivers every frame twice, as outgoing and as
+                    # incoming; drop the outgoing copy like libpcap does.
+                    if address[2] == PACKET_OUTGOING and address[3] == ARPHRD_LOOPBACK:
+                        continue
+                    total, burst_like, unauthorized = _analyze_frame(frame, length, self.allowed_sources)
+                    if total:
+                        self.counters.add(total, burst_like, unauthorized)
+        except Exception as error:
+            self.exception = error
+
+
+def _pack_address(address: str) -> bytes | None:
+    """Packed IPv4 or IPv6 address as it appears in an IP header, or None if unparseable."""
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            return socket.inet_pton(family, address)
+        except OSError:
+            continue
+    return None
+
+
+def _start_capture(backend: str, interface: str, counters: "LaneCounters") -> AsyncSniffer | RawSocketSniffer:
+    if backend == "raw" or (backend == "auto" and hasattr(socket, "AF_PACKET")):
+        sniffer = RawSocketSniffer(interface, counters)
+        try:
+            sniffer.start()
+        except PermissionError as error:
+            raise PermissionError(
+                "Raw packet capture requires root or CAP_NET_RAW. "
+                "Run with --mode simulate if capture is unavailable."
+            ) from error
+        return sniffer
+    return _start_sniffer(interface, counters)
+
+
+def _raise_if_sniffer_failed(sniffer: AsyncSniffer | RawSocketSniffer) -> None:
+    error = sniffer.exception
+    if error is None:
+        return
+    if isinstance(error, PermissionError):
         raise PermissionError(
             "Packet capture requires elevated privileges/Npcap. "
             "Run with --mode simulate if capture is unavailable."
         ) from error
+    raise error
 
 
-def _extract_protocol_packets(packets: Iterable) -> tuple[int, int]:
+def _analyze_packets(packets: Iterable, allowed_sources: set[str]) -> tuple[int, int, int]:
+    """One pass over a capture: (control-lane packets, burst-like packets, unauthorized attempts)."""
     total = 0
     burst_like = 0
+    unauthorized = 0
 
     for packet in packets:
-        if TCP not in packet:
+        tcp = packet.getlayer(TCP)
+        if tcp is None:
             continue
 
-        destination_port = int(packet[TCP].dport)
-        source_port = int(packet[TCP].sport)
+        destination_port = int(tcp.dport)
+        if destination_port not in PROTOCOL_PORTS and int(tcp.sport) not in PROTOCOL_PORTS:
+            continue
 
-        if destination_port in DEFAULT_PROTOCOL_PORTS or source_port in DEFAULT_PROTOCOL_PORTS:
-            total += 1
-            if destination_port in (502, 1883):
-                burst_like += 1
+        total += 1
+        if destination_port in BURST_PORTS:
+            burst_like += 1
+
+        if destination_port in PROTOCOL_PORTS:
+            ip = packet.getlayer(IP)
+            if ip is None:
+                ip = packet.getlayer(IPv6)
+            if ip is not None and str(ip.src) not in allowed_sources:
+                unauthorized += 1
+
+    return total, burst_like, unauthorized
+
+
+def _analyze_frame(frame: memoryview, length: int, allowed_sources: frozenset[bytes]) -> tuple[int, int, int]:
+    """``_analyze_packets`` for one raw Ethernet frame, decoded with struct instead of scapy.
+
+    Handles IPv4 and IPv6, optionally behind VLAN tags. IPv6 extension headers
+    are not walked, so TCP behind one is skipped. ``allowed_sources`` holds
+    packed addresses (``socket.inet_pton``).
+    """
+    ip_offset = ETH_HEADER_LEN
+    if length < ip_offset:
+        return 0, 0, 0
+    ethertype = frame[12] << 8 | frame[13]
+    while ethertype in VLAN_ETHERTYPES:
+        ip_offset += 4
+        if length < ip_offset:
+            return 0, 0, 0
+        ethertype = frame[ip_offset - 2] << 8 | frame[ip_offset - 1]
+
+    if ethertype == ETH_P_IP:
+        if length < ip_offset + 20 or frame[ip_offset] >> 4 != 4 or frame[ip_offset + 9] != IPPROTO_TCP:
+            return 0, 0, 0
+        # Non-first fragments carry no TCP header.
+        if (frame[ip_offset + 6] & 0x1F) or frame[ip_offset + 7]:
+            return 0, 0, 0
+        source = frame[ip_offset + 12 : ip_offset + 16]
+        tcp_offset = ip_offset + (frame[ip_offset] & 0x0F) * 4
+    elif ethertype == ETH_P_IPV6:
+        if length < ip_offset + 40 or frame[ip_offset] >> 4 != 6 or frame[ip_offset + 6] != IPPROTO_TCP:
+            return 0, 0, 0
+        source = frame[ip_offset + 8 : ip_offset + 24]
+        tcp_offset = ip_offset + 40
+    else:
+        return 0, 0, 0
 
-    return total, burst_like
+    if length < tcp_offset + 4:
+        return 0, 0, 0
 
+    source_port, destination_port = _TCP_PORTS.unpack_from(frame, tcp_offset)
+    if destination_port not in PROTOCOL_PORTS:
+        return (1, 0, 0) if source_port in PROTOCOL_PORTS else (0, 0, 0)
 
-def _count_unauthorized_sources(packets: Iterable, allowed_sources: set[str]) -> int:
-    attempts = 0
-    for packet in packets:
-        if IP not in packet or TCP not in packet:
-            continue
-        if int(packet[TCP].dport) not in DEFAULT_PROTOCOL_PORTS:
-            continue
-        source_ip = str(packet[IP].src)
-        if source_ip not in allowed_sources:
-            attempts += 1
-    return attempts
+    burst_like = 1 if destination_port in BURST_PORTS else 0
+    unauthorized = 0 if bytes(source) in allowed_sources else 1
+    return 1, burst_like, unauthorized
+
+
+class LaneCounters:
+    """Window counters fed packet by packet from the sniffer thread.
+
+    Lock-free: the sniffer only increments the current list and ``snapshot``
+    swaps in a fresh one, so at worst a packet racing the swap is counted in
+    neither window.
+    """
+
+    def __init__(self, allowed_sources: set[str]) -> None:
+        self.allowed_sources = allowed_sources
+        self._counts = [0, 0, 0]
+
+    def observe(self, packet) -> None:
+        total, burst_like, unauthorized = _analyze_packets((packet,), self.allowed_sources)
+        counts = self._counts
+        counts[0] += total
+        counts[1] += burst_like
+        counts[2] += unauthorized
+
+    def add(self, total: int, burst_like: int, unauthorized: int) -> None:
+        counts = self._counts
+        counts[0] += total
+        counts[1] += burst_like
+        counts[2] += unauthorized
+
+    def snapshot(self) -> tuple[int, int, int]:
+        counts, self._counts = self._counts, [0, 0, 0]
+        return counts[0], counts[1], counts[2]
 
 
 def _compute_window_stats(
@@ -183,56 +475,80 @@ def main() -> None:
     }
     history: deque[float] = deque(maxlen=max(args.history_windows, 5))
 
-    sample_index = 0
-    with requests.Session() as session:
-        while True:
-            sample_index += 1
-
-            if args.mode == "simulate":
-                packet_count, burst_count, unauthorized_attempts = _simulate_window(
-                    sample_index,
-                    args.expected_rate,
-                )
-                time.sleep(max(args.window_seconds, 0.1))
-            else:
-                packets = _iter_packets(args.interface, args.window_seconds)
-                packet_count, burst_count = _extract_protocol_packets(packets)
-                unauthorized_attempts = _count_unauthorized_sources(packets, allowed_sources)
-
-            stats = _compute_window_stats(
-                packet_count=packet_count,
-                burst_count=burst_count,
-                unauthorized_attempts=unauthorized_attempts,
-                window_seconds=args.window_seconds,
-                expected_rate=args.expected_rate,
-                burst_threshold=args.burst_threshold,
-                unauthorized_threshold=args.unauthorized_threshold,
-                history=history,
-            )
+    sniffer = None
+    counters = LaneCounters(allowed_sources)
+    if args.mode == "sniff":
+        sniffer = _start_capture(args.capture_backend, args.interface, counters)
+    window_seconds = max(args.window_seconds, 0.2)
+    window_started = time.monotonic()
 
-            _post_security_signal(
+    sample_index = 0
+    try:
+        with requests.Session() as session:
+            batcher = SecuritySignalBatcher(
                 session,
                 api_base_url=args.api_base_url,
                 timeout_seconds=args.timeout_seconds,
-                packet_rate=stats.packet_rate,
-                burst_ratio=stats.burst_ratio,
-                unauthorized_attempts=stats.unauthorized_attempts,
-                security_flag=stats.security_flag,
-                sample_window_seconds=args.window_seconds,
+                batch_size=args.signal_batch_size,
+                flush_seconds=args.signal_flush_seconds,
             )
+            while True:
+                sample_index += 1
+
+                if sniffer is None:
+                    packet_count, burst_count, unauthorized_attempts = _simulate_window(
+                        sample_index,
+                        args.expected_rate,
+                    )
+                    time.sleep(max(args.window_seconds, 0.1))
+                    elapsed_seconds = args.window_seconds
+                else:
+                    # Tick on a fixed schedule; the sniffer keeps capturing between
+                    # ticks, so no traffic falls into a gap between windows.
+                    time.sleep(max(window_started + window_seconds - time.monotonic(), 0.0))
+                    _raise_if_sniffer_failed(sniffer)
+                    now = time.monotonic()
+                    elapsed_seconds = now - window_started
+                    window_started = now
+                    packet_count, burst_count, unauthorized_attempts = counters.snapshot()
+
+                stats = _compute_window_stats(
+                    packet_count=packet_count,
+                    burst_count=burst_count,
+                    unauthorized_attempts=unauthorized_attempts,
+                    window_seconds=elapsed_seconds,
+                    expected_rate=args.expected_rate,
+                    burst_threshold=args.burst_threshold,
+                    unauthorized_threshold=args.unauthorized_threshold,
+                    history=history,
+                )
 
-            print(
-                f"[{sample_index}] rate={stats.packet_rate:.2f} pkt/s | "
-                f"burst={stats.burst_ratio:.2f} | unauthorized={stats.unauthorized_attempts} | "
-                f"security_flag={stats.security_flag}"
-            )
+                batcher.add(
+                    _build_security_payload(
+                        packet_rate=stats.packet_rate,
+                        burst_ratio=stats.burst_ratio,
+                        unauthorized_attempts=stats.unauthorized_attempts,
+                        security_flag=stats.security_flag,
+                        sample_window_seconds=args.window_seconds,
+                    )
+                )
+
+                print(
+                    f"[{sample_index}] rate={stats.packet_rate:.2f} pkt/s | "
+                    f"burst={stats.burst_ratio:.2f} | unauthorized={stats.unauthorized_attempts} | "
+                    f"security_flag={stats.security_flag}"
+                )
 
-            if args.max_samples > 0 and sample_index >= args.max_samples:
-                break
+                if args.max_samples > 0 and sample_index >= args.max_samples:
+                    break
 
-            if not args.loop and args.max_samples <= 0:
-                break
+                if not args.loop and args.max_samples <= 0:
+                    break
 
+            batcher.flush()
+    finally:
+        if sniffer is not None and sniffer.running and sniffer.exception is None:
+            sniffer.stop()
 
 if __name__ == "__main__":
     main()
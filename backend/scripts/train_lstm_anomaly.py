@@ -29,6 +29,7 @@ from app.ml.lstm_autoencoder import (
     save_lstm_artifact,
     train_lstm_autoencoder,
     create_sequences,
+    export_lstm_onnx,
     FeatureScaler,
     LSTMAutoencoder,
 )
@@ -62,7 +63,7 @@ def evaluate_model(artifact: dict, attack_types: list[str]) -> dict[str, dict]:
         sequences = create_sequences(scaled, seq_len)
         tensor = torch.from_numpy(sequences).to(dev)
 
-        with torch.no_grad():
+        with torch.inference_mode():
             recon = model(tensor)
             errors = torch.mean((recon - tensor) ** 2, dim=(1, 2)).cpu().numpy()
 
@@ -94,6 +95,16 @@ def main():
     parser.add_argument("--latent-dim", type=int, default=16, help="Latent space dimension")
     parser.add_argument("--batch-size", type=int, default=64, help="Batch size")
     parser.add_argument("--lr", type=float, default=1e-3, help="Learning rate")
+    parser.add_argument(
+        "--export-onnx",
+        action="store_true",
+        help="Also write <output>.onnx for ONNX Runtime inference (needs onnx)",
+    )
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="Calibrate a threshold for int8-quantized CPU serving (LSTM_QUANTIZE_INT8)",
+    )
     args = parser.parse_args()
 
     print("=" * 60)
@@ -121,6 +132,7 @@ def main():
         batch_size=args.batch_size,
         learning_rate=args.lr,
         verbose=True,
+        calibrate_int8=args.int8,
     )
 
     # 3. Evaluate on attack types
@@ -158,7 +170,7 @@ def main():
     )
     model_eval.load_state_dict(artifact["state_dict"])
     model_eval.eval()
-    with torch.no_grad():
+    with torch.inference_mode():
         recon = model_eval(tensor)
         errors = torch.mean((recon - tensor) ** 2, dim=(1, 2)).cpu().numpy()
     fp_rate = (errors >= metadata["threshold"]).sum() / len(errors) * 100
@@ -176,6 +188,10 @@ def main():
     save_lstm_artifact(artifact, args.output)
     file_size = Path(args.output).stat().st_size / 1024
     print(f"       Saved ({file_size:.0f} KB)")
+    if args.export_onnx:
+        onnx_path = Path(args.output).with_suffix(".onnx")
+        export_lstm_onnx(artifact, str(onnx_path))
+        print(f"       ONNX export: {onnx_path}")
 
     print(f"\n{'=' * 60}")
     print(f"Training complete!")
@@ -60,6 +60,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--learning-rate", type=float, default=1e-3)
     parser.add_argument("--image-size", type=int, default=128)
     parser.add_argument("--device", default="auto")
+    parser.add_argument(
+        "--precision",
+        choices=["fp32", "fp16"],
+        default="fp32",
+        help="Weight precision stored in the artifact (fp16 halves its size)",
+    )
 
     return parser.parse_args()
 
@@ -89,6 +95,7 @@ def main() -> None:
             learning_rate=args.learning_rate,
             threshold_quantile=args.threshold_quantile,
             device=args.device,
+            precision=args.precision,
         )
         save_torch_artifact(artifact, artifact_path)
     else:
@@ -18,7 +18,14 @@ def _reset_state():
 
 @pytest.fixture()
 def client():
-    """FastAPI TestClient with DB init mocked out (no PostgreSQL required)."""
-    with patch("app.main.init_db"):
+    """FastAPI TestClient with DB init and pool mocked out (no PostgreSQL required).
+
+    The /metrics body cache is disabled so every scrape reflects the test's own requests.
+    """
+    with (
+        patch("app.main.init_db"),
+        patch("app.main.open_db_pool", return_value=None),
+        patch("app.main.METRICS_CACHE_SECONDS", 0),
+    ):
         with TestClient(app, raise_server_exceptions=False) as c:
             yield c
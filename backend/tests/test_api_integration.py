@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from datetime import datetime, timezone
 from unittest.mock import patch
 
+from app.main import EventRow
+
 
 def test_health_endpoint_without_db(client) -> None:
     """Health endpoint should return a response even if DB is unavailable."""
@@ -24,6 +28,8 @@ def test_metrics_endpoint_returns_prometheus_format(client) -> None:
     assert "analyzer_security_signals_ingested" in text
     assert "analyzer_vision_signal_fresh" in text
     assert "analyzer_security_signal_fresh" in text
+    assert "analyzer_persist_queue_depth 0" in text
+    assert "analyzer_persist_retry_rows 0" in text
 
 
 def test_metrics_counters_increment_after_signals(client) -> None:
@@ -100,6 +106,25 @@ def test_signals_security_ingest_and_read(client) -> None:
     assert security["source"] == "pytest-security"
 
 
+def test_signals_security_batch_keeps_latest_window(client) -> None:
+    ts = datetime.now(timezone.utc).isoformat()
+    windows = [
+        {"timestamp": ts, "packet_rate": 128.0, "security_flag": False, "source": "pytest-batch"},
+        {"timestamp": ts, "packet_rate": 251.0, "security_flag": True, "source": "pytest-batch"},
+    ]
+
+    post_resp = client.post("/signals/security/batch", json=windows)
+    assert post_resp.status_code == 200
+    assert post_resp.json()["ingested"] == 2
+
+    security = client.get("/signals").json()["security"]
+    assert security["packet_rate"] == 251.0
+    assert security["security_flag"] is True
+    assert "analyzer_security_signals_ingested 2" in client.get("/metrics").text
+
+    assert client.post("/signals/security/batch", json=[]).status_code == 422
+
+
 def test_analyze_returns_full_response_shape(client) -> None:
     with patch("app.main.persist_analysis"):
         response = client.post("/analyze", json={
@@ -132,6 +157,8 @@ def test_analyze_returns_full_response_shape(client) -> None:
     assert expected_keys.issubset(body.keys())
     assert isinstance(body["reasons"], list)
     assert body["risk_level"] in {"low", "medium", "high", "critical"}
+    assert body["scan_time_ms"] == 100.0
+    assert body["process_score"] == round(body["process_score"], 2)
 
 
 def test_analyze_with_vision_signal_triggers_anomaly(client) -> None:
@@ -156,6 +183,15 @@ def test_analyze_with_vision_signal_triggers_anomaly(client) -> None:
     assert body["process_source"] == "payload-vision-signal"
 
 
+def test_analyze_rejects_invalid_body_with_422(client) -> None:
+    with patch("app.main.persist_analysis"):
+        response = client.post("/analyze", json={"scan_time_ms": -5})
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail[0]["loc"] == ["body", "scan_time_ms"]
+
+
 def test_analyze_increments_metrics_counters(client) -> None:
     with patch("app.main.persist_analysis"):
         for _ in range(2):
@@ -183,8 +219,9 @@ def test_signals_endpoint_returns_null_when_no_signals(client) -> None:
 
 
 def test_events_endpoint_returns_list(client) -> None:
-    fake_events = [
-        {
+    fake_document = json.dumps({
+        "count": 1,
+        "events": [{
             "id": 1,
             "created_at": "2025-01-01T00:00:00+00:00",
             "process_score": 42.0,
@@ -194,9 +231,9 @@ def test_events_endpoint_returns_list(client) -> None:
             "model_confidence": 88.0,
             "risk_level": "medium",
             "reasons": ["drift detected"],
-        },
-    ]
-    with patch("app.main._fetch_events", return_value=fake_events):
+        }],
+    })
+    with patch("app.main._fetch_events_document", return_value=fake_document):
         response = client.get("/events?limit=5")
 
     assert response.status_code == 200
@@ -209,6 +246,20 @@ def test_events_endpoint_returns_list(client) -> None:
     assert body["events"][0]["process_anomaly"] is True
 
 
+def test_events_ndjson_streams_one_event_per_line(client) -> None:
+    async def fake_iter_events(limit, *, ascending=False, after_id=None, before_id=None):
+        for event_id in (3, 2):
+            yield EventRow.model_construct(id=event_id, risk_level="low")
+
+    with patch("app.main._iter_events", fake_iter_events):
+        response = client.get("/events/ndjson?limit=2")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [3, 2]
+
+
 def test_metrics_shows_vision_gauge_after_signal(client) -> None:
     client.post("/signals/vision", json={
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -223,3 +274,56 @@ def test_metrics_shows_vision_gauge_after_signal(client) -> None:
     text = response.text
     assert "analyzer_vision_anomaly_score 73.50" in text
     assert "analyzer_vision_signal_fresh 1" in text
+
+
+def test_metrics_serves_cached_body_between_refreshes(client) -> None:
+    from app import main
+
+    main._METRICS_BODY_SLOT[0] = b"analyzer_analyses_total 7\n"
+    with patch("app.main.METRICS_CACHE_SECONDS", 0.25):
+        cached = client.get("/metrics")
+    live = client.get("/metrics")
+
+    assert cached.text == "analyzer_analyses_total 7\n"
+    assert "analyzer_analyses_total 0" in live.text
+
+
+def test_events_stream_frames_rows_as_server_sent_events() -> None:
+    from app.main import events_stream
+
+    rows = [(4, '{"id": 4}'), (5, '{"id": 5}')]
+
+    async def fake_fetch_event_json(limit, *, ascending=False, after_id=None):
+        if after_id:
+            raise RuntimeError("db unavailable")
+        return rows
+
+    async def first_frames(count: int) -> list[str]:
+        response = await events_stream(limit=10, poll_interval_seconds=0.2)
+        frames = []
+        async for event in response.body_iterator:
+            frames.append(event.encode().decode())
+            if len(frames) == count:
+                break
+        await response.body_iterator.aclose()
+        return frames
+
+    with patch("app.main._fetch_event_json", side_effect=fake_fetch_event_json):
+        frames = asyncio.run(first_frames(4))
+
+    assert frames[0].startswith("retry: 1500")
+    assert frames[1] == 'id: 4\r\ndata: {"id": 4}\r\n\r\n'
+    assert frames[2].startswith("id: 5")
+    assert frames[3].startswith("event: error")
+
+
+def test_anomaly_buffer_starts_empty_for_each_test(client) -> None:
+    first = client.post("/anomaly/ingest", json={"production_rate": 12.0})
+    assert first.json()["buffer_size"] == 1
+
+    from app.main import reset_runtime_state_for_tests
+
+    reset_runtime_state_for_tests()
+    status = client.get("/anomaly/status").json()
+    assert status["buffer_size"] == 0
+    assert status["last_score"] == 0.0
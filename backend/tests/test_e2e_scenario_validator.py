@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 import sys
 
@@ -73,3 +74,44 @@ def test_evaluate_result_marks_failure_and_notes() -> None:
 
     assert result.passed is False
     assert len(result.notes) == 3
+
+
+def test_build_session_mounts_pooled_retrying_adapter() -> None:
+    with validator._build_session("http://localhost:8001/") as session:
+        adapter = session.get_adapter("http://localhost:8001/analyze")
+        signals = session.get_adapter("http://localhost:8001/signals/vision")
+
+        assert adapter is session.get_adapter("https://example.invalid/")
+        assert adapter._pool_maxsize == 16
+        assert adapter.max_retries.total == 2
+        assert 503 in adapter.max_retries.status_forcelist
+        assert "POST" not in adapter.max_retries.allowed_methods
+        assert signals is not adapter
+        assert "POST" in signals.max_retries.allowed_methods
+
+
+def test_post_scenario_signals_sends_both_signals() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+    from unittest.mock import MagicMock
+
+    session = MagicMock()
+    scenario = validator._scenario_definitions()[1]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        validator._post_scenario_signals(
+            session,
+            executor,
+            scenario,
+            base_url="http://analyzer:8001/",
+            timeout_seconds=1.0,
+            timestamp="2026-01-01T00:00:00+00:00",
+        )
+
+    urls = sorted(call.args[0] for call in session.post.call_args_list)
+    assert urls == ["http://analyzer:8001/signals/security", "http://analyzer:8001/signals/vision"]
+    assert session.post.return_value.raise_for_status.call_count == 2
+    bodies = [json.loads(call.kwargs["data"]) for call in session.post.call_args_list]
+    assert all(call.kwargs["headers"]["Content-Type"] == "application/json" for call in session.post.call_args_list)
+    assert {body["timestamp"] for body in bodies} == {
+        "2026-01-01T00:00:00+00:00"
+    }
@@ -1,8 +1,32 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.main import _parse_event_row
+import pytest
+
+from app.main import (
+    ANALYSIS_EVENT_MIGRATIONS,
+    AnalysisEventNotifier,
+    AnalysisEventWriter,
+    CsvEventLog,
+    CsvLogWriter,
+    QueuedBatchWriter,
+    TelemetryPayload,
+    _connection_kwargs,
+    _db_pool_stats,
+    _events_query,
+    _fetch_events_document,
+    _parse_event_row,
+    analyze_payload,
+    app,
+    init_db,
+    persist_analysis,
+)
 
 
 def test_parse_event_row_maps_columns() -> None:
@@ -29,7 +53,7 @@ def test_parse_event_row_maps_columns() -> None:
         "external-security-signal",
     )
 
-    parsed = _parse_event_row(row)
+    parsed = _parse_event_row(row).model_dump()
 
     assert parsed["id"] == 42
     assert parsed["created_at"] == "2026-01-01T12:00:00+00:00"
@@ -43,3 +67,237 @@ def test_parse_event_row_maps_columns() -> None:
     assert parsed["reasons"] == ["reason-a", "reason-b"]
     assert parsed["process_source"] == "external-vision-signal"
     assert parsed["network_source"] == "external-security-signal"
+
+
+def test_event_writer_batches_rows_and_retries_failed_flush() -> None:
+    copy_rows = AsyncMock(side_effect=[RuntimeError("db down"), None])
+
+    async def scenario() -> None:
+        writer = AnalysisEventWriter(batch_size=10, flush_interval=0)
+        for index in range(3):
+            await writer.submit((index,))
+        await writer._flush(writer._drain(10))
+        assert list(writer.retry_buffer) == [(0,), (1,), (2,)]
+
+        await writer.submit((3,))
+        await writer.stop()
+        assert not writer.retry_buffer
+
+    with patch("app.main._copy_analysis_rows", copy_rows):
+        asyncio.run(scenario())
+
+    assert copy_rows.await_count == 2
+    assert copy_rows.await_args_list[1].args[0] == [(0,), (1,), (2,), (3,)]
+
+
+def test_csv_event_log_writes_header_once_across_reopens(tmp_path) -> None:
+    log_path = tmp_path / "logs" / "analysis_events.csv"
+
+    first = CsvEventLog(str(log_path))
+    first.write_rows([("2026-01-01T00:00:00+00:00", 12.5)])
+    first.close()
+
+    second = CsvEventLog(str(log_path))
+    second.write_rows([("2026-01-01T00:00:01+00:00", 14.0)])
+    second.close()
+
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("created_at,process_score")
+    assert lines[1:] == ["2026-01-01T00:00:00+00:00,12.5", "2026-01-01T00:00:01+00:00,14.0"]
+
+
+def test_csv_log_writer_drops_oldest_row_when_queue_is_full(tmp_path) -> None:
+    log_path = tmp_path / "analysis_events.csv"
+
+    async def scenario() -> CsvLogWriter:
+        writer = CsvLogWriter(CsvEventLog(str(log_path)), batch_size=10, flush_interval=0, queue_size=2)
+        for index in range(3):
+            writer.submit((f"row-{index}",))
+        await writer.stop()
+        writer.event_log.close()
+        return writer
+
+    writer = asyncio.run(scenario())
+
+    assert writer.dropped_rows == 1
+    assert log_path.read_text(encoding="utf-8").splitlines()[1:] == ["row-1", "row-2"]
+
+
+def test_csv_log_writer_stop_waits_for_in_flight_write() -> None:
+    class SlowLog:
+        path = "slow.csv"
+
+        def __init__(self) -> None:
+            self.rows: list[tuple] = []
+            self.active = 0
+            self.overlapped = False
+            self.lock = threading.Lock()
+
+        def write_rows(self, rows: list[tuple]) -> None:
+            with self.lock:
+                self.active += 1
+                self.overlapped |= self.active > 1
+            time.sleep(0.05)
+            self.rows.extend(rows)
+            with self.lock:
+                self.active -= 1
+
+    event_log = SlowLog()
+
+    async def scenario() -> None:
+        writer = CsvLogWriter(event_log, batch_size=1, flush_interval=0, queue_size=8)
+        writer.start()
+        writer.submit(("row-0",))
+        writer.submit(("row-1",))
+        await asyncio.sleep(0.01)
+        await writer.stop()
+
+    asyncio.run(scenario())
+
+    assert not event_log.overlapped
+    assert event_log.rows == [("row-0",), ("row-1",)]
+
+
+def test_queued_batch_writer_requires_flush_implementation() -> None:
+    with pytest.raises(TypeError):
+        QueuedBatchWriter(batch_size=1, flush_interval=0, queue_size=1)
+
+
+def _fake_db_connection(cursor: MagicMock):
+    @asynccontextmanager
+    async def cursor_context(*args, **kwargs):
+        yield cursor
+
+    connection = MagicMock()
+    connection.cursor = cursor_context
+
+    @asynccontextmanager
+    async def db_connection():
+        yield connection
+
+    return db_connection
+
+
+def test_init_db_only_alters_missing_columns_and_indexes() -> None:
+    present = [column for column in ANALYSIS_EVENT_MIGRATIONS if column not in {"risk_level", "scan_time_ms"}]
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.fetchall = AsyncMock(
+        side_effect=[[(column,) for column in present], [("analysis_events_created_at_idx",)]]
+    )
+
+    with patch("app.main.db_connection", _fake_db_connection(cursor)):
+        asyncio.run(init_db())
+
+    statements = [call.args[0] for call in cursor.execute.await_args_list]
+    alters = [statement for statement in statements if statement.startswith("ALTER TABLE")]
+    assert alters == [
+        "ALTER TABLE analysis_events "
+        "ADD COLUMN IF NOT EXISTS risk_level TEXT NOT NULL DEFAULT 'low', "
+        "ADD COLUMN IF NOT EXISTS scan_time_ms DOUBLE PRECISION NOT NULL DEFAULT 0"
+    ]
+    index_builds = [statement for statement in statements if statement.startswith("CREATE INDEX")]
+    assert len(index_builds) == 1
+    assert "analysis_events_risk_idx" in index_builds[0]
+
+
+def test_db_pool_stats_reports_pool_usage() -> None:
+    pool = MagicMock()
+    pool.get_stats.return_value = {"pool_size": 4, "pool_available": 3, "requests_num": 17}
+
+    with patch.object(app.state, "db_pool", pool, create=True):
+        stats = _db_pool_stats()
+
+    assert stats == {"pool_size": 4, "pool_available": 3, "requests_waiting": 0}
+
+
+def test_fetch_events_document_aggregates_rows_in_postgres() -> None:
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.fetchone = AsyncMock(return_value=('{"count": 0, "events": []}',))
+
+    with patch("app.main.db_connection", _fake_db_connection(cursor)):
+        document = asyncio.run(_fetch_events_document(500))
+
+    query, params = cursor.execute.await_args.args
+    assert "json_agg(event ORDER BY event.id DESC)" in query
+    assert params == (200,)
+    assert document == '{"count": 0, "events": []}'
+
+
+def test_event_notifier_wakes_waiters_only_for_newer_ids() -> None:
+    async def scenario() -> tuple[bool, bool, bool]:
+        notifier = AnalysisEventNotifier()
+        timed_out = await notifier.wait(0, timeout=0.01)
+
+        waiter = asyncio.create_task(notifier.wait(5, timeout=1))
+        await asyncio.sleep(0)
+        notifier.publish(6)
+        woke = await waiter
+
+        already_newer = await notifier.wait(5, timeout=0)
+        return timed_out, woke, already_newer
+
+    assert asyncio.run(scenario()) == (False, True, True)
+
+
+def test_persist_analysis_encodes_shared_json_columns_once() -> None:
+    payload = TelemetryPayload(production_rate=12, scan_time_ms=100)
+    result = analyze_payload(payload)
+    event_writer = MagicMock()
+    event_writer.submit = AsyncMock()
+    csv_writer = MagicMock()
+
+    with (
+        patch.object(app.state, "event_writer", event_writer, create=True),
+        patch.object(app.state, "csv_writer", csv_writer, create=True),
+        patch("app.main.ENABLE_CSV_LOGGING", True),
+    ):
+        asyncio.run(persist_analysis(payload, result))
+
+    db_row = event_writer.submit.await_args.args[0]
+    csv_row = csv_writer.submit.call_args.args[0]
+    assert db_row[0] is csv_row[-1]
+    assert db_row[11] is csv_row[-2]
+
+
+def test_events_query_pages_by_primary_key() -> None:
+    query, params = _events_query(50, before_id=120)
+    assert "WHERE id < %s" in query
+    assert "ORDER BY id DESC" in query
+    assert params == (120, 50)
+
+    query, params = _events_query(10, ascending=True, after_id=-3, before_id=90)
+    assert "WHERE id > %s AND id < %s" in query
+    assert params == (0, 90, 10)
+
+
+def test_connection_kwargs_prepare_hot_queries_unless_disabled() -> None:
+    with patch("app.main.DB_PREPARE_THRESHOLD", 1):
+        assert _connection_kwargs() == {"autocommit": True, "prepare_threshold": 1}
+    with patch("app.main.DB_PREPARE_THRESHOLD", -1):
+        assert _connection_kwargs()["prepare_threshold"] is None
+
+
+def test_events_query_reuses_one_text_per_shape() -> None:
+    first, _ = _events_query(10, after_id=3)
+    second, _ = _events_query(150, after_id=99)
+    assert first is second
+
+
+def test_event_writer_stop_keeps_rows_held_by_the_running_task() -> None:
+    copy_rows = AsyncMock()
+
+    async def scenario() -> None:
+        writer = AnalysisEventWriter(batch_size=10, flush_interval=0.05)
+        writer.start()
+        for index in range(3):
+            await writer.submit((index,))
+        await asyncio.sleep(0.01)
+        await writer.stop()
+
+    with patch("app.main._copy_analysis_rows", copy_rows):
+        asyncio.run(scenario())
+
+    flushed = [row for call in copy_rows.await_args_list for row in call.args[0]]
+    assert flushed == [(0,), (1,), (2,)]
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import torch
+
+from app.ml.lstm_autoencoder import (
+    FEATURE_NAMES,
+    N_FEATURES,
+    AnomalyDetector,
+    FeatureScaler,
+    LSTMAutoencoder,
+    OnnxLSTMRunner,
+    TelemetryRing,
+    _reconstruction_errors,
+    create_sequences,
+    export_lstm_onnx,
+    generate_attack_data,
+    generate_normal_data,
+    load_lstm_artifact,
+    save_lstm_artifact,
+    telemetry_to_vector,
+    train_lstm_autoencoder,
+)
+
+
+def test_generate_normal_data_is_seeded_and_within_ranges() -> None:
+    data = generate_normal_data(n_samples=2000, seed=7)
+
+    assert data.shape == (2000, N_FEATURES)
+    assert data.dtype == np.float32
+    np.testing.assert_array_equal(data, generate_normal_data(n_samples=2000, seed=7))
+    assert (data[:, 0] == 1.0).all()
+    assert data[:, 1].min() >= 2 and data[:, 1].max() <= 15
+    assert set(np.unique(data[:, 4])) <= {0.0, 1.0}
+    assert (data[:, 7] == 0.0).all()
+    assert 120 < data[:, 9].mean() < 140
+
+
+def test_telemetry_to_vector_follows_feature_order_with_defaults() -> None:
+    vector = telemetry_to_vector({"conveyor_running": True, "scan_time_ms": 12.5, "io_output_sum": 3})
+
+    assert vector.dtype == np.float32
+    assert vector.shape == (N_FEATURES,)
+    assert vector[FEATURE_NAMES.index("conveyor_running")] == 1.0
+    assert vector[FEATURE_NAMES.index("scan_time_ms")] == 12.5
+    assert vector[FEATURE_NAMES.index("io_output_sum")] == 3.0
+    assert vector[FEATURE_NAMES.index("production_rate")] == 0.0
+
+
+def test_telemetry_ring_returns_latest_rows_oldest_first() -> None:
+    ring = TelemetryRing(4, width=1)
+    for value in range(6):
+        ring.append(np.array([value], dtype=np.float32))
+
+    assert len(ring) == 4
+    np.testing.assert_array_equal(ring.latest(3)[:, 0], [3.0, 4.0, 5.0])
+    np.testing.assert_array_equal(ring.latest(10)[:, 0], [2.0, 3.0, 4.0, 5.0])
+
+    ring.clear()
+    assert len(ring) == 0
+
+
+def _untrained_detector(seq_len: int = 8) -> AnomalyDetector:
+    normal = generate_normal_data(n_samples=200, seed=3)
+    model = LSTMAutoencoder(hidden_dim=16, latent_dim=4, seq_len=seq_len, n_layers=2)
+    model.eval()
+    detector = AnomalyDetector()
+    detector.loaded = {
+        "model": model,
+        "scaler": FeatureScaler().fit(normal),
+        "metadata": {"threshold": 0.05, "score_scale": 0.125, "seq_len": seq_len},
+        "device": torch.device("cpu"),
+    }
+    detector.seq_len = seq_len
+    detector.buffer = TelemetryRing(seq_len * 2)
+    return detector
+
+
+def test_anomaly_detector_scores_once_the_window_is_full() -> None:
+    detector = _untrained_detector()
+    payload = {name: 1.0 for name in FEATURE_NAMES}
+
+    for _ in range(7):
+        detector.ingest(payload)
+    assert detector.score()["model_version"] == "not_loaded"
+
+    detector.ingest(payload)
+    result = detector.score()
+
+    assert 0.0 <= result["anomaly_score"] <= 100.0
+    assert set(result["feature_errors"]) == set(FEATURE_NAMES)
+    assert detector.score_history[-1] == detector.last_score
+
+
+def test_anomaly_detector_ingest_from_many_threads_keeps_every_sample() -> None:
+    detector = _untrained_detector()
+    detector.buffer = TelemetryRing(1000)
+    first = FEATURE_NAMES[0]
+
+    def feed(worker: int) -> None:
+        for index in range(50):
+            detector.ingest({first: worker * 50 + index})
+            detector.score()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(feed, range(8)))
+
+    assert len(detector.buffer) == 400
+    assert sorted(detector.buffer.latest(400)[:, 0].tolist()) == list(range(400))
+
+
+def test_feature_scaler_transform_matches_min_max_formula_and_reuses_buffer() -> None:
+    data = generate_normal_data(n_samples=300, seed=11)
+    scaler = FeatureScaler.from_dict(FeatureScaler().fit(data).to_dict())
+    out = np.empty_like(data)
+
+    scaled = scaler.transform(data, out=out)
+
+    assert scaled is out
+    expected = (data - scaler.min_vals) / (scaler.max_vals - scaler.min_vals)
+    np.testing.assert_allclose(scaled, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_create_sequences_matches_explicit_windows() -> None:
+    data = np.arange(40, dtype=np.float64).reshape(10, 4)
+
+    sequences = create_sequences(data, seq_len=3)
+
+    assert sequences.shape == (8, 3, 4)
+    assert sequences.dtype == np.float32
+    assert sequences.flags.c_contiguous
+    np.testing.assert_array_equal(sequences[5], data[5:8])
+    assert create_sequences(data[:2], seq_len=3).shape == (0, 3, 4)
+
+
+def test_load_lstm_artifact_scripts_model_without_changing_outputs(tmp_path) -> None:
+    model = LSTMAutoencoder(hidden_dim=16, latent_dim=4, seq_len=8, n_layers=2).eval()
+    artifact = {
+        "type": "lstm_autoencoder",
+        "state_dict": model.state_dict(),
+        "scaler": FeatureScaler().to_dict(),
+        "metadata": {
+            "n_features": N_FEATURES,
+            "hidden_dim": 16,
+            "latent_dim": 4,
+            "seq_len": 8,
+            "n_layers": 2,
+        },
+    }
+    path = tmp_path / "lstm.pt"
+    save_lstm_artifact(artifact, str(path))
+
+    loaded = load_lstm_artifact(str(path), device="cpu")
+    window = torch.rand(1, 8, N_FEATURES)
+
+    assert isinstance(loaded["model"], torch.jit.ScriptModule)
+    with torch.no_grad():
+        torch.testing.assert_close(loaded["model"](window), model(window))
+
+
+def test_score_batch_runs_every_k_ticks_and_matches_single_window_scores() -> None:
+    batched = _untrained_detector()
+    single = _untrained_detector()
+    single.loaded["model"] = batched.loaded["model"]
+    rows = generate_normal_data(n_samples=12, seed=5)
+
+    results = []
+    for row in rows:
+        payload = dict(zip(FEATURE_NAMES, row.tolist()))
+        batched.ingest(payload)
+        single.ingest(payload)
+        results.append(batched.score_batch(4))
+        if len(single.buffer) >= single.seq_len:
+            single.score()
+
+    assert results[8] is results[10]
+    assert results[11] is not results[10]
+    np.testing.assert_allclose(list(batched.score_history), list(single.score_history), rtol=1e-4, atol=1e-4)
+    assert results[11]["anomaly_score"] == round(single.last_score, 2)
+
+
+def test_anomaly_detector_load_resets_cached_result_and_scratch_buffers(tmp_path) -> None:
+    detector = _untrained_detector()
+    payload = {name: 1.0 for name in FEATURE_NAMES}
+    for _ in range(10):
+        detector.ingest(payload)
+    detector.score_batch(2)
+    detector.ingest(payload)
+    assert detector._last_result is not None and detector._scaled is not None
+
+    model = LSTMAutoencoder(hidden_dim=16, latent_dim=4, seq_len=4, n_layers=2).eval()
+    path = tmp_path / "lstm.pt"
+    save_lstm_artifact(
+        {
+            "type": "lstm_autoencoder",
+            "state_dict": model.state_dict(),
+            "scaler": FeatureScaler().fit(generate_normal_data(n_samples=50, seed=1)).to_dict(),
+            "metadata": {
+                "n_features": N_FEATURES,
+                "hidden_dim": 16,
+                "latent_dim": 4,
+                "seq_len": 4,
+                "n_layers": 2,
+                "threshold": 0.05,
+                "score_scale": 0.125,
+            },
+        },
+        str(path),
+    )
+
+    assert detector.load(str(path), device="cpu")
+    assert detector.pending == 0
+    assert detector._last_result is None and detector._scaled is None
+
+    for _ in range(5):
+        detector.ingest(payload)
+    result = detector.score_batch(2)
+    assert result["buffer_fill"] == 1.0
+    assert len(detector.score_history) > 0
+
+
+def test_estimate_attack_type_reads_errors_by_feature_position() -> None:
+    detector = AnomalyDetector()
+    errors = np.zeros(N_FEATURES)
+    errors[FEATURE_NAMES.index("network_packet_rate")] = 0.4
+    errors[FEATURE_NAMES.index("scan_time_ms")] = 0.1
+
+    probs = detector._estimate_attack_type(errors, anomaly_score=60.0)
+
+    assert next(iter(probs)) == "dos_flood"
+    assert abs(sum(probs.values()) - 1.0) < 1e-2
+    assert detector._estimate_attack_type(errors, anomaly_score=10.0) == {}
+
+
+def test_load_lstm_artifact_prefers_onnx_export_on_cpu(tmp_path) -> None:
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    model = LSTMAutoencoder(hidden_dim=16, latent_dim=4, seq_len=8, n_layers=2).eval()
+    artifact = {
+        "type": "lstm_autoencoder",
+        "state_dict": model.state_dict(),
+        "scaler": FeatureScaler().to_dict(),
+        "metadata": {"n_features": N_FEATURES, "hidden_dim": 16, "latent_dim": 4, "seq_len": 8, "n_layers": 2},
+    }
+    path = tmp_path / "lstm.pt"
+    save_lstm_artifact(artifact, str(path))
+    export_lstm_onnx(artifact, str(path.with_suffix(".onnx")))
+
+    loaded = load_lstm_artifact(str(path), device="cpu")
+    windows = torch.rand(3, 8, N_FEATURES)
+
+    assert isinstance(loaded["model"], OnnxLSTMRunner)
+    with torch.no_grad():
+        torch.testing.assert_close(loaded["model"](windows), model(windows), rtol=1e-4, atol=1e-5)
+
+
+def test_load_lstm_artifact_quantizes_on_cpu_with_int8_threshold(tmp_path) -> None:
+    model = LSTMAutoencoder(hidden_dim=16, latent_dim=4, seq_len=8, n_layers=2).eval()
+    artifact = {
+        "type": "lstm_autoencoder",
+        "state_dict": model.state_dict(),
+        "scaler": FeatureScaler().to_dict(),
+        "metadata": {
+            "n_features": N_FEATURES,
+            "hidden_dim": 16,
+            "latent_dim": 4,
+            "seq_len": 8,
+            "n_layers": 2,
+            "threshold": 0.02,
+            "threshold_int8": 0.021,
+        },
+    }
+    path = tmp_path / "lstm.pt"
+    save_lstm_artifact(artifact, str(path))
+
+    loaded = load_lstm_artifact(str(path), device="cpu", optimize=False, quantize=True)
+    window = torch.rand(2, 8, N_FEATURES)
+
+    assert loaded["metadata"]["threshold"] == 0.021
+    with torch.no_grad():
+        torch.testing.assert_close(loaded["model"](window), model(window), rtol=0.0, atol=0.05)
+
+
+def test_train_lstm_autoencoder_calibrates_int8_threshold_only_on_request() -> None:
+    normal = generate_normal_data(n_samples=80, seed=2)
+    kwargs = dict(seq_len=8, hidden_dim=8, latent_dim=4, epochs=1, batch_size=32, device="cpu", verbose=False)
+
+    plain = train_lstm_autoencoder(normal, **kwargs)
+    calibrated = train_lstm_autoencoder(normal, calibrate_int8=True, **kwargs)
+
+    assert "threshold_int8" not in plain["metadata"]
+    assert calibrated["metadata"]["threshold_int8"] > 0
+
+
+def test_reconstruction_errors_fill_one_slot_per_window() -> None:
+    model = LSTMAutoencoder(hidden_dim=16, latent_dim=4, seq_len=8, n_layers=2).eval()
+    windows = torch.rand(7, 8, N_FEATURES)
+    loader = torch.utils.data.DataLoader(torch.utils.data.TensorDataset(windows), batch_size=3)
+
+    errors = _reconstruction_errors(model, loader, torch.device("cpu"))
+
+    assert errors.shape == (7,)
+    assert errors.dtype == np.float32
+    with torch.no_grad():
+        expected = torch.mean((model(windows) - windows) ** 2, dim=(1, 2)).numpy()
+    np.testing.assert_allclose(errors, expected, rtol=1e-5)
+
+
+def test_replay_attack_repeats_the_first_ten_samples() -> None:
+    replay = generate_attack_data(n_samples=35, attack_type="replay", seed=4)
+
+    assert replay.shape == (35, N_FEATURES)
+    np.testing.assert_array_equal(replay[10:20], replay[:10])
+    np.testing.assert_array_equal(replay[30:], replay[:5])
+    np.testing.assert_array_equal(generate_attack_data(n_samples=35, attack_type="replay", seed=4), replay)
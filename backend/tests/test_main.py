@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
+
 from app.main import (
+    FALLBACK_MODEL,
+    OnlineAnomalyModel,
+    RollingWindow,
     SecuritySignalPayload,
+    ShardedCounters,
     TelemetryPayload,
     VisionSignalPayload,
+    _parse_iso_timestamp,
     analyze_payload,
     ingest_security_signal,
     ingest_vision_signal,
@@ -51,7 +60,7 @@ def test_payload_vision_signal_triggers_process_anomaly() -> None:
 def test_external_security_signal_triggers_network_alert() -> None:
     reset_runtime_state_for_tests()
 
-    ingest_security_signal(
+    asyncio.run(ingest_security_signal(
         SecuritySignalPayload(
             timestamp=datetime.now(timezone.utc).isoformat(),
             packet_rate=260,
@@ -61,7 +70,7 @@ def test_external_security_signal_triggers_network_alert() -> None:
             source="pytest-security-monitor",
             sample_window_seconds=1,
         )
-    )
+    ))
 
     result = analyze_payload(_base_payload())
 
@@ -74,7 +83,7 @@ def test_stale_vision_signal_is_ignored() -> None:
     reset_runtime_state_for_tests()
 
     stale_timestamp = (datetime.now(timezone.utc) - timedelta(seconds=60)).isoformat()
-    ingest_vision_signal(
+    asyncio.run(ingest_vision_signal(
         VisionSignalPayload(
             timestamp=stale_timestamp,
             anomaly_score=100,
@@ -83,7 +92,7 @@ def test_stale_vision_signal_is_ignored() -> None:
             inference_ms=12,
             source="pytest-vision",
         )
-    )
+    ))
 
     result = analyze_payload(_base_payload())
 
@@ -98,3 +107,127 @@ def test_fallback_lane_available_without_external_signals() -> None:
 
     assert result.process_source in {"fallback-telemetry-drift", "no-vision-signal"}
     assert result.process_score >= 0
+
+
+def test_rolling_window_matches_full_recompute_after_eviction() -> None:
+    window = RollingWindow(maxlen=5, width=2)
+    samples = [(3.0, 1.0), (7.5, 2.0), (1.0, 4.0), (9.0, 8.0), (4.0, 2.5), (12.0, 0.5), (6.5, 3.0), (2.0, 7.0)]
+    for row in samples:
+        window.append(np.array(row))
+
+    kept = np.array(samples[-5:])
+    mean, std = window.mean_std()
+
+    assert len(window) == 5
+    assert np.allclose(mean, kept.mean(axis=0))
+    assert np.allclose(std, kept.std(axis=0))
+
+
+def test_fallback_batch_evaluation_matches_single_evaluation_on_shared_baseline() -> None:
+    single = OnlineAnomalyModel(window_size=40)
+    batched = OnlineAnomalyModel(window_size=40)
+    for index in range(30):
+        warmup = _base_payload()
+        warmup.production_rate = 12 + (index % 3) * 0.5
+        single.evaluate(warmup)
+        batched.evaluate(warmup)
+
+    drifted = _base_payload()
+    drifted.production_rate = 2
+    drifted.reject_rate = 25
+
+    single_score, single_reasons = single.evaluate(drifted)
+    batch_results = batched.evaluate_batch([drifted, _base_payload()])
+
+    assert len(batch_results) == 2
+    assert abs(batch_results[0][0] - single_score) < 1e-6
+    assert batch_results[0][1] == single_reasons
+    assert len(batched.history) == 32
+
+
+def test_parse_iso_timestamp_normalizes_to_utc() -> None:
+    expected = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+
+    assert _parse_iso_timestamp("2026-01-01T08:00:00Z") == expected
+    assert _parse_iso_timestamp("2026-01-01T10:00:00+02:00") == expected
+    assert _parse_iso_timestamp("2026-01-01T08:00:00").tzinfo is timezone.utc
+
+
+def test_repeated_payload_reuses_previous_result_with_new_scan_time() -> None:
+    reset_runtime_state_for_tests()
+
+    first = analyze_payload(_base_payload())
+    repeat = _base_payload()
+    repeat.scan_time_ms = 140
+    second = analyze_payload(repeat)
+
+    assert second is not first
+    assert second.scan_time_ms == 140
+    assert second.process_score == first.process_score
+    assert second.reasons == first.reasons
+    # The stateful drift window still sees every sample.
+    assert len(FALLBACK_MODEL.history) == 2
+
+
+def test_repeated_payload_with_vision_score_skips_the_drift_model() -> None:
+    reset_runtime_state_for_tests()
+
+    payload = _base_payload()
+    payload.vision_anomaly_score = 12
+    first = analyze_payload(payload)
+    second = analyze_payload(payload)
+
+    assert second == first
+    assert len(FALLBACK_MODEL.history) == 0
+
+
+def test_repeated_payloads_after_level_shift_let_drift_score_recover() -> None:
+    reset_runtime_state_for_tests()
+    rng = np.random.default_rng(3)
+
+    for _ in range(60):
+        warmup = _base_payload()
+        warmup.production_rate = float(12 + rng.normal(0, 0.3))
+        analyze_payload(warmup)
+
+    shifted = _base_payload()
+    shifted.production_rate = 20
+    results = [analyze_payload(shifted) for _ in range(60)]
+
+    assert results[0].process_anomaly is True
+    assert results[-1].process_score < results[0].process_score
+    assert results[-1].process_anomaly is False
+
+
+def test_sharded_counters_fold_increments_from_every_thread() -> None:
+    counters = ShardedCounters(("hits", "misses"))
+
+    def bump() -> None:
+        for _ in range(1000):
+            counters.increment("hits")
+
+    threads = [threading.Thread(target=bump) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counters.increment("misses", 3)
+
+    assert counters.snapshot() == {"hits": 4000, "misses": 3}
+
+    counters.reset()
+    assert counters.snapshot() == {"hits": 0, "misses": 0}
+
+
+def test_rolling_window_extend_matches_row_by_row_appends() -> None:
+    rows = np.random.default_rng(7).normal(10, 3, size=(13, 3))
+    batched = RollingWindow(maxlen=8, width=3, dtype=np.float32)
+    single = RollingWindow(maxlen=8, width=3, dtype=np.float32)
+
+    batched.extend(rows)
+    for row in rows:
+        single.append(row)
+
+    assert len(batched) == len(single) == 8
+    np.testing.assert_array_equal(batched.values(), single.values())
+    np.testing.assert_allclose(batched.mean_std()[0], rows[-8:].astype(np.float32).mean(axis=0), rtol=1e-6)
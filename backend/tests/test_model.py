@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import OneClassSVM
+
+from app.ml.model import (
+    _cached_image_features,
+    cached_image_features,
+    load_artifact,
+    load_artifact_metadata,
+    save_artifact,
+)
+
+
+def _artifact(version: str) -> dict:
+    return {
+        "scaler": StandardScaler(),
+        "estimator": OneClassSVM(),
+        "metadata": {"model_version": version, "threshold": 0.5, "feature_dim": 51},
+    }
+
+
+def test_load_artifact_reuses_parsed_copy_until_the_file_changes(tmp_path) -> None:
+    path = tmp_path / "model.pkl"
+    save_artifact(_artifact("v1"), str(path))
+
+    first = load_artifact(str(path))
+    assert load_artifact(str(path)) is first
+    assert load_artifact_metadata(str(path))["model_version"] == "v1"
+
+    save_artifact(_artifact("v2"), str(path))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = load_artifact(str(path))
+    assert reloaded is not first
+    assert reloaded["metadata"]["model_version"] == "v2"
+
+
+def test_cached_image_features_recomputes_only_after_the_file_changes(tmp_path) -> None:
+    image = tmp_path / "bottle.png"
+    image.write_bytes(b"not decoded")
+    _cached_image_features.cache_clear()
+
+    with patch("app.ml.model.extract_image_features", side_effect=[[0.1, 0.2], [0.3, 0.4]]) as extract:
+        assert cached_image_features(str(image)) == [0.1, 0.2]
+        assert cached_image_features(str(image)) == [0.1, 0.2]
+
+        stat = image.stat()
+        os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert cached_image_features(str(image)) == [0.3, 0.4]
+
+    assert extract.call_count == 2
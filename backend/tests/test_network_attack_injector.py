@@ -47,3 +47,128 @@ def test_extract_security_status_handles_missing_payload() -> None:
     assert fresh is False
     assert security_flag is False
     assert age_seconds is None
+
+
+def test_send_attack_burst_writes_all_frames_in_order() -> None:
+    import asyncio
+    import socket
+
+    frames = [
+        injector._build_payload("modbus-illegal-function", transaction_id=index, payload_size=0)
+        for index in (1, 2, 3)
+    ]
+
+    async def scenario(sender: socket.socket) -> int:
+        _, writer = await asyncio.open_connection(sock=sender)
+        sent = await injector._send_attack_burst(writer, frames, timeout_seconds=1.0)
+        writer.close()
+        return sent
+
+    sender, receiver = socket.socketpair()
+    with receiver:
+        sent = asyncio.run(scenario(sender))
+        received = receiver.recv(4096)
+
+    assert sent == sum(len(frame) for frame in frames)
+    assert received == b"".join(frames)
+
+
+def test_frame_pacer_holds_the_aggregate_rate() -> None:
+    import asyncio
+    import time
+
+    async def scenario() -> float:
+        pacer = injector._FramePacer(frames_per_second=200.0)
+        started = time.monotonic()
+        await asyncio.gather(*(pacer.wait(4) for _ in range(5)))
+        return time.monotonic() - started
+
+    # Five 4-frame bursts at 200 frames/s: the last one starts 80 ms after the first.
+    assert 0.07 <= asyncio.run(scenario()) < 0.5
+
+
+def test_merge_attack_stats_sums_workers_and_caps_errors() -> None:
+    per_worker = [
+        injector.AttackStats(2, 1, 1, 10, 8, 2, 96, ["refused", "reset"]),
+        injector.AttackStats(1, 1, 0, 5, 5, 0, 60, []),
+        injector.AttackStats(4, 0, 4, 4, 0, 4, 0, ["timeout", "timeout"]),
+    ]
+
+    merged = injector._merge_attack_stats(per_worker, max_errors=3)
+
+    assert (merged.attempted_connections, merged.successful_connections, merged.failed_connections) == (7, 2, 5)
+    assert (merged.frames_attempted, merged.frames_sent, merged.frames_failed) == (19, 13, 6)
+    assert merged.bytes_sent == 156
+    assert merged.sample_errors == ["refused", "reset", "timeout"]
+
+
+def test_attack_worker_counts_connections_separately_from_frames() -> None:
+    import argparse
+    import asyncio
+    import time
+
+    async def scenario() -> injector.AttackStats:
+        async def swallow(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await reader.read()
+            writer.close()
+
+        server = await asyncio.start_server(swallow, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        args = argparse.Namespace(
+            payload_mode="modbus-illegal-function",
+            payload_size=0,
+            reconnect_per_packet=False,
+            target_host="127.0.0.1",
+            target_port=port,
+            connect_timeout_seconds=1.0,
+        )
+        async with server:
+            return await injector._attack_worker(
+                0,
+                args=args,
+                pacer=injector._FramePacer(400.0),
+                frames_per_burst=4,
+                end_time=time.monotonic() + 0.1,
+            )
+
+    stats = asyncio.run(scenario())
+
+    assert (stats.attempted_connections, stats.successful_connections, stats.failed_connections) == (1, 1, 0)
+    assert stats.frames_attempted == stats.frames_sent > 4
+    assert stats.frames_failed == 0
+
+
+def test_build_payload_stamps_transaction_id_into_mbap_header() -> None:
+    illegal_payload = injector._build_payload("modbus-illegal-function", transaction_id=0x1234, payload_size=0)
+    bad_length_payload = injector._build_payload("modbus-bad-length", transaction_id=0x10001, payload_size=0)
+
+    assert illegal_payload == b"\x12\x34\x00\x00\x00\x06\x01\x7f\x00\x10\x00\x01"
+    assert bad_length_payload == b"\x00\x01\x00\x00\x00\xfa\x01\x03\x00"
+
+
+def test_backoff_delay_doubles_with_jitter_up_to_cap() -> None:
+    assert injector._backoff_delay(0, base_seconds=0.5, cap_seconds=2.0) == 0.5
+    assert 0.8 <= injector._backoff_delay(1, base_seconds=0.5, cap_seconds=2.0) <= 1.2
+    assert 1.6 <= injector._backoff_delay(6, base_seconds=0.5, cap_seconds=2.0) <= 2.4
+
+
+def test_wait_for_security_flag_backs_off_while_analyzer_is_down() -> None:
+    from unittest.mock import MagicMock, patch
+
+    flagged = {"security": {"fresh": True, "security_flag": True}}
+    healthy = MagicMock()
+    healthy.json.return_value = flagged
+    session = MagicMock()
+    session.get.side_effect = [ConnectionError("down"), ConnectionError("down"), healthy]
+
+    with patch.object(injector.time, "sleep") as sleep:
+        result = injector._wait_for_security_flag(
+            session,
+            analyzer_base_url="http://analyzer:8001",
+            timeout_seconds=30.0,
+            poll_interval_seconds=0.5,
+        )
+
+    assert result == (True, flagged)
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert 0.8 <= delays[0] <= 1.2 and 1.6 <= delays[1] <= 2.4
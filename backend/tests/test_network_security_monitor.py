@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+from unittest.mock import MagicMock
+
+SCRIPT_DIR = Path(__file__).resolve().parents[1] / "scripts"
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+import network_security_monitor as monitor
+
+
+def _window(security_flag: bool = False) -> dict:
+    return monitor._build_security_payload(
+        packet_rate=130.0,
+        burst_ratio=0.2,
+        unauthorized_attempts=0,
+        security_flag=security_flag,
+        sample_window_seconds=1.0,
+    )
+
+
+def _batcher(session: MagicMock, batch_size: int = 3) -> monitor.SecuritySignalBatcher:
+    return monitor.SecuritySignalBatcher(
+        session,
+        api_base_url="http://analyzer:8001/",
+        timeout_seconds=1.0,
+        batch_size=batch_size,
+        flush_seconds=60.0,
+    )
+
+
+def test_batcher_posts_full_batches_and_flagged_windows_immediately() -> None:
+    session = MagicMock()
+    session.post.return_value.status_code = 200
+    batcher = _batcher(session)
+
+    batcher.add(_window())
+    batcher.add(_window())
+    assert session.post.call_count == 0
+
+    batcher.add(_window(security_flag=True))
+    url = session.post.call_args.args[0]
+    assert url == "http://analyzer:8001/signals/security/batch"
+    assert len(session.post.call_args.kwargs["json"]) == 3
+    assert not batcher.pending
+
+
+def test_batcher_falls_back_to_single_posts_without_batch_endpoint() -> None:
+    session = MagicMock()
+    session.post.return_value.status_code = 404
+    batcher = _batcher(session, batch_size=2)
+
+    batcher.add(_window())
+    batcher.add(_window())
+
+    urls = [call.args[0] for call in session.post.call_args_list]
+    assert urls == [
+        "http://analyzer:8001/signals/security/batch",
+        "http://analyzer:8001/signals/security",
+        "http://analyzer:8001/signals/security",
+    ]
+    assert batcher.batch_supported is False
+
+
+def test_analyze_packets_counts_lane_bursts_and_unauthorized_sources() -> None:
+    from scapy.all import IP, TCP, UDP
+
+    packets = [
+        IP(src="127.0.0.1", dst="127.0.0.1") / TCP(sport=40000, dport=502),
+        IP(src="10.0.0.9", dst="127.0.0.1") / TCP(sport=40001, dport=502),
+        IP(src="10.0.0.9", dst="127.0.0.1") / TCP(sport=40002, dport=4840),
+        IP(src="127.0.0.1", dst="10.0.0.9") / TCP(sport=502, dport=40000),
+        IP(src="10.0.0.9", dst="127.0.0.1") / TCP(sport=40003, dport=80),
+        IP(src="10.0.0.9", dst="127.0.0.1") / UDP(sport=40004, dport=502),
+    ]
+
+    assert monitor._analyze_packets(packets, {"127.0.0.1"}) == (4, 2, 2)
+
+
+def test_lane_counters_snapshot_resets_each_window() -> None:
+    from scapy.all import IP, TCP
+
+    counters = monitor.LaneCounters({"127.0.0.1"})
+    counters.observe(IP(src="10.0.0.9") / TCP(sport=40000, dport=502))
+    counters.observe(IP(src="127.0.0.1") / TCP(sport=40001, dport=4840))
+
+    assert counters.snapshot() == (2, 1, 1)
+    assert counters.snapshot() == (0, 0, 0)
+
+
+def test_capture_filter_covers_every_protocol_port() -> None:
+    assert monitor.CAPTURE_FILTER == "tcp and (port 502 or port 4840 or port 1883)"
+
+
+def test_analyze_frame_matches_scapy_dissection() -> None:
+    import random
+
+    from scapy.all import IP, TCP, UDP, Dot1Q, Ether, IPv6
+
+    rng = random.Random(7)
+    ports = [502, 4840, 1883, 80, 40000]
+    frames = []
+    for _ in range(300):
+        layer4 = TCP(sport=rng.choice(ports), dport=rng.choice(ports)) if rng.random() < 0.8 else UDP(dport=502)
+        if rng.random() < 0.25:
+            ip = IPv6(src=rng.choice(["::1", "fd00::9"]))
+        else:
+            source = rng.choice(["127.0.0.1", "10.0.0.9", "192.168.1.20"])
+            # Some frames carry IP options (NOPs) so the TCP header offset varies.
+            ip = IP(src=source, options=b"\x01\x01\x01\x01") if rng.random() < 0.3 else IP(src=source)
+        link = Ether() / Dot1Q(vlan=10) if rng.random() < 0.2 else Ether()
+        frames.append(bytes(link / ip / layer4))
+
+    allowed = {"127.0.0.1", "::1"}
+    packed = frozenset(monitor._pack_address(address) for address in allowed)
+    expected = monitor._analyze_packets([Ether(frame) for frame in frames], allowed)
+
+    totals = [0, 0, 0]
+    for frame in frames:
+        for index, value in enumerate(monitor._analyze_frame(memoryview(frame), len(frame), packed)):
+            totals[index] += value
+
+    assert tuple(totals) == expected
+    assert expected[0] > 0
+
+
+def test_raw_socket_sniffer_drops_outgoing_loopback_copies() -> None:
+    from scapy.all import IP, TCP, Ether
+
+    frame = bytes(Ether() / IP(src="10.0.0.9") / TCP(sport=40000, dport=502))
+    counters = monitor.LaneCounters({"127.0.0.1"})
+    sniffer = monitor.RawSocketSniffer("lo", counters)
+    deliveries = [
+        ("lo", 0x0800, monitor.PACKET_OUTGOING, monitor.ARPHRD_LOOPBACK, b""),
+        ("lo", 0x0800, 0, monitor.ARPHRD_LOOPBACK, b""),
+        ("eth0", 0x0800, monitor.PACKET_OUTGOING, 1, b""),
+    ]
+
+    def recvfrom_into(buffer):
+        if not deliveries:
+            sniffer._stop.set()
+            raise TimeoutError
+        buffer[: len(frame)] = frame
+        return len(frame), deliveries.pop(0)
+
+    sock = MagicMock()
+    sock.__enter__.return_value = sock
+    sock.recvfrom_into.side_effect = recvfrom_into
+    sniffer._sock = sock
+    sniffer._run()
+
+    assert sniffer.exception is None
+    assert counters.snapshot() == (2, 2, 2)
+
+
+def test_raw_socket_sniffer_attaches_the_capture_filter_in_the_kernel() -> None:
+    from unittest.mock import patch
+
+    sock = MagicMock()
+    sock.__enter__.return_value = sock
+    sock.recvfrom_into.side_effect = TimeoutError
+    sniffer = monitor.RawSocketSniffer("lo", monitor.LaneCounters({"127.0.0.1"}))
+
+    with patch.object(monitor.socket, "socket", return_value=sock), patch(
+        "scapy.arch.linux.attach_filter"
+    ) as attach_filter:
+        sniffer.start()
+        sniffer.stop()
+
+    attach_filter.assert_called_once_with(sock, monitor.CAPTURE_FILTER, "lo")
+    assert sniffer.kernel_filtered is True
+    assert sniffer.exception is None
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app import scoring
+
+
+def test_rule_score_kernel_flags_process_and_network_components() -> None:
+    process_score, network_score, components, mask = scoring.rule_score_kernel(
+        20.0,   # reject_rate
+        2.0,    # production_rate
+        True,   # conveyor_running
+        8.0,    # in_flight_bottles
+        False,  # alarm_horn
+        True,   # reject_gate
+        160.0,  # packet_rate
+        0.5,    # burst_ratio
+        1.0,    # unauthorized_attempts
+        False,  # security_flag
+        130.0,  # expected_packet_rate
+    )
+
+    assert process_score == 16.0 + 22.0 + 25.0 + 10.0
+    assert network_score == pytest.approx(33.0 + 45.0)
+    assert components[scoring.REJECT_RATE_COMPONENT] == 16.0
+    assert mask & (1 << scoring.PACKET_DRIFT_BIT)
+    assert not mask & (1 << scoring.ALARM_HORN_COMPONENT)
+    assert not mask & (1 << scoring.BURST_COMPONENT)
+    assert not mask & (1 << scoring.SECURITY_FLAG_COMPONENT)
+
+
+def test_zscore_kernel_matches_numpy_reference() -> None:
+    window = np.array([[10.0, 1.0], [12.0, 1.0], [14.0, 1.0]])
+    values = np.array([[16.0, 1.0], [10.0, 3.0]])
+
+    zscores = scoring.zscore_kernel(values, window.sum(axis=0), (window * window).sum(axis=0), len(window))
+
+    mean = window.mean(axis=0)
+    std = np.maximum(window.std(axis=0), 1e-6)
+    np.testing.assert_allclose(zscores, np.abs((values - mean) / std))
+
+
+def test_drift_score_kernel_weights_and_clamps_rows() -> None:
+    window = np.array([[10.0, 1.0], [12.0, 3.0], [14.0, 2.0]])
+    values = np.array([[12.0, 2.0], [40.0, 9.0]])
+    weights = np.array([0.5, 0.5])
+    args = (window.sum(axis=0), (window * window).sum(axis=0), len(window))
+
+    scores, zscores = scoring.drift_score_kernel(values, *args, 3, weights, 22.0)
+
+    np.testing.assert_allclose(zscores, scoring.zscore_kernel(values, *args))
+    assert scores[0] == pytest.approx(0.0)
+    assert scores[1] == 100.0
+
+    early_scores, early_zscores = scoring.drift_score_kernel(values, *args, 4, weights, 22.0)
+    assert not early_scores.any()
+    assert not early_zscores.any()
+
+
+def test_rule_score_kernel_clamps_network_score() -> None:
+    _, network_score, components, _ = scoring.rule_score_kernel(
+        0.0, 10.0, True, 0.0, False, False, 400.0, 1.0, 4.0, True, 130.0
+    )
+
+    assert components.sum() > 100.0
+    assert network_score == 100.0
@@ -13,13 +13,18 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from app.ml.torch_autoencoder import (
     ConvAutoencoder,
+    _decode_images,
+    _iter_decoded_batches,
     _load_image_tensor,
     _reconstruction_error,
+    _reconstruction_errors_batched,
     _resolve_device,
     load_torch_artifact,
     load_torch_artifact_metadata,
     save_torch_artifact,
     score_torch_image,
+    score_torch_images,
+    train_torch_autoencoder,
 )
 
 
@@ -117,3 +122,135 @@ def test_score_torch_image_with_synthetic_image() -> None:
         assert "model_version" in result
         assert isinstance(result["anomaly_score"], float)
         assert 0.0 <= result["anomaly_score"] <= 100.0
+
+
+def _write_images(directory: Path, count: int) -> list[str]:
+    import cv2
+
+    rng = np.random.default_rng(0)
+    paths = []
+    for index in range(count):
+        path = directory / f"good_{index}.png"
+        cv2.imwrite(str(path), rng.integers(0, 256, size=(40, 48, 3), dtype=np.uint8))
+        paths.append(str(path))
+    return paths
+
+
+def test_train_torch_autoencoder_with_parallel_decoding(tmp_path) -> None:
+    paths = _write_images(tmp_path, 5)
+
+    artifact = train_torch_autoencoder(paths, image_size=16, epochs=1, batch_size=2, device="cpu", num_workers=2)
+
+    metadata = artifact["metadata"]
+    assert metadata["trained_samples"] == 5
+    assert metadata["threshold"] > 0
+    assert metadata["final_train_loss"] > 0
+
+
+def test_decode_images_stacks_each_image_once(tmp_path) -> None:
+    paths = _write_images(tmp_path, 3)
+
+    images = _decode_images(paths, 16, num_workers=0)
+
+    assert images.shape == (3, 3, 16, 16)
+    assert images.dtype == torch.uint8
+    torch.testing.assert_close(images[1].float() / 255.0, _load_image_tensor(paths[1], 16))
+    torch.testing.assert_close(_decode_images(paths, 16, num_workers=2), images)
+
+
+def test_batched_reconstruction_errors_match_single_image_scoring() -> None:
+    model = ConvAutoencoder().eval()
+    images = torch.rand(5, 3, 32, 32)
+
+    errors = _reconstruction_errors_batched(model, images, torch.device("cpu"), batch_size=2)
+
+    expected = [_reconstruction_error(model, image, torch.device("cpu")) for image in images]
+    np.testing.assert_allclose(errors, expected, rtol=1e-5)
+
+
+def test_score_torch_images_matches_single_image_scoring(tmp_path) -> None:
+    paths = _write_images(tmp_path, 3)
+    loaded = {
+        "model": ConvAutoencoder().eval(),
+        "metadata": {"model_version": "test-v1", "threshold": 0.05, "score_scale": 0.10, "image_size": 32},
+        "device": torch.device("cpu"),
+    }
+
+    batched = score_torch_images(loaded, paths, batch_size=2, num_workers=0)
+
+    assert len(batched) == 3
+    for path, result in zip(paths, batched):
+        single = score_torch_image(loaded, path)
+        assert abs(result["raw_score"] - single["raw_score"]) < 1e-6
+        assert result["defect_flag"] == single["defect_flag"]
+    assert score_torch_images(loaded, []) == []
+
+
+def test_saved_torch_artifact_carries_a_traced_model(tmp_path) -> None:
+    model = ConvAutoencoder().eval()
+    artifact = {
+        "type": "torch_autoencoder",
+        "state_dict": model.state_dict(),
+        "metadata": {"model_version": "test-v1", "threshold": 0.05, "score_scale": 0.10, "image_size": 32},
+    }
+    artifact_path = str(tmp_path / "model.pt")
+    save_torch_artifact(artifact, artifact_path)
+
+    assert "scripted" not in artifact
+    traced = load_torch_artifact(artifact_path, device="cpu")
+    eager = load_torch_artifact(artifact_path, device="cpu", optimize=False)
+    assert isinstance(traced["model"], torch.jit.ScriptModule)
+    assert not isinstance(eager["model"], torch.jit.ScriptModule)
+
+    batch = torch.rand(2, 3, 32, 32)
+    with torch.inference_mode():
+        assert torch.allclose(traced["model"](batch), eager["model"](batch), atol=1e-6)
+
+
+def test_load_torch_artifact_rejects_an_outdated_layout(tmp_path) -> None:
+    import pytest
+
+    artifact_path = str(tmp_path / "legacy.pt")
+    torch.save({"type": "torch_autoencoder", "state_dict": {"decoder.0.weight": torch.zeros(64, 32, 4, 4)}}, artifact_path)
+
+    with pytest.raises(ValueError, match="retrain"):
+        load_torch_artifact(artifact_path, device="cpu")
+
+
+def test_load_torch_artifact_accepts_numpy_metadata(tmp_path) -> None:
+    artifact_path = str(tmp_path / "numpy_meta.pt")
+    metadata = {"threshold": np.float64(0.02), "score_scale": np.float64(0.05), "image_size": 32}
+    torch.save(
+        {"type": "torch_autoencoder", "state_dict": ConvAutoencoder().state_dict(), "metadata": metadata},
+        artifact_path,
+    )
+
+    loaded = load_torch_artifact(artifact_path, device="cpu")
+
+    assert loaded["metadata"]["threshold"] == 0.02
+    assert load_torch_artifact_metadata(artifact_path)["threshold"] == 0.02
+
+
+def test_iter_decoded_batches_preserves_order_with_prefetch(tmp_path) -> None:
+    paths = _write_images(tmp_path, 5)
+    expected = _decode_images(paths, 32, 0)
+
+    for num_workers in (0, 2):
+        batches = list(_iter_decoded_batches(paths, 32, 2, num_workers))
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert torch.equal(torch.cat(batches), expected)
+
+
+def test_fp16_artifact_stores_half_weights_and_scores_in_fp32(tmp_path) -> None:
+    paths = _write_images(tmp_path, 4)
+    artifact = train_torch_autoencoder(paths, image_size=16, epochs=1, batch_size=2, device="cpu", precision="fp16")
+    assert artifact["metadata"]["precision"] == "fp16"
+    assert all(value.dtype == torch.float16 for value in artifact["state_dict"].values())
+
+    artifact_path = str(tmp_path / "model_fp16.pt")
+    save_torch_artifact(artifact, artifact_path)
+    assert "scripted" not in torch.load(artifact_path, weights_only=True)
+
+    loaded = load_torch_artifact(artifact_path, device="cpu")
+    assert next(loaded["model"].parameters()).dtype == torch.float32
+    assert score_torch_image(loaded, paths[0])["raw_score"] >= 0.0